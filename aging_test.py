@@ -1,12 +1,21 @@
 import datetime
 import logging
-import concurrent.futures
 import sys
 import time
 from pymodbus import FramerType
 from pymodbus.client import ModbusSerialClient
 from pymodbus.exceptions import ConnectionException, ModbusIOException
 
+from modbus_pacing import FramePacer
+from finger_motion import actuate_and_verify, wait_motion_done
+from current_stats import current_statistics
+from degradation_detector import DegradationMonitor
+from telemetry_store import TELEMETRY_BLOCK_COUNT, telemetry
+from port_workers import ResultCollector, run_port_workers
+from result_sink import ResultSink
+from modbus_metrics import FC_READ_HOLDING_REGISTERS, FC_WRITE_MULTIPLE_REGISTERS, metrics, register_count
+from gesture_library import get_step, write_registers
+
 # 设置日志级别为INFO，获取日志记录器实例
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -14,6 +23,9 @@ stream_handler = logging.StreamHandler(stream=sys.stdout)
 logger.addHandler(stream_handler)
 
 
+# 各端口电机的 EWMA/CUSUM 退化检测，报警后停止该端口
+degradation_monitor = DegradationMonitor()
+
 class AgingTest:
     
     # ROH 灵巧手错误代码
@@ -80,6 +92,8 @@ class AgingTest:
         self.port = 'COM4'
         self.FRAMER_TYPE = FramerType.RTU
         self.BAUDRATE = 115200
+        self.pacer = FramePacer(self.BAUDRATE, 'rtu') # 帧间节奏，手指是否到位由 wait_motion_done 判断
+        self.motion_timeout = 5 # 等待动作完成的最长时间（秒）
         self.client = None
         self.ROH_FINGER_POS_TARGET0 = 1135
         self.ROH_FINGER_POS_TARGET1 = 1136
@@ -95,11 +109,10 @@ class AgingTest:
         self.ROH_FINGER_CURRENT5 = 1110
         self.ROH_BEEP_PERIOD  = 1010
         self.motor_currents = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
-        self.initial_gesture = [0, 0, 0, 0, 0, 65535]  # 自然展开手势
-        # self.grasp_gesture = [16294, 28966, 33673, 29328, 23897, 65535]  # 握手势
-        self.grasp_gesture = [16294, 65535, 65535, 65535, 65535, 65535]  # 握手势
+        self.degradation_alarms = [] # 本轮电流触发的退化报警
+        self.initial_gesture = get_step('aging_open')  # 自然展开手势
+        self.grasp_gesture = get_step('aging_grasp')  # 握手势
         self.MAX_CYCLE_NUM = 1
-        self.FINGER_POS_TARGET_MAX_LOSS = 32
         self.max_average_times = 3
         self.current_standard = 100
         
@@ -128,22 +141,29 @@ class AgingTest:
         response = None
         while retry_count < max_retries:
             try:
+                self.pacer.before_frame()
+                start = time.perf_counter()
                 response = self.client.read_holding_registers(address=address, count=count, slave=self.node_id)
-                time.sleep(0.1)
+                metrics.observe(self.port, FC_READ_HOLDING_REGISTERS, time.perf_counter() - start, count, not response.isError())
+                self.pacer.after_read()
                 if not response.isError():
                     break
                 else:
                     error_type = self.get_exception(response)
                     if "connection timeout" in error_type.lower():
+                        metrics.increment(self.port, 'reconnects')
                         self.client.connect()
                     elif "read timeout" in error_type.lower():
                         retry_count += 1
-                        time.sleep(0.5)
+                        metrics.increment(self.port, 'retries')
+                        self.pacer.before_retry()
                     else:
                         logger.error(f'[port = {self.port}]读寄存器失败: {error_type}\n')
             except ModbusIOException as e:
+                metrics.increment(self.port, 'timeouts')
                 logger.error(f'[port = {self.port}]Modbus输入输出异常: {e}')
                 if "connection error" in str(e).lower():
+                    metrics.increment(self.port, 'reconnects')
                     self.client.connect()
             except AssertionError as e:
                 logger.error(f'[port = {self.port}]断言错误: {e}')
@@ -166,22 +186,29 @@ class AgingTest:
         retry_count = 0
         while retry_count < max_retries:
             try:
-                response = self.client.write_registers(address, value, self.node_id)
-                time.sleep(1.5)
+                self.pacer.before_frame()
+                start = time.perf_counter()
+                response = write_registers(self.client, address, value, self.node_id)
+                metrics.observe(self.port, FC_WRITE_MULTIPLE_REGISTERS, time.perf_counter() - start, register_count(value), not response.isError())
+                self.pacer.after_write()
                 if not response.isError():
                     return True
                 else:
                     error_type = self.get_exception(response)
                     if "connection timeout" in error_type.lower():
+                        metrics.increment(self.port, 'reconnects')
                         self.client.connect()
                     elif "write timeout" in error_type.lower():
                         retry_count += 1
+                        metrics.increment(self.port, 'retries')
                     else:
                         logger.error(f'[port = {self.port}]写寄存器失败: {error_type}\n')
                         return False
             except ModbusIOException as e:
+                metrics.increment(self.port, 'timeouts')
                 logger.error(f'[port = {self.port}]Modbus输入输出异常: {e}')
                 if "connection error" in str(e).lower():
+                    metrics.increment(self.port, 'reconnects')
                     self.client.connect()
                 else:
                     return False
@@ -201,16 +228,35 @@ class AgingTest:
     #         self.write_to_regesister(address=self.ROH_BEEP_PERIOD ,value=1000)
     #         time.sleep(3)
 
-    def do_gesture(self, gesture):
+    def do_gesture(self, gesture, verify=False, allow_blocked=None):
         """
         执行特定的手势动作。
 
         实际是向特定寄存器（ROH_FINGER_POS_TARGET0）写入手势数据。
 
         :param gesture: 要执行的手势数据。
+        :param verify: 为True时动作完成后一次块读实际位置、电流和状态，返回逐个手指判定的 StepVerdict。
+        :param allow_blocked: 逐个手指判定时，被电流/力控提前停下的手指也算到位（握住物体时）；默认取手势库中该步的设置。
         :return: 调用write_to_regesister方法的结果，即写入是否成功的布尔值。
         """
-        return self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=gesture)
+        if verify:
+            verdict = actuate_and_verify(self.write_to_regesister, self.read_from_register, gesture,
+                                         wait_motion=self.wait_motion_done, allow_blocked=allow_blocked)
+            if not verdict:
+                logger.error(f'[port = {self.port}]手势未到位: {verdict}\n')
+            return verdict
+        return self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=gesture) and self.wait_motion_done()
+
+    def wait_motion_done(self):
+        """
+        等待本次动作完成（所有手指停止）。
+
+        :return: 一个布尔值，表示动作是否正常完成；出现堵转或超时返回False。
+        """
+        result = wait_motion_done(self.read_from_register, timeout=self.motion_timeout)
+        if not result.done:
+            logger.error(f'[port = {self.port}]手指动作未完成: {result}\n')
+        return result.done
 
     def count_motor_curtent(self, address):
         """
@@ -221,19 +267,20 @@ class AgingTest:
         :param address: 要读取电流数据的寄存器地址。
         :return: 一个包含6个电机电流平均值的列表。
         """
-        sum_currents = [0] * 6
-        ave_currents = [0] * 6
+        samples = []
         for i in range(self.max_average_times):
-            currents = self.read_from_register(address=address, count=6)
+            currents = self.read_from_register(address=address, count=TELEMETRY_BLOCK_COUNT if telemetry.active else 6)
             if currents is None or currents.isError():
                 logger.error(f"[port = {self.port}]currents: read_holding_registers has an error\n")
+                samples.append(None)
             else:
+                telemetry.record(self.port, currents.registers)
+                samples.append(currents.registers[:6])
                 time.sleep(0.1)
-            currents_list = currents.registers if currents else []
-            sum_currents = [sum_currents[j] + currents_list[j] for j in range(len(currents_list))]
-        currents = [sum_currents[k] / self.max_average_times for k in range(len(currents_list))]
-        ave_currents = [round(num, 1) for num in currents]
-        return ave_currents
+        stats = current_statistics(samples)
+        if not stats.valid:
+            return []
+        return stats.to_list('mean', digits=1)
 
     def checkCurrent(self, curs):
         """
@@ -256,18 +303,24 @@ class AgingTest:
         :return: 一个布尔值，表示获取电机电流的操作是否成功。
         """
         status = False
-        if self.do_gesture(self.initial_gesture) and not self.judge_if_hand_broken(address=self.ROH_FINGER_POS_TARGET0,
-                                                                                   gesture=self.initial_gesture):
+        if self.do_gesture(self.initial_gesture, verify=True):
             # self.motor_currents = self.count_motor_curtent(address=self.ROH_FINGER_CURRENT0)
             status = True
             # logger.info(f'[port = {self.port}]执行自然展开手势, 电机电流为 -->{self.motor_currents}\n')
-        if self.do_gesture(self.grasp_gesture) and not self.judge_if_hand_broken(address=self.ROH_FINGER_POS_TARGET0,
-                                                                                gesture=self.grasp_gesture):
+        if self.do_gesture(self.grasp_gesture, verify=True):
             self.motor_currents = self.count_motor_curtent(address=self.ROH_FINGER_CURRENT0)
+            self.check_degradation()
             status = True
             logger.info(f'[port = {self.port}]执行抓握手势，电机电流为 -->{self.motor_currents}\n')
         return status
 
+    def check_degradation(self):
+        """
+        把本轮测得的电流送入退化检测器，返回新产生的报警列表。
+        """
+        self.degradation_alarms = degradation_monitor.update(self.port, self.motor_currents) if self.motor_currents else []
+        return self.degradation_alarms
+
     def get_current(self):
         """
         返回当前存储的电机电流值（self.motor_currents）。
@@ -276,23 +329,6 @@ class AgingTest:
         """
         return self.motor_currents
 
-    def judge_if_hand_broken(self, address, gesture):
-        """
-        判断设备是否损坏。
-
-        通过读取指定地址的寄存器数据，并与给定的手势数据对比，如果有任何一个寄存器值与手势值的差值超过FINGER_POS_TARGET_MAX_LOSS则认为设备损坏。
-
-        :param address: 要读取数据的寄存器地址。
-        :param gesture: 用于对比的手势数据。
-        :return: 一个布尔值，表示设备是否损坏。
-        """
-        is_broken = False
-        response = self.read_from_register(address=address, count=6)
-        if response is not None and not response.isError():
-            for i in range(len(response.registers)):
-                if abs(response.registers[i] - gesture[i]) > self.FINGER_POS_TARGET_MAX_LOSS:
-                    is_broken = True
-        return is_broken
 
     def connect_device(self):
         """
@@ -332,7 +368,7 @@ def check_ports(ports_list):
     status = True
     if ports_list is not None:
         for port in ports_list:
-            if isinstance(port, str) and port.startswith('COM'):
+            if isinstance(port, str) and port.startswith(('COM', '/dev/')):
                 valid_ports.append(port)
             else:
                 status = False
@@ -360,35 +396,29 @@ def main(ports=None, max_cycle_num=1):
         result = '不通过'
         return overall_result,result
     
+    metrics.reset()
+    degradation_monitor.reset()
+    telemetry.start(name='aging_test')
     start_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------开始老化测试<开始时间：{start_time}>----------------------------------------------\n')
     logger.info('测试目的：循环做抓握手势，进行压测')
     logger.info('标准：各个手头无异常，手指不脱线，并记录各个电机的电流值 < 单位 mA >\n')
+    sink = ResultSink(name='aging_test')
     try:
         start_time1 = time.time()
         end_time1 = start_time1 + max_cycle_num * 3600
         # end_time1 = start_time1 + 15
-        i = 0
-        while time.time() < end_time1:
-            logger.info(f"##########################第 {i + 1} 轮测试开始######################\n")
-            result = '通过'
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = [executor.submit(run_tests_for_port, port, connected_status) for port in ports]
-                for future in concurrent.futures.as_completed(futures):
-                    port_result, _ = future.result()
-                    overall_result.append(port_result)
-                    for gesture_result in port_result["gestures"]:
-                        if gesture_result["result"]!= "通过":
-                            result = '不通过'
-                            final_result = '不通过'
-                            break
-            logger.info(f"#################第 {i + 1} 轮测试结束，测试结果：{result}#############\n")
-            i += 1
+        # 每个端口独立循环到截止时间，结果实时汇总
+        collector = run_port_workers(ports, lambda port: run_tests_for_port(port, connected_status), end_time1, ResultCollector(sink), after_cycle=stop_degraded_port)
+        final_result = collector.final_result
 
     except Exception as e:
         logging.error(f"Error: {e}")
     finally:
-        pass
+        sink.close()
+    overall_result = sink.summary_results()
+    telemetry.stop()
+    metrics.dump()
     end_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------老化测试结束<结束时间：{end_time}>----------------------------------------------\n')
     # print(f'最终测试结果：{result}')
@@ -412,7 +442,16 @@ def print_overall_result(overall_result):
                 logger.info(f" timestamp:{timestamp} content: {content}, Result: {result}")
 
 
+def stop_degraded_port(port, port_result, collector):
+    """
+    电机退化检测报警后停止该端口的老化循环。
+    """
+    if degradation_monitor.should_stop(port):
+        logger.error(f'[port = {port}]检测到电机退化，停止该端口的老化测试\n')
+        collector.stop_port(port)
+
 def run_tests_for_port(port, connected_status):
+    telemetry.begin_cycle(port)
     agingTest = AgingTest()
     agingTest.set_port(port)
     if not connected_status:
@@ -426,7 +465,14 @@ def run_tests_for_port(port, connected_status):
         try:
             if agingTest.get_motor_currents():
                 current = agingTest.get_current()
-                gesture_result = {
+                if agingTest.degradation_alarms:
+                    gesture_result = {
+                        "timestamp":timestamp,
+                        "content": f'{current}，' + '；'.join(str(alarm) for alarm in agingTest.degradation_alarms),
+                        "result": "不通过"
+                    }
+                else:
+                    gesture_result = {
                         "timestamp":timestamp,
                         "content": current,
                         "result": "通过"
@@ -1,13 +1,27 @@
 import datetime
 import logging
-import concurrent.futures
+import os
 import sys
+import threading
 import time
 from typing import List, Tuple
 from pymodbus import FramerType
 from pymodbus.client import ModbusSerialClient
 from pymodbus.exceptions import ConnectionException
 
+from finger_motion import actuate_and_verify, wait_motion_done
+from current_stats import current_statistics
+from degradation_detector import DegradationMonitor
+from telemetry_store import TELEMETRY_BLOCK_COUNT, telemetry
+from telemetry_sampler import TelemetrySampler
+from port_workers import ResultCollector, run_port_workers
+from result_sink import ResultSink
+from run_checkpoint import CHECKPOINT_DIR, RunCheckpoint
+from modbus_metrics import FC_READ_HOLDING_REGISTERS, FC_WRITE_MULTIPLE_REGISTERS, metrics, register_count
+from gesture_library import get_gesture, write_registers
+from gesture_sequence import sequence_optimizer
+from motion_planner import motion_planner
+
 # 设置日志级别为INFO，获取日志记录器实例
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -15,6 +29,9 @@ stream_handler = logging.StreamHandler(stream=sys.stdout)
 logger.addHandler(stream_handler)
 
 fail_port_list = set()
+# 各端口电机的 EWMA/CUSUM 退化检测，报警后停止该端口
+degradation_monitor = DegradationMonitor()
+
 class AgingTest:
     
     def __init__(self):
@@ -29,22 +46,28 @@ class AgingTest:
         self.FRAMER_TYPE = FramerType.RTU
         self.BAUDRATE = 115200
         self.client = None
+        self.ROH_NODE_ID = 1005
         self.ROH_FINGER_POS_TARGET0 = 1135
         self.ROH_FINGER_CURRENT0 = 1105
         self.ROH_FINGER_CURRENT_LIMIT0 = 1095
         self.ROH_BEEP_PERIOD  = 1010
         self.motor_currents = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
-        # self.initial_gesture = [[0,65535, 65535, 65535, 65535, 62258],[0, 0, 0, 0, 0, 62258]]  # 自然展开手势
-        # self.grasp_gesture = [[0, 65535, 65535, 65535, 65535, 62258], [62258, 65535, 65535, 65535, 65535, 62258]]
-        self.initial_gesture = [[26069, 31499, 36569, 32949, 28966, 62258],[0, 0, 0, 0, 0, 62258]]  # 自然展开手势
-        self.grasp_gesture = [[0,  31499, 36569, 32949, 28966, 62258], [26069, 31499, 36569, 32949, 28966, 62258]]
-        # self.grasp_gesture = [16294, 28966, 33673, 29328, 23897, 65535]  # 握手势
-        # self.grasp_gesture = [65535, 65535, 65535, 65535, 65535, 65535]  # 握手势16294
+        self.degradation_alarms = [] # 本轮电流触发的退化报警
+        self.initial_gesture = get_gesture('aging_v2_open')  # 自然展开手势
+        self.grasp_gesture = get_gesture('aging_v2_grasp')  # 握手势
         
-        self.FINGER_POS_TARGET_MAX_LOSS = 32
         self.max_average_times = 5
         self.current_standard = 100
-        self.aging_speed = 1# 动作间隔，最少0.4，否则手指会碰撞，值越小越快
+        self.motion_timeout = 5 # 等待动作完成的最长时间（秒）
+        self.setup_done = False # 当前会话是否已完成一次性设置（电流限制）
+        self.client_lock = threading.RLock() # 后台采样线程与手势路径共用串口，每次读写都需持有
+        self.sample_rate = 0 # 动作过程中后台采样的频率（次/秒），0 表示不采样
+        self.sampler = None
+        self.health_check_timeout = 0.1 # 健康检查的应答超时（秒）
+        self.max_current_limit = [200,200,200,200,200,200]
+        self.resumed = False # 从检查点恢复的会话，电流限制已经是目标值时不再重复写入
+        self.max_poll_errors = 5 # 轮询连续读失败多少次才认为端口故障
+        self.poll_errors = 0
         
     def read_from_register(self, address, count):
         """
@@ -53,8 +76,12 @@ class AgingTest:
         :param count: 要读取的寄存器数量。
         :return: 如果成功读取则返回pymodbus的read_holding_registers响应对象，否则返回None。
         """
+        response = None
         try:
-            response = self.client.read_holding_registers(address=address, count=count, slave=self.node_id)
+            with self.client_lock:
+                start = time.perf_counter()
+                response = self.client.read_holding_registers(address=address, count=count, slave=self.node_id)
+                metrics.observe(self.port, FC_READ_HOLDING_REGISTERS, time.perf_counter() - start, count, not response.isError())
             if response.isError():
                 logger.error(f'[port = {self.port}]读寄存器失败\n')
                 fail_port_list.update([self.port])
@@ -62,6 +89,29 @@ class AgingTest:
             logger.error(f'[port = {self.port}]异常: {e}')
         return response
         
+    def poll_register(self, address, count):
+        """
+        轮询用的读寄存器（等待动作完成、后台采样），每秒几十次，偶尔丢一帧不代表设备故障：
+        连续 max_poll_errors 次读失败才记入 fail_port_list。
+        :return: 如果成功读取则返回pymodbus的read_holding_registers响应对象，否则返回None或错误响应。
+        """
+        response = None
+        with self.client_lock:
+            try:
+                start = time.perf_counter()
+                response = self.client.read_holding_registers(address=address, count=count, slave=self.node_id)
+                metrics.observe(self.port, FC_READ_HOLDING_REGISTERS, time.perf_counter() - start, count, not response.isError())
+            except Exception as e:
+                logger.error(f'[port = {self.port}]异常: {e}')
+            if response is not None and not response.isError():
+                self.poll_errors = 0
+            else:
+                self.poll_errors += 1
+                if self.poll_errors == self.max_poll_errors:
+                    logger.error(f'[port = {self.port}]连续 {self.poll_errors} 次轮询读寄存器失败\n')
+                    fail_port_list.update([self.port])
+        return response
+
     def write_to_regesister(self, address, value):
         """
         向指定的寄存器地址写入数据。
@@ -70,7 +120,10 @@ class AgingTest:
         :return: 如果写入成功则返回True，否则返回False。
         """
         try:
-            response = self.client.write_registers(address, value, self.node_id)
+            with self.client_lock:
+                start = time.perf_counter()
+                response = write_registers(self.client, address, value, self.node_id)
+                metrics.observe(self.port, FC_WRITE_MULTIPLE_REGISTERS, time.perf_counter() - start, register_count(value), not response.isError())
             if not response.isError():
                     return True
             else:
@@ -81,14 +134,58 @@ class AgingTest:
                 logger.error(f'[port = {self.port}]异常: {e}')
                 return False
     
-    def do_gesture(self, gesture):
+    def do_gesture(self, gesture, verify=False):
         """
         执行特定的手势动作。
+        目标位置与上一步相同时由 sequence_optimizer 跳过，直接返回上一步的结果。
         :param gesture: 要执行的手势数据。
+        :param verify: 为True时动作完成后一次块读实际位置、电流和状态，返回逐个手指判定的 StepVerdict。
         :return: 调用write_to_regesister方法的结果，即写入是否成功的布尔值。
         """
-        time.sleep(self.aging_speed) # 防止大拇指和食指打架，值需要大于0.4
-        return self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=gesture)
+        def execute(step):
+            if self.sampler is not None:
+                self.sampler.begin_motion()
+            try:
+                if verify:
+                    verdict = actuate_and_verify(self.write_gesture, self.read_from_register, step, wait_motion=self.wait_motion_done)
+                    if not verdict:
+                        logger.error(f'[port = {self.port}]手势未到位: {verdict}\n')
+                    return verdict
+                return self.write_gesture(self.ROH_FINGER_POS_TARGET0, step) and self.wait_motion_done()
+            finally:
+                if self.sampler is not None:
+                    self.sampler.end_motion()
+                    logger.info(f'[port = {self.port}]动作过程电流峰值 -->{self.sampler.peak_currents}\n')
+        return sequence_optimizer.run_step(self.port, gesture, execute, verify=verify)
+
+    def write_gesture(self, address, step):
+        """
+        按 motion_planner 的规划写入一步手势：只有大拇指和食指可能相撞时才错开下发，其余情况立即写入。
+        """
+        return motion_planner.write(self.port, step, self.write_target, self.wait_motion_done)
+
+    def write_target(self, address, value):
+        """
+        写入目标位置，成功后通知采样线程，之后的采样才用于判断本次动作是否完成。
+        """
+        written = self.write_to_regesister(address, value)
+        if written and self.sampler is not None:
+            self.sampler.mark_written()
+        return written
+
+    def wait_motion_done(self, fingers=None):
+        """
+        等待本次动作完成（所有手指停止）。
+
+        :param fingers: 可选，只等待这些手指停止。
+        :return: 一个布尔值，表示动作是否正常完成；出现堵转或超时返回False。
+        """
+        # 后台采样时直接使用采样到的状态，不再额外读 ROH_FINGER_STATUS0~5
+        read_statuses = self.sampler.read_statuses if self.sampler is not None else self.poll_register
+        result = wait_motion_done(read_statuses, timeout=self.motion_timeout, fingers=fingers)
+        if not result.done:
+            logger.error(f'[port = {self.port}]手指动作未完成: {result}\n')
+        return result.done
     
     def count_motor_curtent(self):
         """
@@ -99,23 +196,30 @@ class AgingTest:
         :param address: 要读取电流数据的寄存器地址。
         :return: 一个包含6个电机电流平均值的列表。
         """
-        sum_currents = [0] * 6
-        ave_currents = [0] * 6
+        samples = []
         max_error_times = 3  # 设定最多允许出现错误的次数
         error_count = 0
         for i in range(self.max_average_times):
-            currents = self.read_from_register(address=self.ROH_FINGER_CURRENT0, count=6)
+            currents = self.read_from_register(address=self.ROH_FINGER_CURRENT0, count=TELEMETRY_BLOCK_COUNT if telemetry.active else 6)
             if currents is None or currents.isError():
                 error_count += 1
                 logger.error("currents: read_holding_registers has an error \n")
                 if error_count >= max_error_times:
                     raise ValueError("多次读取电流数据出现错误，无法计算平均值")
+                samples.append(None)
             else:
-                currents_list = currents.registers if currents else []
-                sum_currents = [sum_currents[j] + currents_list[j] for j in range(len(sum_currents))]
+                telemetry.record(self.port, currents.registers)
+                samples.append(currents.registers[:6])
                 time.sleep(0.2)
-        ave_currents = [sum_currents[k] / self.max_average_times for k in range(len(sum_currents))]
-        self.motor_currents = ave_currents
+        # 读取失败的采样不计入平均值
+        self.motor_currents = current_statistics(samples).to_list('mean', digits=1)
+
+    def check_degradation(self):
+        """
+        把本轮测得的电流送入退化检测器，返回新产生的报警列表。
+        """
+        self.degradation_alarms = degradation_monitor.update(self.port, self.motor_currents) if self.motor_currents else []
+        return self.degradation_alarms
 
     def check_current(self, curs):
         """
@@ -126,26 +230,15 @@ class AgingTest:
         return all(c <= self.current_standard for c in curs)
     
     def set_max_current(self):
-        value = [200,200,200,200,200,200]
-        return self.write_to_regesister(address=self.ROH_FINGER_CURRENT_LIMIT0,value=value)
+        return self.write_to_regesister(address=self.ROH_FINGER_CURRENT_LIMIT0,value=self.max_current_limit)
 
-    def judge_if_hand_broken(self, address, gesture):
+    def check_max_current(self):
         """
-        判断设备是否损坏。
-
-        通过读取指定地址的寄存器数据，并与给定的手势数据对比，如果有任何一个寄存器值与手势值的差值超过FINGER_POS_TARGET_MAX_LOSS则认为设备损坏。
-
-        :param address: 要读取数据的寄存器地址。
-        :param gesture: 用于对比的手势数据。
-        :return: 一个布尔值，表示设备是否损坏。
+        读取各电机的电流限制，判断是否已经是 max_current_limit。
         """
-        is_broken = False
-        response = self.read_from_register(address=address, count=6)
-        if response is not None and not response.isError():
-            for i in range(len(response.registers)):
-                if abs(response.registers[i] - gesture[i]) > self.FINGER_POS_TARGET_MAX_LOSS:
-                    is_broken = True
-        return is_broken
+        response = self.read_from_register(address=self.ROH_FINGER_CURRENT_LIMIT0, count=len(self.max_current_limit))
+        return response is not None and not response.isError() and list(response.registers) == self.max_current_limit
+
 
     def connect_device(self):
         """
@@ -158,6 +251,8 @@ class AgingTest:
         connect_status = False
         try:
             self.client = ModbusSerialClient(port=self.port, framer=self.FRAMER_TYPE, baudrate=self.BAUDRATE)
+            sequence_optimizer.invalidate(self.port) # 新连接不沿用之前记录的目标位置
+            motion_planner.invalidate(self.port)
             connect_status = self.client.connect()
             logger.info(f"[port = {self.port}]Successfully connected to Modbus device.\n")
         except ConnectionException as e:
@@ -166,12 +261,67 @@ class AgingTest:
             logger.error(f"Error during setup[port = {self.port}]: {e}\n")
         return connect_status
 
+    def check_health(self):
+        """
+        用一次短超时的 ROH_NODE_ID 读取检查当前会话是否可用，失败时不记入 fail_port_list。
+
+        :return: 一个布尔值，表示设备是否正常应答。
+        """
+        if self.client is None or not self.client.connected:
+            return False
+        previous_timeout = self.set_timeout(self.health_check_timeout)
+        try:
+            response = self.client.read_holding_registers(address=self.ROH_NODE_ID, count=1, slave=self.node_id)
+            return not response.isError()
+        except Exception:
+            return False
+        finally:
+            self.set_timeout(previous_timeout)
+
+    def set_timeout(self, timeout):
+        """
+        修改应答超时时间（秒），返回原来的值。
+        """
+        previous = self.client.comm_params.timeout_connect
+        self.client.comm_params.timeout_connect = timeout
+        if self.client.socket is not None:
+            self.client.socket.timeout = timeout
+        return previous
+
+    def ensure_session(self):
+        """
+        保证端口会话可用：首次使用或健康检查失败时重新连接，一次性设置只在新会话上执行。
+
+        :return: 一个布尔值，表示是否已连接到设备；一次性设置是否成功见 setup_done。
+        """
+        if not self.check_health():
+            if self.client is not None:
+                logger.info(f'[port = {self.port}]会话不可用，重新连接\n')
+                metrics.increment(self.port, 'reconnects')
+                self.disConnect_device()
+            self.setup_done = False
+            self.poll_errors = 0
+            if not self.connect_device():
+                return False
+            if self.sample_rate > 0:
+                self.sampler = TelemetrySampler(self.port, self.poll_register, self.client_lock, rate=self.sample_rate).start()
+        if not self.setup_done and self.resumed and self.check_max_current():
+            # 恢复运行时设备还保持着上次的设置，不重新初始化
+            logger.info(f'[port = {self.port}]电流限制已设置，继续上次的老化测试\n')
+            self.setup_done = True
+        if not self.setup_done:
+            self.setup_done = self.set_max_current() # 设置最大的电量限制为200ma
+        return True
+
     def disConnect_device(self):
         """
         断开与Modbus设备的连接。
 
         如果存在client实例则关闭连接并将client设置为None，同时记录日志，如果出现异常也会记录。
         """
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
         if self.client:
             try:
                 self.client.close()
@@ -181,6 +331,47 @@ class AgingTest:
                 logger.error(f"[port = {self.port}]Error during dis connect device: {e}\n")
 
 
+class AgingSessionRegistry:
+    """
+    按端口管理整个老化过程中复用的 AgingTest 会话。
+
+    每个端口只在第一次使用时创建会话，之后每一轮都复用同一个串口连接；
+    测试结束或端口被判定失败后通过 close_port/close_all 关闭串口。
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.sample_rate = 0 # 新建会话的后台采样频率
+        self.resumed = False # 新建会话是否来自检查点恢复
+
+    def get(self, port):
+        with self._lock:
+            session = self._sessions.get(port)
+            if session is None:
+                session = AgingTest()
+                session.port = port
+                session.sample_rate = self.sample_rate
+                session.resumed = self.resumed
+                self._sessions[port] = session
+        return session
+
+    def close_port(self, port):
+        with self._lock:
+            session = self._sessions.pop(port, None)
+        if session is not None:
+            session.disConnect_device()
+
+    def close_all(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.disConnect_device()
+
+
+session_registry = AgingSessionRegistry()
+
 def check_port(valid_port: set = {}, total_port: list = {}):
     """
     从total_port列表中去除valid_port集合中的元素，并同步去除对应的node_ids列表中的元素，
@@ -205,76 +396,127 @@ def check_port(valid_port: set = {}, total_port: list = {}):
     result_ports = [total_port[i] for i in valid_indices]
     return result_ports
 
-def main(ports: list = [],  max_cycle_num: float = 1.5) -> Tuple[List,bool]:
+def main(ports: list = [],  max_cycle_num: float = 1.5, sample_rate: float = 0, checkpoint_path: str = None, resume: bool = False) -> Tuple[List,bool]:
     """
     测试的主函数。
     :param ports: 端口列表
     :param node_ids: 设备id列表,与端口号一一对应
+    :param sample_rate: 动作过程中后台采样电流、位置、状态的频率（次/秒），0 表示不采样
+    :param checkpoint_path: 检查点文件，默认为 checkpoints/aging_test_v2.json
+    :param resume: 为True且检查点存在时，从检查点继续上次未完成的老化测试，ports 和 max_cycle_num 以检查点为准
     :return: 测试标题,测试结果数据,测试结论,是否需要显示电机电流(false)
     """
     overall_result = []
     final_result = '通过'
+    if checkpoint_path is None:
+        checkpoint_path = os.path.join(CHECKPOINT_DIR, 'aging_test_v2.json')
+    checkpoint = RunCheckpoint(checkpoint_path)
+    state = checkpoint.load() if resume else None
+    if resume and state is None:
+        logger.info(f'没有可用的检查点 {checkpoint_path}，重新开始老化测试')
+    metrics.reset()
+    sequence_optimizer.reset()
+    degradation_monitor.reset()
+    if state is None:
+        duration = max_cycle_num * 3600
+        elapsed = 0.0
+        port_elapsed = {}
+        telemetry.start(name='aging_test_v2')
+        sink = ResultSink(name='aging_test_v2')
+        collector = ResultCollector(sink)
+    else:
+        ports = state['ports']
+        duration = state['duration']
+        elapsed = state['elapsed']
+        port_elapsed = dict(state['port_elapsed'])
+        fail_port_list.update(state['fail_ports'])
+        degradation_monitor.load_state(state['detector'])
+        telemetry.start(path=state['telemetry_path'], cycles=state['cycle_counts'], rows=state.get('telemetry_rows'))
+        sink = ResultSink(path=state['sink']['path'])
+        sink.load_state(state['sink'])
+        collector = ResultCollector(sink, cycle_counts=state['cycle_counts'], stopped_ports=state['stopped_ports'])
+        logger.info(f"从检查点恢复老化测试（保存于 {state['saved_at']}），已运行 {elapsed / 3600:.2f} 小时，剩余 {max(duration - elapsed, 0) / 3600:.2f} 小时")
     start_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------开始老化测试<开始时间：{start_time}>----------------------------------------------\n')
     logger.info('测试目的：循环做抓握手势，进行压测')
     logger.info('标准：各个手头无异常，手指不脱线，并记录各个电机的电流值 < 单位 mA >\n')
+    session_registry.sample_rate = sample_rate
+    session_registry.resumed = state is not None
+    run_start = time.time()
+    telemetry_path = telemetry.path
+    all_ports = list(ports)
+    cycle_start = {}
+
+    def build_state():
+        # 只记录运行时间而不是截止时间，中断期间不计入老化时长
+        return {
+            'ports': all_ports,
+            'duration': duration,
+            'elapsed': elapsed + time.time() - run_start,
+            'port_elapsed': dict(port_elapsed),
+            'cycle_counts': dict(collector.cycle_counts),
+            'fail_ports': sorted(fail_port_list),
+            'stopped_ports': collector.stopped_ports(),
+            'sink': sink.state(),
+            'detector': degradation_monitor.state(),
+            'telemetry_path': telemetry_path,
+            'telemetry_rows': telemetry.saved_rows,
+        }
+
+    def after_cycle(port, port_result, collector):
+        port_elapsed[port] = port_elapsed.get(port, 0.0) + time.time() - cycle_start.get(port, run_start)
+        cycle_start[port] = time.time()
+        stop_failed_port(port, port_result, collector)
+        telemetry.flush()
+        checkpoint.save_if_due(build_state)
+
+    completed = False
     try:
-        end_time = time.time() + max_cycle_num * 3600
-        round_num = 0
-        while time.time() < end_time:
-            ports = check_port(valid_port=fail_port_list,total_port=ports)
-            if len(ports)==0:
-                logger.info('无可测试设备')
-                break
-            round_num += 1
-            logger.info(f"##########################第 {round_num} 轮测试开始######################\n")
-            result = '通过'
-
-            round_results = []
-            with concurrent.futures.ThreadPoolExecutor(max_workers=64) as executor:
-                futures = [executor.submit(test_single_port, port) for port in ports]
-                for future in concurrent.futures.as_completed(futures):
-                    port_result, _ = future.result()
-                    round_results.append(port_result)
-                    for gesture_result in port_result["gestures"]:
-                        if gesture_result["result"]!= "通过":
-                            result = '不通过'
-                            final_result = '不通过'
-                            break
-            overall_result.extend(round_results)
-            # with concurrent.futures.ProcessPoolExecutor() as executor:
-            #     futures = [executor.submit(test_single_port, port) for port in ports]
-            #     for future in concurrent.futures.as_completed(futures):
-            #         try:
-            #             port_result, _ = future.result()
-            #             round_results.append(port_result)
-            #             for gesture_result in port_result["gestures"]:
-            #                 if gesture_result["result"] != "通过":
-            #                     result = '不通过'
-            #                     final_result = '不通过'
-            #                     break
-            #         except Exception as e:
-            #             print(f"Error processing port test: {e}")
-            #             result = '不通过'
-            # overall_result.extend(round_results)
-
-            logger.info(f"#################第 {round_num} 轮测试结束，测试结果：{result}#############\n")
+        end_time = run_start + duration - elapsed
+        ports = check_port(valid_port=fail_port_list,total_port=ports)
+        if len(ports)==0:
+            logger.info('无可测试设备')
+        # 每个端口独立循环到截止时间，结果实时汇总；端口读写失败后只停止该端口，每轮结束后按间隔保存检查点
+        collector = run_port_workers(ports, test_single_port, end_time, collector, after_cycle=after_cycle)
+        final_result = collector.final_result
+        completed = True
     except Exception as e:
         final_result = '不通过'
         logger.error(f"Error: {e}")
-    # finally:
-    #     logger.info("执行测试结束后的清理操作（如有）")
+    finally:
+        session_registry.close_all()
+        telemetry.flush()
+        checkpoint.save(build_state())
+        sink.close()
+    if completed:
+        # 正常跑完后不再需要恢复
+        checkpoint.remove()
+    overall_result = sink.summary_results()
+    telemetry.stop()
+    metrics.dump()
     end_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------老化测试结束，测试结果：{final_result}<结束时间：{end_time}>----------------------------------------------\n')
     return overall_result, final_result
 
+def stop_failed_port(port, port_result, collector):
+    """
+    端口出现读写失败（记入 fail_port_list）或电机退化检测报警后停止该端口的工作线程并关闭串口。
+    """
+    if degradation_monitor.should_stop(port):
+        logger.error(f'[port = {port}]检测到电机退化，停止该端口的老化测试\n')
+    if port in fail_port_list or degradation_monitor.should_stop(port):
+        collector.stop_port(port)
+        session_registry.close_port(port)
+
 def test_single_port(port):
     """
     针对单个端口进行测试，返回该端口测试结果的字典，包含端口号、是否通过及具体手势测试结果等信息。
+    串口连接在各轮之间复用，由 session_registry 统一关闭。
     """
-    aging_test = AgingTest()
-    aging_test.port = port
-    connected_status = aging_test.connect_device()
+    telemetry.begin_cycle(port)
+    sequence_optimizer.begin_cycle(port)
+    aging_test = session_registry.get(port)
+    connected_status = aging_test.ensure_session()
     
     port_result = {
         'port': port,
@@ -286,20 +528,27 @@ def test_single_port(port):
         grasp_gesture = aging_test.grasp_gesture
         initial_gesture = aging_test.initial_gesture
         try:
-            if aging_test.set_max_current(): # 设置最大的电量限制为200ma
+            if aging_test.setup_done:
+                aging_test.degradation_alarms = []
                 if aging_test.do_gesture(grasp_gesture[0]) and aging_test.do_gesture(grasp_gesture[1]):
                     aging_test.count_motor_curtent()
                     logger.info(f'[port = {port}]执行抓握手势，电机电流为 -->{aging_test.motor_currents}\n')
-                if aging_test.do_gesture(initial_gesture[0]) and aging_test.do_gesture(initial_gesture[1]):
-                    if not aging_test.judge_if_hand_broken(aging_test.ROH_FINGER_POS_TARGET0,initial_gesture[1]):
+                    aging_test.check_degradation()
+                if aging_test.do_gesture(initial_gesture[0]):
+                    verdict = aging_test.do_gesture(initial_gesture[1], verify=True)
+                    if verdict:
                         motor_currents = aging_test.motor_currents
                         # if aging_test.check_current(motor_currents):
                         #     gesture_result = build_gesture_result(timestamp =timestamp,content=motor_currents,result='通过')
                         # else:
                         #     gesture_result = build_gesture_result(timestamp =timestamp,content=motor_currents,result='不通过')
-                        gesture_result = build_gesture_result(timestamp =timestamp,content=motor_currents,result='通过')
+                        if aging_test.degradation_alarms:
+                            content = f'{motor_currents}，' + '；'.join(str(alarm) for alarm in aging_test.degradation_alarms)
+                            gesture_result = build_gesture_result(timestamp =timestamp,content=content,result='不通过')
+                        else:
+                            gesture_result = build_gesture_result(timestamp =timestamp,content=motor_currents,result='通过')
                     else:
-                        gesture_result = build_gesture_result(timestamp =timestamp,content='手指出现异常',result='不通过')
+                        gesture_result = build_gesture_result(timestamp =timestamp,content=f'手指出现异常：{verdict}',result='不通过')
                 else:
                     gesture_result = build_gesture_result(timestamp =timestamp,content='手指出现异常',result='不通过')
             else:
@@ -309,8 +558,7 @@ def test_single_port(port):
         except Exception as e:
             error_gesture_result = build_gesture_result(timestamp =timestamp,content=f'出现错误：{e}',result='不通过')
             port_result['gestures'].append(error_gesture_result)
-        finally:
-            aging_test.disConnect_device()
+    port_result['sequence'] = sequence_optimizer.end_cycle(port)
     return port_result,connected_status
 
 def build_gesture_result(timestamp,content,result):
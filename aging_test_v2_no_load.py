@@ -7,6 +7,13 @@ from pymodbus.exceptions import ConnectionException, ModbusIOException
 from pymodbus import FramerType
 from pymodbus.client import ModbusSerialClient
 
+from finger_motion import actuate_and_verify, wait_motion_done
+from result_sink import ResultSink
+from modbus_metrics import FC_READ_HOLDING_REGISTERS, FC_WRITE_MULTIPLE_REGISTERS, metrics, register_count
+from gesture_library import NO_LOAD_GESTURES, get_step, write_registers
+from gesture_sequence import sequence_optimizer
+from motion_planner import motion_planner
+
 # 设置日志级别为INFO，获取日志记录器实例
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -21,16 +28,13 @@ class AgingTest:
         self.FRAMER_TYPE = FramerType.RTU
         self.client = None
         self.BAUDRATE = 115200
-        self.FINGER_POS_TARGET_MAX_LOSS = 32
         self.ROH_FINGER_POS_TARGET0 = 1135
         self.ROH_FINGER_CURRENT_LIMIT0 = 1095
         self.MAX_CYCLE_NUM = 1# 测试循环的最大次数，初始为1
-        # 定义28个手势动作，每个动作分两步完成
-        self.initial_gesture = [0, 0, 0, 0, 0, 728]
-        self.fist_gesture = [[0, 0, 0, 0, 0, 728], [0, 65535, 65535, 65535, 65535, 728]]
-        self.second_gesture = [[0, 0, 0, 0, 0, 728], [65535, 0, 0, 0, 0, 728]]
-        self.third_gesture = [[0, 0, 0, 0, 0, 728], [0, 0, 0, 0, 0, 65535]]
-        self.aging_speed = 1# 动作间隔，最少0.4，否则手指会碰撞，值越小越快
+        self.initial_gesture = get_step('no_load_open')
+        self.motion_timeout = 5 # 等待动作完成的最长时间（秒）
+        self.max_poll_errors = 5 # 轮询连续读失败多少次才认为端口故障
+        self.poll_errors = 0
 
         self.gestures = self.create_gesture_dict()
         
@@ -44,12 +48,8 @@ class AgingTest:
         return self.MAX_CYCLE_NUM
     
     def create_gesture_dict(self):
-        gesture_dict = {
-            'fist': self.fist_gesture,
-            'second': self.second_gesture,
-            'third': self.third_gesture
-        }
-        return gesture_dict
+        # 手势定义在 gesture_library 中，每个动作分两步完成
+        return NO_LOAD_GESTURES
     
     def get_initial_gesture(self):
         return self.initial_gesture
@@ -64,8 +64,11 @@ class AgingTest:
         :param count: 要读取的寄存器数量。
         :return: 如果成功读取则返回pymodbus的read_holding_registers响应对象，否则返回None。
         """
+        response = None
         try:
+            start = time.perf_counter()
             response = self.client.read_holding_registers(address=address, count=count, slave=self.node_id)
+            metrics.observe(self.port, FC_READ_HOLDING_REGISTERS, time.perf_counter() - start, count, not response.isError())
             if response.isError():
                 logger.error(f'[port = {self.port}]读寄存器失败\n')
                 fail_port_list.update([self.port])
@@ -73,6 +76,28 @@ class AgingTest:
             logger.error(f'[port = {self.port}]异常: {e}')
         return response
         
+    def poll_register(self, address, count):
+        """
+        轮询用的读寄存器（等待动作完成），每秒几十次，偶尔丢一帧不代表设备故障：
+        连续 max_poll_errors 次读失败才记入 fail_port_list。
+        :return: 如果成功读取则返回pymodbus的read_holding_registers响应对象，否则返回None或错误响应。
+        """
+        response = None
+        try:
+            start = time.perf_counter()
+            response = self.client.read_holding_registers(address=address, count=count, slave=self.node_id)
+            metrics.observe(self.port, FC_READ_HOLDING_REGISTERS, time.perf_counter() - start, count, not response.isError())
+        except Exception as e:
+            logger.error(f'[port = {self.port}]异常: {e}')
+        if response is not None and not response.isError():
+            self.poll_errors = 0
+        else:
+            self.poll_errors += 1
+            if self.poll_errors == self.max_poll_errors:
+                logger.error(f'[port = {self.port}]连续 {self.poll_errors} 次轮询读寄存器失败\n')
+                fail_port_list.update([self.port])
+        return response
+
     def write_to_regesister(self, address, value):
         """
         向指定的寄存器地址写入数据。
@@ -81,7 +106,9 @@ class AgingTest:
         :return: 如果写入成功则返回True，否则返回False。
         """
         try:
-            response = self.client.write_registers(address, value, self.node_id)
+            start = time.perf_counter()
+            response = write_registers(self.client, address, value, self.node_id)
+            metrics.observe(self.port, FC_WRITE_MULTIPLE_REGISTERS, time.perf_counter() - start, register_count(value), not response.isError())
             if not response.isError():
                     return True
             else:
@@ -104,6 +131,8 @@ class AgingTest:
         connect_status = False
         try:
             self.client = ModbusSerialClient(port=self.port, framer=self.FRAMER_TYPE, baudrate=self.BAUDRATE)
+            sequence_optimizer.invalidate(self.port) # 新连接不沿用之前记录的目标位置
+            motion_planner.invalidate(self.port)
             connect_status = self.client.connect()
             logger.info(f"[port = {self.port}]Successfully connected to Modbus device.")
         except ConnectionException as e:
@@ -126,41 +155,49 @@ class AgingTest:
             except Exception as e:
                 logger.error(f"[port = {self.port}]Error during teardown: {e}")
 
-    def do_gesture(self,key,gesture):
+    def do_gesture(self,key,gesture,verify=False):
         """
         执行特定的手势动作。
 
         实际是向特定寄存器（ROH_FINGER_POS_TARGET0）写入手势数据。
+        目标位置与上一步相同时由 sequence_optimizer 跳过，直接返回上一步的结果。
 
         :param gesture: 要执行的手势数据。
+        :param verify: 为True时动作完成后一次块读实际位置、电流和状态，返回逐个手指判定的 StepVerdict。
         :return: 调用write_to_regesister方法的结果，即写入是否成功的布尔值。
         """
         # print(f"[port = {self.port}]执行    ---->  {key}")
-        time.sleep(self.aging_speed)
-        return self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=gesture)
-    
-    def set_max_current(self):
-        value = [200,200,200,200,200,200]
-        return self.write_to_regesister(address=self.ROH_FINGER_CURRENT_LIMIT0,value=value)
+        def execute(step):
+            if verify:
+                verdict = actuate_and_verify(self.write_gesture, self.read_from_register, step, wait_motion=self.wait_motion_done)
+                if not verdict:
+                    logger.error(f'[port = {self.port}]{key} 手势未到位: {verdict}\n')
+                return verdict
+            return self.write_gesture(self.ROH_FINGER_POS_TARGET0, step) and self.wait_motion_done()
+        return sequence_optimizer.run_step(self.port, gesture, execute, verify=verify)
 
-    def judge_if_hand_broken(self, address, gesture):
+    def write_gesture(self, address, step):
+        """
+        按 motion_planner 的规划写入一步手势：只有大拇指和食指可能相撞时才错开下发，其余情况立即写入。
         """
-        判断设备是否损坏。
+        return motion_planner.write(self.port, step, self.write_to_regesister, self.wait_motion_done)
 
-        通过读取指定地址的寄存器数据，并与给定的手势数据对比，如果有任何一个寄存器值与手势值的差值超过FINGER_POS_TARGET_MAX_LOSS则认为设备损坏。
+    def wait_motion_done(self, fingers=None):
+        """
+        等待本次动作完成（所有手指停止）。
 
-        :param address: 要读取数据的寄存器地址。
-        :param gesture: 用于对比的手势数据。
-        :return: 一个布尔值，表示设备是否损坏。
+        :param fingers: 可选，只等待这些手指停止。
+        :return: 一个布尔值，表示动作是否正常完成；出现堵转或超时返回False。
         """
-        is_broken = False
-        response = self.read_from_register(address=address, count=6)
-        if response is not None and not response.isError():
-            for i in range(len(response.registers)):
-                if abs(response.registers[i] - gesture[i]) > self.FINGER_POS_TARGET_MAX_LOSS:
-                    print(f'{response.registers[i] } ----{gesture[i]}')
-                    is_broken = True
-        return is_broken
+        result = wait_motion_done(self.poll_register, timeout=self.motion_timeout, fingers=fingers)
+        if not result.done:
+            logger.error(f'[port = {self.port}]手指动作未完成: {result}\n')
+        return result.done
+    
+    def set_max_current(self):
+        value = [200,200,200,200,200,200]
+        return self.write_to_regesister(address=self.ROH_FINGER_CURRENT_LIMIT0,value=value)
+
     
 def check_port(valid_port: set = {}, total_port: list = {}):
     """
@@ -200,10 +237,13 @@ def main(ports=None, max_cycle_num=1):
     overall_result = []
     connected_status = False
     
+    metrics.reset()
+    sequence_optimizer.reset()
     start_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------开始老化测试<开始时间：{start_time}>----------------------------------------------\n')
     logger.info('测试目的：循环做抓握手势，进行压测')
     logger.info('标准：各个手头无异常，手指不脱线\n')
+    sink = ResultSink(name='aging_test_v2_no_load')
     try:
         start_time = time.time()
         end_time = start_time + max_cycle_num * 3600
@@ -220,7 +260,7 @@ def main(ports=None, max_cycle_num=1):
                 futures = [executor.submit(run_tests_for_port, port, connected_status) for port in ports]
                 for future in concurrent.futures.as_completed(futures):
                     port_result, _ = future.result()
-                    overall_result.append(port_result)
+                    sink.write(port_result)
                     for gesture_result in port_result["gestures"]:
                         if gesture_result["result"]!= "通过":
                             result = '不通过'
@@ -232,7 +272,9 @@ def main(ports=None, max_cycle_num=1):
     except Exception as e:
         logging.error(f"Error: {e}")
     finally:
-        pass
+        sink.close()
+    overall_result = sink.summary_results()
+    metrics.dump()
     end_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------老化测试结束<结束时间：{end_time}>----------------------------------------------\n')
     # print(f'最终测试结果：{overall_result}')
@@ -266,6 +308,7 @@ def run_tests_for_port(port, connected_status):
         "port": port,
         "gestures": []
     }
+    sequence_optimizer.begin_cycle(port)
 
     try:
         if aging_test.set_max_current():# 设置最大的电量限制为200ma
@@ -275,7 +318,7 @@ def run_tests_for_port(port, connected_status):
         
                     # 做新的手势
                     for step in gesture:
-                        if aging_test.do_gesture(key=key, gesture=step) and not aging_test.judge_if_hand_broken(address=aging_test.get_op_address(), gesture=step):
+                        if aging_test.do_gesture(key=key, gesture=step, verify=True):
                             gesture_result = {
                                 "timestamp":timestamp,
                                 "content": key,
@@ -288,7 +331,7 @@ def run_tests_for_port(port, connected_status):
                                 "result": "不通过"
                             }
                             # 先恢复默认手势
-                    if aging_test.do_gesture(key=key, gesture=aging_test.get_initial_gesture()) and not aging_test.judge_if_hand_broken(address=aging_test.get_op_address(), gesture=aging_test.get_initial_gesture()):
+                    if aging_test.do_gesture(key=key, gesture=aging_test.get_initial_gesture(), verify=True):
                         gesture_result = {
                             "timestamp":timestamp,
                             "content": key,
@@ -323,6 +366,7 @@ def run_tests_for_port(port, connected_status):
             port_result["gestures"].append(gesture_result)
             # logger.info(f'[port = {port}]测试结果 {gesture_result["result"]}')
 
+    port_result["sequence"] = sequence_optimizer.end_cycle(port)
     aging_test.disConnect_device()
     return port_result, connected_status
 
@@ -0,0 +1,192 @@
+## Modbus 读写性能测试：统计单帧延迟分位数和每个端口的吞吐量，结果输出为 JSON 便于不同版本之间对比
+import argparse
+import concurrent.futures
+import datetime
+import json
+import logging
+import platform
+import sys
+import time
+
+from modbus_pacing import FramePacer, PACING_PROFILES
+from modbus_test_v2 import MAX_READ_COUNT, ModbusClient, ROH_FINGER_P0, ROH_FINGER_STATUS0
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+WORKLOADS = ('read', 'write', 'snapshot')
+# 写测试把 ROH_FINGER_P0 开始的寄存器原样写回，P/I/D/G 共 40 个连续可写寄存器
+MAX_WRITE_BLOCK = ROH_FINGER_STATUS0 - ROH_FINGER_P0
+
+
+def percentile(sorted_values, percent):
+    """
+    最近秩法计算百分位数，sorted_values 需已排序。
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_port(client, workload, block_size, duration):
+    """
+    在一个端口上持续执行 workload 直到 duration 秒，返回 (每次事务延迟列表, 失败次数)。
+    """
+    latencies = []
+    errors = 0
+    values = None
+    if workload == 'write':
+        response = client.read_from_register(address=ROH_FINGER_P0, count=block_size)
+        if response is None:
+            return latencies, 1
+        values = list(response.registers)
+
+    end_time = time.perf_counter() + duration
+    while time.perf_counter() < end_time:
+        start = time.perf_counter()
+        if workload == 'read':
+            ok = client.read_from_register(address=ROH_FINGER_P0, count=block_size) is not None
+        elif workload == 'write':
+            ok = client.write_to_register(address=ROH_FINGER_P0, values=values)
+        else:
+            ok = client.snapshot() is not None
+        if ok:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors += 1
+    return latencies, errors
+
+
+def run_case(ports, workload, block_size, profile, duration, simulated_ports=()):
+    """
+    所有端口同时执行同一个 workload，汇总延迟分位数和吞吐量。
+    """
+    clients = []
+    try:
+        for port in ports:
+            client = ModbusClient(port=port)
+            client.pacer = FramePacer(client.baudrate, profile)
+            clients.append(client)
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(clients)) as executor:
+            port_results = list(executor.map(lambda client: run_port(client, workload, block_size, duration), clients))
+        elapsed = time.perf_counter() - start
+    finally:
+        for client in clients:
+            client.close()
+
+    latencies = sorted(latency for port_latencies, _ in port_results for latency in port_latencies)
+    transactions = len(latencies)
+    errors = sum(port_errors for _, port_errors in port_results)
+    return {
+        'workload': workload,
+        'profile': profile,
+        'block_size': block_size,
+        'port_count': len(ports),
+        'duration': round(elapsed, 3),
+        'transactions': transactions,
+        'errors': errors,
+        'tps': round(transactions / elapsed, 2) if elapsed > 0 else None,
+        'tps_per_port': round(transactions / elapsed / len(ports), 2) if elapsed > 0 else None,
+        'simulated': any(port in simulated_ports for port in ports),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+            'p95': round(percentile(latencies, 95) * 1000, 3) if latencies else None,
+            'p99': round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+            'max': round(latencies[-1] * 1000, 3) if latencies else None,
+        },
+    }
+
+
+def run_benchmark(ports, port_counts, workloads, block_sizes, profiles, duration, simulated_ports=()):
+    """
+    按 端口数 x 负载类型 x 块大小 x 节奏配置 逐一测试，返回结果列表。
+    """
+    results = []
+    for port_count in port_counts:
+        if port_count > len(ports):
+            logger.error(f'端口数 {port_count} 超过可用端口数 {len(ports)}，跳过')
+            continue
+        for workload in workloads:
+            # 整表快照的块大小由 plan_block_reads 决定
+            sizes = [None] if workload == 'snapshot' else block_sizes
+            for block_size in sizes:
+                if workload == 'write' and block_size > MAX_WRITE_BLOCK:
+                    logger.info(f'写测试块大小 {block_size} 超过 {MAX_WRITE_BLOCK}，跳过')
+                    continue
+                for profile in profiles:
+                    result = run_case(ports[:port_count], workload, block_size, profile, duration, simulated_ports)
+                    logger.info(f"{workload:8} profile={profile:18} block={str(block_size):4} ports={port_count:3} "
+                                f"tps={result['tps']} p50={result['latency_ms']['p50']}ms p99={result['latency_ms']['p99']}ms errors={result['errors']}")
+                    results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Modbus 读写性能测试')
+    parser.add_argument('--ports', nargs='*', default=[], help='真实设备端口，例如 COM3 COM4')
+    parser.add_argument('--simulate', type=int, default=0, help='使用模拟器创建的端口数量（仅 Linux），所有模拟手共用一个线程，'
+                        '端口数扩展的结果只在模拟器没有成为瓶颈时有参考价值，以真实设备为准')
+    parser.add_argument('--response-delay', type=float, default=0.0, help='模拟器每次应答前的处理时间（秒），按手分别计时')
+    parser.add_argument('--port-counts', type=int, nargs='*', help='要测试的端口数，默认 1 到全部端口按 2 的倍数递增')
+    parser.add_argument('--workloads', nargs='*', default=list(WORKLOADS), choices=WORKLOADS)
+    parser.add_argument('--block-sizes', type=int, nargs='*', default=[1, 6, 40, MAX_READ_COUNT])
+    parser.add_argument('--profiles', nargs='*', default=['rtu'], choices=sorted(PACING_PROFILES))
+    parser.add_argument('--duration', type=float, default=5.0, help='每组测试持续时间（秒）')
+    parser.add_argument('--output', help='结果 JSON 文件路径，默认输出到标准输出')
+    args = parser.parse_args()
+
+    # 每次读写成功都会打印日志，测试期间关闭以免影响结果
+    logging.getLogger('modbus_test_v2').setLevel(logging.WARNING)
+
+    server = None
+    ports = list(args.ports)
+    simulated_ports = set()
+    if args.simulate:
+        from roh_simulator import SimulatorServer
+        server = SimulatorServer().start()
+        simulated_ports.update(server.add_hand(response_delay=args.response_delay) for _ in range(args.simulate))
+        ports += sorted(simulated_ports)
+    if not ports:
+        parser.error('请通过 --ports 或 --simulate 指定端口')
+
+    port_counts = args.port_counts
+    if not port_counts:
+        port_counts = []
+        count = 1
+        while count < len(ports):
+            port_counts.append(count)
+            count *= 2
+        port_counts.append(len(ports))
+
+    try:
+        results = run_benchmark(ports, port_counts, args.workloads, args.block_sizes, args.profiles, args.duration, simulated_ports)
+    finally:
+        if server is not None:
+            server.stop()
+
+    report = {
+        'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'simulated': bool(args.simulate),
+        # 模拟端口的结果单独标注，不要与真实设备的结果混在一起比较端口数扩展
+        'simulator': {'hands': args.simulate, 'response_delay': args.response_delay} if args.simulate else None,
+        'duration': args.duration,
+        'results': results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        logger.info(f'结果已保存到 {args.output}')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,7 @@ import sys
 from tkinter import filedialog
 import tkinter.messagebox
 import importlib
+import inspect
 import datetime
 from tkinter import ttk
 from tkinter.scrolledtext import ScrolledText
@@ -105,6 +106,8 @@ class TestClient:
         self.aging_duration_options = [0.5, 1, 1.5, 3, 8, 12, 24, 48, 96, 168]
         #默认老化时长
         self.selected_aging_duration = 0.5
+        # 是否从检查点继续上次中断的老化测试
+        self.is_resume_selected = False
         #刷新功能间隔时长
         self.last_refresh_time = 0
         
@@ -228,6 +231,12 @@ class TestClient:
         self.combobox_aging.grid(row=0, column=0, padx=5, pady=5)
         # 绑定响应函数
         self.combobox_aging.bind("<<ComboboxSelected>>", self.on_combobox_aging_select)
+
+        self.resume_ckbutton = ttk.Checkbutton(option_menu_frame2, text='从检查点继续')
+        self.resume_ckbutton['style'] = 'TCheckbutton'
+        self.resume_ckbutton.state(['!selected'])
+        self.resume_ckbutton['command'] = self.on_resume_checkbutton_click
+        self.resume_ckbutton.grid(row=0, column=1, padx=5, pady=5)
         
         # 测试结果标签布局
         test_result_label = ttk.Label(self.root, text='测试详情', font=label_font)
@@ -361,6 +370,25 @@ class TestClient:
         else:
             self.is_all_ports_selected = False
             logger.info(f'已勾选单个端口设备')
+
+    def on_resume_checkbutton_click(self):
+        """
+        是否从检查点继续上次中断的老化测试，只对支持 resume 参数的脚本生效
+        """
+        self.is_resume_selected = self.resume_ckbutton.instate(['selected'])
+        if self.is_resume_selected:
+            logger.info('已勾选从检查点继续，端口和老化时长以检查点为准')
+        else:
+            logger.info('已取消从检查点继续')
+
+    def build_main_kwargs(self, module, selected_ports):
+        kwargs = {'ports': selected_ports, 'max_cycle_num': self.selected_aging_duration}
+        if self.is_resume_selected:
+            if 'resume' in inspect.signature(module.main).parameters:
+                kwargs['resume'] = True
+            else:
+                logger.info(f'脚本{self.script_name}不支持从检查点继续，重新开始测试')
+        return kwargs
             
     def getDevicePortNames(self):
         """获取端口信息
@@ -457,11 +485,11 @@ class TestClient:
                 if not self.is_all_ports_selected:
                     selected_ports.append(self.selected_port)
                     logger.info(f'开始执行的脚本为:{self.script_name}，执行设备为{selected_ports}，老化时长为{self.selected_aging_duration}小时\n')
-                    overall_result, result = module.main(ports=selected_ports, max_cycle_num=self.selected_aging_duration)
+                    overall_result, result = module.main(**self.build_main_kwargs(module, selected_ports))
                 else:
                     selected_ports = self.port_names
                     logger.info(f'开始执行的脚本为:{self.script_name}，执行设备为{selected_ports}，老化时长为{self.selected_aging_duration}小时\n')
-                    overall_result, result = module.main(ports=selected_ports, max_cycle_num=self.selected_aging_duration)
+                    overall_result, result = module.main(**self.build_main_kwargs(module, selected_ports))
                 logger.info(f'本次测试结论为：{result} \n详细测试数据为：\n')
                 self.print_overall_result(overall_result)
                 if self.running:
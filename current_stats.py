@@ -0,0 +1,111 @@
+## 电机电流统计：对 (采样次数 x 6) 的数组按电机一次性计算均值、最小值、最大值、标准差和分位数，缺失的采样不参与计算
+import numpy as np
+
+FINGER_COUNT = 6
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+class CurrentStats:
+    """
+    每个电机的统计结果，各属性均为长度为电机数的 numpy 数组，没有有效采样的电机对应 NaN。
+
+    count：有效采样次数。
+    mean/min/max/std：均值、最小值、最大值、标准差（总体标准差）。
+    percentiles：{百分位: 数组}。
+    """
+    def __init__(self, count, mean, minimum, maximum, std, percentiles):
+        self.count = count
+        self.mean = mean
+        self.min = minimum
+        self.max = maximum
+        self.std = std
+        self.percentiles = percentiles
+
+    @property
+    def valid(self):
+        """
+        是否每个电机都至少有一次有效采样。
+        """
+        return bool(len(self.count)) and bool(np.all(self.count > 0))
+
+    def to_list(self, name='mean', digits=None):
+        """
+        把某一项统计转换为 Python 列表，NaN 转为None，digits 不为None时四舍五入。
+        """
+        values = self.percentiles[name] if isinstance(name, int) else getattr(self, name)
+        return [None if np.isnan(value) else (round(float(value), digits) if digits is not None else float(value)) for value in values]
+
+    def summary(self, digits=1):
+        return {
+            'count': self.count.tolist(),
+            'mean': self.to_list('mean', digits),
+            'min': self.to_list('min', digits),
+            'max': self.to_list('max', digits),
+            'std': self.to_list('std', digits),
+            **{f'p{percent}': self.to_list(percent, digits) for percent in self.percentiles},
+        }
+
+
+def to_sample_array(samples, width=FINGER_COUNT):
+    """
+    把采样列表转换为 float64 数组，读取失败的采样（None 或长度不足的行）整行记为 NaN。
+    """
+    if isinstance(samples, np.ndarray):
+        return samples.astype(np.float64, copy=False).reshape(-1, width)
+    array = np.full((len(samples), width), np.nan)
+    for i, row in enumerate(samples):
+        if row is not None and len(row) >= width:
+            array[i] = row[:width]
+    return array
+
+
+def current_statistics(samples, percentiles=DEFAULT_PERCENTILES, width=FINGER_COUNT):
+    """
+    计算每个电机的电流统计。
+
+    :param samples: (采样次数 x width) 的数组，或由每次读到的电流列表组成的列表，读取失败的采样为None/NaN。
+    :param percentiles: 需要计算的百分位。
+    :return: CurrentStats。
+    """
+    data = to_sample_array(samples, width)
+    valid = ~np.isnan(data)
+    count = valid.sum(axis=0)
+    has_data = count > 0
+    # 只在有数据的列上计算，避免全 NaN 列触发 numpy 警告
+    mean = np.full(width, np.nan)
+    minimum = np.full(width, np.nan)
+    maximum = np.full(width, np.nan)
+    std = np.full(width, np.nan)
+    result_percentiles = {percent: np.full(width, np.nan) for percent in percentiles}
+    if has_data.any():
+        columns = data[:, has_data]
+        mean[has_data] = np.nanmean(columns, axis=0)
+        minimum[has_data] = np.nanmin(columns, axis=0)
+        maximum[has_data] = np.nanmax(columns, axis=0)
+        std[has_data] = np.nanstd(columns, axis=0)
+        if percentiles:
+            values = np.nanpercentile(columns, list(percentiles), axis=0)
+            for percent, value in zip(percentiles, values):
+                result_percentiles[percent][has_data] = value
+    return CurrentStats(count, mean, minimum, maximum, std, result_percentiles)
+
+
+def ring_buffer_array(buffer):
+    """
+    把 telemetry_sampler.RingBuffer 中的数据按时间顺序取出为 (时间戳数组, 值数组)。
+    """
+    timestamps = np.frombuffer(buffer.timestamps, dtype=np.float64)
+    values = np.frombuffer(buffer.values, dtype=np.uint16).reshape(buffer.capacity, buffer.width)
+    order = (np.arange(buffer.size) + buffer.head - buffer.size) % buffer.capacity
+    return timestamps[order], values[order]
+
+
+def rolling_statistics(buffer, window, column_offset=FINGER_COUNT, width=FINGER_COUNT, now=None, percentiles=DEFAULT_PERCENTILES):
+    """
+    对环形缓冲区最近 window 秒内的采样做统计，默认取每行中的电流列（第 6~11 列）。
+    """
+    timestamps, values = ring_buffer_array(buffer)
+    if now is None:
+        now = timestamps[-1] if len(timestamps) else 0.0
+    mask = timestamps >= now - window
+    return current_statistics(values[mask, column_offset:column_offset + width], percentiles, width)
@@ -0,0 +1,201 @@
+## 电机退化在线检测：每个端口每个电机维护 EWMA 基线和 CUSUM 累积量，逐轮输入电流，发现漂移或阶跃变化时报警
+import logging
+import math
+import sys
+import threading
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+FINGER_COUNT = 6
+ALARM_DRIFT_UP = 'drift_up'
+ALARM_DRIFT_DOWN = 'drift_down'
+ALARM_STEP = 'step'
+
+alarm_names = {
+    ALARM_DRIFT_UP: '电流持续升高',
+    ALARM_DRIFT_DOWN: '电流持续降低',
+    ALARM_STEP: '电流突变',
+}
+
+
+class DegradationAlarm:
+    """
+    一次报警：finger 为电机序号，kind 为 ALARM_* 之一，value 为本轮电流，baseline 为报警时的基线均值。
+    """
+    def __init__(self, port, finger, kind, value, baseline, round_num):
+        self.port = port
+        self.finger = finger
+        self.kind = kind
+        self.value = value
+        self.baseline = baseline
+        self.round_num = round_num
+
+    def __str__(self):
+        return f'电机 {self.finger} {alarm_names[self.kind]}（第 {self.round_num} 轮 {self.value:.1f}mA，基线 {self.baseline:.1f}mA）'
+
+
+class MotorDetector:
+    """
+    单个电机的检测器，只保存几个标量，内存占用与运行时间无关。
+
+    前 warmup 轮用 Welford 算法估计初始均值和方差，之后用 EWMA 跟踪基线；每轮把电流标准化为
+    z = (x - 均值) / 标准差，累积双侧 CUSUM：S+ = max(0, S+ + z - k)，S- = max(0, S- - z - k)，
+    超过 h 判为漂移；z 先截断到 ±z_clip，单次读数异常不会直接触发报警。|z| 连续 step_rounds 轮超过 step_sigma 判为阶跃。报警后基线冻结，不再被异常数据带偏。
+    标准差不低于 min_std（mA），避免电流很稳定时把读数噪声当成异常。
+    """
+    def __init__(self, alpha=0.02, k=0.5, h=12.0, warmup=30, step_sigma=6.0, step_rounds=2, min_std=2.0, z_clip=4.0):
+        self.alpha = alpha
+        self.k = k
+        self.h = h
+        self.warmup = warmup
+        self.step_sigma = step_sigma
+        self.step_rounds = step_rounds
+        self.min_std = min_std
+        self.z_clip = z_clip
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.cusum_high = 0.0
+        self.cusum_low = 0.0
+        self.step_count = 0
+        self.alarmed = False
+
+    # 检查点中保存的运行状态，参数由构造函数决定
+    STATE_FIELDS = ('count', 'mean', 'variance', 'cusum_high', 'cusum_low', 'step_count', 'alarmed')
+
+    def state(self):
+        return {field: getattr(self, field) for field in self.STATE_FIELDS}
+
+    def load_state(self, state):
+        for field in self.STATE_FIELDS:
+            setattr(self, field, state[field])
+
+    @property
+    def std(self):
+        return max(math.sqrt(self.variance), self.min_std)
+
+    def update(self, value):
+        """
+        输入一轮的电流，返回本轮新产生的报警类型，没有报警时返回None。
+        """
+        if self.alarmed:
+            return None
+        self.count += 1
+        if self.count <= self.warmup:
+            # Welford：variance 暂存 M2，预热结束时换算为方差
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.variance += delta * (value - self.mean)
+            if self.count == self.warmup:
+                self.variance = self.variance / self.warmup
+            return None
+
+        z = (value - self.mean) / self.std
+        self.step_count = self.step_count + 1 if abs(z) >= self.step_sigma else 0
+        z = max(-self.z_clip, min(self.z_clip, z))
+        self.cusum_high = max(0.0, self.cusum_high + z - self.k)
+        self.cusum_low = max(0.0, self.cusum_low - z - self.k)
+
+        kind = None
+        if self.step_count >= self.step_rounds:
+            kind = ALARM_STEP
+        elif self.cusum_high > self.h:
+            kind = ALARM_DRIFT_UP
+        elif self.cusum_low > self.h:
+            kind = ALARM_DRIFT_DOWN
+        if kind is not None:
+            self.alarmed = True
+            return kind
+
+        # 没有异常时才更新基线
+        delta = value - self.mean
+        self.mean += self.alpha * delta
+        self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta * delta)
+        return None
+
+
+class DegradationMonitor:
+    """
+    按端口管理 6 个电机的 MotorDetector，线程安全，可供多个端口的工作线程同时调用。
+
+    任一电机报警后该端口被标记为已退化，stop_on_alarm 为True时测试脚本据此停止该端口的老化循环。
+    """
+    def __init__(self, stop_on_alarm=True, **detector_options):
+        self.stop_on_alarm = stop_on_alarm
+        self.detector_options = detector_options
+        self._detectors = {}
+        self._rounds = {}
+        self._alarms = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._detectors.clear()
+            self._rounds.clear()
+            self._alarms.clear()
+
+    def update(self, port, currents):
+        """
+        输入该端口本轮 6 个电机的电流（None 表示未读到），返回本轮新产生的 DegradationAlarm 列表。
+        """
+        with self._lock:
+            detectors = self._detectors.get(port)
+            if detectors is None:
+                detectors = self._detectors[port] = [MotorDetector(**self.detector_options) for _ in range(FINGER_COUNT)]
+            round_num = self._rounds.get(port, 0) + 1
+            self._rounds[port] = round_num
+            alarms = []
+            for finger, (detector, value) in enumerate(zip(detectors, currents)):
+                if value is None:
+                    continue
+                baseline = detector.mean
+                kind = detector.update(value)
+                if kind is not None:
+                    alarms.append(DegradationAlarm(port, finger, kind, value, baseline, round_num))
+            if alarms:
+                self._alarms.setdefault(port, []).extend(alarms)
+        for alarm in alarms:
+            logger.error(f'[port = {port}]电机退化报警：{alarm}\n')
+        return alarms
+
+    def state(self):
+        """
+        返回所有端口的基线、CUSUM 累积量和报警记录，可直接写入 JSON 检查点。
+        """
+        with self._lock:
+            return {
+                port: {
+                    'round': self._rounds.get(port, 0),
+                    'motors': [detector.state() for detector in detectors],
+                    'alarms': [vars(alarm) for alarm in self._alarms.get(port, [])],
+                }
+                for port, detectors in self._detectors.items()
+            }
+
+    def load_state(self, state):
+        with self._lock:
+            self._detectors.clear()
+            self._rounds.clear()
+            self._alarms.clear()
+            for port, port_state in state.items():
+                detectors = self._detectors[port] = [MotorDetector(**self.detector_options) for _ in range(FINGER_COUNT)]
+                for detector, motor_state in zip(detectors, port_state['motors']):
+                    detector.load_state(motor_state)
+                self._rounds[port] = port_state['round']
+                if port_state['alarms']:
+                    self._alarms[port] = [DegradationAlarm(**alarm) for alarm in port_state['alarms']]
+
+    def is_degraded(self, port):
+        with self._lock:
+            return bool(self._alarms.get(port))
+
+    def should_stop(self, port):
+        return self.stop_on_alarm and self.is_degraded(port)
+
+    def alarms(self, port):
+        with self._lock:
+            return list(self._alarms.get(port, []))
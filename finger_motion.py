@@ -0,0 +1,215 @@
+## 通过轮询 ROH_FINGER_STATUS0~5 判断手指动作是否完成，以及写入一步手势后按实际位置逐个手指判定是否到位
+import asyncio
+import time
+
+from roh_registers import FingerStatusGetter, ROH_FINGER_CURRENT0, ROH_FINGER_POS0, ROH_FINGER_STATUS0
+
+FINGER_COUNT = 6 # 大拇指、食指、中指、无名指、小指、大拇指旋转
+POLL_INTERVAL = 0.02 # 两次状态轮询之间的间隔（秒）
+MIN_MOTION_TIME = 0.1 # 写入后至少等待的时间（秒），之前读到的“已停止”状态不作数
+
+# 一次块读 ROH_FINGER_STATUS0(1085) ~ ROH_FINGER_POS5(1150)，同时得到状态、电流和实际位置
+STEP_STATE_ADDRESS = ROH_FINGER_STATUS0
+STEP_STATE_COUNT = ROH_FINGER_POS0 + FINGER_COUNT - ROH_FINGER_STATUS0
+STATUS_OFFSET = 0
+CURRENT_OFFSET = ROH_FINGER_CURRENT0 - STEP_STATE_ADDRESS
+POSITION_OFFSET = ROH_FINGER_POS0 - STEP_STATE_ADDRESS
+
+# 单个手指的判定结果
+FINGER_OK = 'ok'
+FINGER_BLOCKED = 'blocked'
+FINGER_STUCK = 'stuck'
+FINGER_MOVING = 'moving'
+FINGER_OFF_TARGET = 'off_target'
+FINGER_NO_DATA = 'no_data'
+
+finger_verdict_names = {
+    FINGER_OK: '到位',
+    FINGER_BLOCKED: '受阻停止',
+    FINGER_STUCK: '堵转',
+    FINGER_MOVING: '未停止',
+    FINGER_OFF_TARGET: '位置偏差过大',
+    FINGER_NO_DATA: '未读到',
+}
+
+# 这些状态表示电机已经停止，不会再继续运动
+SETTLED_STATUSES = {
+    FingerStatusGetter.STATUS_POS_REACHED,
+    FingerStatusGetter.STATUS_OVER_CURRENT,
+    FingerStatusGetter.STATUS_FORCE_REACHED,
+    FingerStatusGetter.STATUS_STUCK,
+}
+
+
+class MotionResult:
+    """
+    一次等待动作完成的结果。
+
+    done：所有手指是否都已停止且没有堵转。
+    statuses：最后一次读到的 6 个状态值，未读到时为None。
+    stuck_fingers：处于堵转状态的手指序号列表。
+    timed_out：是否因为超时而返回。
+    elapsed：等待耗时（秒）。
+    """
+    def __init__(self, done, statuses, stuck_fingers, timed_out, elapsed):
+        self.done = done
+        self.statuses = statuses
+        self.stuck_fingers = stuck_fingers
+        self.timed_out = timed_out
+        self.elapsed = elapsed
+
+    def __bool__(self):
+        return self.done
+
+    def __repr__(self):
+        return f'MotionResult(done={self.done}, statuses={self.statuses}, stuck_fingers={self.stuck_fingers}, timed_out={self.timed_out}, elapsed={self.elapsed:.3f})'
+
+
+def wait_motion_done(read_from_register, timeout=5.0, interval=POLL_INTERVAL, min_motion_time=MIN_MOTION_TIME, fingers=None):
+    """
+    一次块读 ROH_FINGER_STATUS0~5，轮询到所有手指停止、出现堵转或超时为止。
+
+    写入目标位置后设备需要一点时间才会把状态更新为“正在展开/正在抓取”，因此在 min_motion_time 之内
+    读到的“已停止”状态不作数，避免把上一个动作的到位状态当成本次的结果。
+
+    :param read_from_register: 形如 read_from_register(address, count) 的读函数，返回pymodbus响应对象或None。
+    :param timeout: 最长等待时间（秒）。
+    :param interval: 两次轮询之间的间隔（秒）。
+    :param min_motion_time: 写入后至少等待的时间（秒）。
+    :param fingers: 可选，只等待这些手指停止，其他手指的状态不影响返回；堵转仍按全部手指判断。
+    :return: MotionResult。
+    """
+    start_time = time.monotonic()
+    statuses = None
+    while True:
+        response = read_from_register(ROH_FINGER_STATUS0, FINGER_COUNT)
+        elapsed = time.monotonic() - start_time
+        result, statuses = judge_motion(response, statuses, elapsed, timeout, min_motion_time, fingers)
+        if result is not None:
+            return result
+        time.sleep(interval)
+
+
+async def async_wait_motion_done(read_from_register, timeout=5.0, interval=POLL_INTERVAL, min_motion_time=MIN_MOTION_TIME, fingers=None):
+    """
+    wait_motion_done 的协程版本，read_from_register 为协程函数，用于 modbus_async_transport 驱动的脚本。
+    """
+    start_time = time.monotonic()
+    statuses = None
+    while True:
+        response = await read_from_register(ROH_FINGER_STATUS0, FINGER_COUNT)
+        elapsed = time.monotonic() - start_time
+        result, statuses = judge_motion(response, statuses, elapsed, timeout, min_motion_time, fingers)
+        if result is not None:
+            return result
+        await asyncio.sleep(interval)
+
+
+def judge_motion(response, statuses, elapsed, timeout, min_motion_time, fingers):
+    """
+    根据一次状态读取判断等待是否可以结束，返回 (MotionResult 或 None, 最近一次读到的状态)。
+    """
+    if response is not None and not response.isError():
+        statuses = list(response.registers)
+        stuck_fingers = [i for i, status in enumerate(statuses) if status == FingerStatusGetter.STATUS_STUCK]
+        if stuck_fingers:
+            return MotionResult(False, statuses, stuck_fingers, False, elapsed), statuses
+        watched = statuses if fingers is None else [statuses[finger] for finger in fingers]
+        if elapsed >= min_motion_time and all(status in SETTLED_STATUSES for status in watched):
+            return MotionResult(True, statuses, [], False, elapsed), statuses
+    if elapsed >= timeout:
+        return MotionResult(False, statuses, [], True, elapsed), statuses
+    return None, statuses
+
+
+class StepVerdict:
+    """
+    一步手势执行后的判定结果。
+
+    written：目标位置是否写入成功。
+    motion_done：等待动作完成是否正常返回。
+    fingers：每个手指的判定（FINGER_* 之一）。
+    statuses/currents/positions：执行后一次块读得到的状态、电流（mA）和实际位置，未读到时为None。
+    """
+    def __init__(self, written, motion_done, fingers, statuses=None, currents=None, positions=None, allow_blocked=False):
+        self.written = written
+        self.motion_done = motion_done
+        self.fingers = fingers
+        self.statuses = statuses
+        self.currents = currents
+        self.positions = positions
+        self.allow_blocked = allow_blocked
+
+    @property
+    def failed_fingers(self):
+        accepted = (FINGER_OK, FINGER_BLOCKED) if self.allow_blocked else (FINGER_OK,)
+        return [finger for finger, verdict in enumerate(self.fingers) if verdict not in accepted]
+
+    @property
+    def passed(self):
+        return self.written and not self.failed_fingers
+
+    def __bool__(self):
+        return self.passed
+
+    def __str__(self):
+        if not self.written:
+            return '写入目标位置失败'
+        return '，'.join(f'手指 {finger} {finger_verdict_names[self.fingers[finger]]}' for finger in self.failed_fingers) or '全部到位'
+
+    def __repr__(self):
+        return f'StepVerdict(written={self.written}, motion_done={self.motion_done}, fingers={self.fingers}, positions={self.positions}, currents={self.currents})'
+
+
+def judge_fingers(step, statuses, positions, tolerance=None):
+    """
+    按状态和实际位置判定每个手指：堵转、仍在运动、在允许偏差内到位、被电流/力控提前停下（受阻）或停在了错误的位置。
+    """
+    if tolerance is None:
+        tolerance = step.tolerance
+    fingers = []
+    for status, position, target in zip(statuses, positions, step):
+        if status == FingerStatusGetter.STATUS_STUCK:
+            fingers.append(FINGER_STUCK)
+        elif status not in SETTLED_STATUSES:
+            fingers.append(FINGER_MOVING)
+        elif abs(position - target) <= tolerance:
+            fingers.append(FINGER_OK)
+        elif status in (FingerStatusGetter.STATUS_OVER_CURRENT, FingerStatusGetter.STATUS_FORCE_REACHED):
+            fingers.append(FINGER_BLOCKED)
+        else:
+            fingers.append(FINGER_OFF_TARGET)
+    return fingers
+
+
+def actuate_and_verify(write_to_register, read_from_register, step, wait_motion=None, timeout=5.0, allow_blocked=None):
+    """
+    写入一步手势的目标位置，等待动作完成，再一次块读状态、电流和实际位置，逐个手指判定是否到位。
+
+    与读回 ROH_FINGER_POS_TARGET0~5 不同，这里比较的是 ROH_FINGER_POS0~5 的实际位置，手指没动或停错位置都能发现；
+    动作未完成时也会读一次，便于定位是哪个手指出了问题。
+
+    :param write_to_register: 形如 write_to_register(address, value) 的写函数，返回是否成功。
+    :param read_from_register: 形如 read_from_register(address, count) 的读函数，返回pymodbus响应对象或None。
+    :param step: gesture_library.GestureStep。
+    :param wait_motion: 可选，无参数的等待函数，返回动作是否完成；默认调用 wait_motion_done。
+    :param timeout: 默认等待函数的最长等待时间（秒）。
+    :param allow_blocked: 为True时被电流/力控提前停下的手指也算通过，用于带负载的抓握；默认取 step.allow_blocked。
+    :return: StepVerdict。
+    """
+    if allow_blocked is None:
+        allow_blocked = step.allow_blocked
+    if not write_to_register(step.address, step):
+        return StepVerdict(False, False, [FINGER_NO_DATA] * len(step), allow_blocked=allow_blocked)
+    if wait_motion is None:
+        motion_done = wait_motion_done(read_from_register, timeout=timeout).done
+    else:
+        motion_done = bool(wait_motion())
+    response = read_from_register(STEP_STATE_ADDRESS, STEP_STATE_COUNT)
+    if response is None or response.isError():
+        return StepVerdict(True, motion_done, [FINGER_NO_DATA] * len(step), allow_blocked=allow_blocked)
+    registers = response.registers
+    statuses = list(registers[STATUS_OFFSET:STATUS_OFFSET + FINGER_COUNT])
+    currents = list(registers[CURRENT_OFFSET:CURRENT_OFFSET + FINGER_COUNT])
+    positions = list(registers[POSITION_OFFSET:POSITION_OFFSET + FINGER_COUNT])
+    return StepVerdict(True, motion_done, judge_fingers(step, statuses, positions), statuses, currents, positions, allow_blocked)
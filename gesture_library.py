@@ -0,0 +1,173 @@
+## 手势库：各测试脚本共用的命名手势，每个手势由一步或多步目标位置组成，相同的步骤在导入时只创建一次、各端口共享
+
+ROH_FINGER_POS_TARGET0 = 1135
+FINGER_COUNT = 6
+# 实际位置与目标位置的最大允许偏差，约为满量程的 1%。原来的 32 是读回 ROH_FINGER_POS_TARGET0~5 时用的，目标寄存器与写入值
+# 只差取整误差；现在比较的是 ROH_FINGER_POS0~5 的实际位置，电机停下的位置本身就有几百的偏差。需要更严的步骤可单独指定 tolerance
+DEFAULT_TOLERANCE = 655
+
+
+class GestureStep:
+    """
+    手势中的一步：一组手指目标位置和允许的位置偏差。
+
+    allow_blocked 为True表示这一步手指会碰到彼此或物体（捏、三指捏、抓握等），被电流/力控提前停下的手指也算到位。
+    values 在各端口之间共享，只读，不要修改。
+    """
+    def __init__(self, values, tolerance=DEFAULT_TOLERANCE, address=ROH_FINGER_POS_TARGET0, allow_blocked=False):
+        self.values = list(values)
+        self.tolerance = tolerance
+        self.allow_blocked = allow_blocked
+        self.address = address
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __repr__(self):
+        return f'GestureStep({self.values}, tolerance={self.tolerance}, allow_blocked={self.allow_blocked})'
+
+
+class Gesture:
+    """
+    一个命名手势，steps 为按顺序执行的 GestureStep。
+    """
+    def __init__(self, name, steps):
+        self.name = name
+        self.steps = tuple(steps)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __getitem__(self, index):
+        return self.steps[index]
+
+    def __iter__(self):
+        return iter(self.steps)
+
+    def __repr__(self):
+        return f'Gesture({self.name!r}, {list(self.steps)})'
+
+
+GESTURES = {}
+_steps = {}
+
+
+def make_step(values, tolerance=DEFAULT_TOLERANCE, address=ROH_FINGER_POS_TARGET0, allow_blocked=False):
+    """
+    返回目标位置相同的共享 GestureStep，相同的步骤只创建一次。
+    """
+    key = (address, tuple(values), tolerance, allow_blocked)
+    step = _steps.get(key)
+    if step is None:
+        step = _steps[key] = GestureStep(values, tolerance, address, allow_blocked)
+    return step
+
+
+def define_gesture(name, *steps, tolerance=DEFAULT_TOLERANCE, allow_blocked=False):
+    """
+    定义一个命名手势；allow_blocked 为True时各步手指都可以被接触物提前停下，见 GestureStep。
+    """
+    if name in GESTURES:
+        raise ValueError(f'手势 {name} 重复定义')
+    gesture = GESTURES[name] = Gesture(name, [make_step(values, tolerance, allow_blocked=allow_blocked) for values in steps])
+    return gesture
+
+
+def get_gesture(name):
+    return GESTURES[name]
+
+
+def get_step(name, index=0):
+    """
+    返回手势的第 index 步，单步手势可直接作为目标位置使用。
+    """
+    return GESTURES[name].steps[index]
+
+
+def gesture_table(names):
+    """
+    按 {显示名称: 手势名} 的顺序返回 {显示名称: Gesture}。
+    """
+    return {key: GESTURES[name] for key, name in names.items()}
+
+
+def write_registers(client, address, value, node_id):
+    """
+    写寄存器：value 为 GestureStep 时写入其共享的目标位置列表，否则原样调用 client.write_registers。
+
+    都经过 pymodbus 的事务层，超时重试、清空接收缓冲区和异常应答的处理与其他读写一致。FC16 报文每次由 pymodbus 编码，
+    不再预先生成：绕过事务层直接收发会失去上述处理，而编码一帧 6 个寄存器的开销远小于 RTU 传输时间。
+    """
+    if isinstance(value, GestureStep):
+        value = value.values
+    return client.write_registers(address, value, node_id)
+
+
+# 通用手势
+define_gesture('open', [0, 0, 0, 0, 0, 0]) # 自然展开
+define_gesture('four_finger_bend', [0, 65535, 65535, 65535, 65535, 0]) # 四指弯曲
+define_gesture('thumb_bend', [65535, 0, 0, 0, 0, 0]) # 大拇指弯曲
+define_gesture('thumb_rotation', [0, 0, 0, 0, 0, 65535]) # 大拇指旋转到对掌位
+
+# 手势压力测试的 28 个手势，每个动作分两步完成；握拳、捏、三指捏、抓握等手指会相互接触，标记 allow_blocked
+define_gesture('fist', [0, 62258, 62258, 62258, 62258, 0], [36044, 62258, 62258, 62258, 62258, 0], allow_blocked=True)
+define_gesture('mouse', [32768, 0, 0, 0, 45875, 0], [32768, 7864, 0, 7864, 45875, 0])
+define_gesture('key', [0, 36044, 62258, 62258, 62258, 0], [42598, 36044, 62258, 62258, 62258, 0], allow_blocked=True)
+define_gesture('point', [0, 0, 62258, 62258, 62258, 0], [52428, 0, 62258, 62258, 62258, 0])
+define_gesture('column', [52428, 0, 64880, 64880, 64880, 0], [52428, 36044, 64880, 64880, 64880, 0])
+define_gesture('palm', [26214, 16384, 16384, 16384, 19661, 0], [26214, 16384, 16384, 16384, 16384, 0])
+define_gesture('salute', [29491, 0, 0, 0, 0, 0], [29491, 0, 0, 0, 0, 0])
+define_gesture('chopstick', [16384, 19661, 62258, 62258, 62258, 0], [16384, 45875, 62258, 62258, 62258, 0])
+define_gesture('power', [0, 62258, 62258, 62258, 62258, 62258], [49151, 62258, 62258, 62258, 62258, 62258], allow_blocked=True)
+define_gesture('grasp', [27525, 29491, 32768, 27525, 24903, 62258], [27525, 29491, 32768, 27525, 24903, 62258], allow_blocked=True)
+define_gesture('lift', [0, 22937, 22937, 22937, 22937, 62258], [39321, 62258, 62258, 62258, 62258, 62258])
+define_gesture('plate', [0, 9830, 11141, 9830, 11141, 62258], [62258, 9830, 11141, 9830, 11141, 62258], allow_blocked=True)
+define_gesture('buckle', [36044, 0, 55705, 55705, 55705, 0], [36044, 29491, 55705, 55705, 55705, 62258])
+define_gesture('pinch_ic', [29491, 0, 62258, 62258, 62258, 0], [29491, 32768, 62258, 62258, 62258, 62258], allow_blocked=True)
+define_gesture('pinch_io', [29491, 0, 0, 0, 0, 62258], [29491, 32768, 0, 0, 0, 62258], allow_blocked=True)
+define_gesture('pinch_tc', [0, 29491, 62258, 62258, 62258, 62258], [32768, 29491, 62258, 62258, 62258, 62258], allow_blocked=True)
+define_gesture('pinch_to', [0, 29491, 0, 0, 0, 62258], [32768, 29491, 0, 0, 0, 62258], allow_blocked=True)
+define_gesture('pinch_itc', [0, 0, 62258, 62258, 62258, 0], [29491, 29491, 62258, 62258, 62258, 62258], allow_blocked=True)
+define_gesture('tripod_ic', [30801, 0, 0, 62258, 62258, 62258], [30801, 30146, 32768, 62258, 62258, 62258], allow_blocked=True)
+define_gesture('tripod_io', [30801, 0, 0, 0, 0, 62258], [30801, 30146, 32768, 0, 0, 62258], allow_blocked=True)
+define_gesture('tripod_tc', [0, 30146, 32768, 62258, 62258, 62258], [30801, 30146, 32768, 62258, 62258, 62258], allow_blocked=True)
+define_gesture('tripod_to', [0, 30146, 32768, 0, 0, 62258], [30801, 30146, 32768, 0, 0, 62258], allow_blocked=True)
+define_gesture('tripod_itc', [0, 0, 0, 62258, 62258, 62258], [30801, 30146, 32768, 62258, 62258, 62258], allow_blocked=True)
+define_gesture('gun', [0, 0, 62258, 62258, 62258, 0], [0, 0, 62258, 62258, 62258, 0])
+define_gesture('love', [0, 0, 0, 62258, 62258, 0], [0, 0, 0, 62258, 62258, 0])
+define_gesture('swear', [0, 62258, 0, 0, 62258, 0], [0, 62258, 0, 0, 62258, 0])
+define_gesture('victory', [62258, 0, 0, 62258, 62258, 0], [62258, 0, 0, 62258, 62258, 0])
+define_gesture('six', [0, 62258, 62258, 62258, 0, 0], [0, 62258, 62258, 62258, 0, 0])
+
+STRESS_GESTURE_NAMES = ('fist', 'mouse', 'key', 'point', 'column', 'palm', 'salute', 'chopstick', 'power', 'grasp',
+                        'lift', 'plate', 'buckle', 'pinch_ic', 'pinch_io', 'pinch_tc', 'pinch_to', 'pinch_itc',
+                        'tripod_ic', 'tripod_io', 'tripod_tc', 'tripod_to', 'tripod_itc', 'gun', 'love', 'swear',
+                        'victory', 'six')
+
+# aging_test：大拇指在对掌位时展开和握拳，握拳时握着负载
+define_gesture('aging_open', [0, 0, 0, 0, 0, 65535])
+define_gesture('aging_grasp', [16294, 65535, 65535, 65535, 65535, 65535], allow_blocked=True)
+
+# aging_test_v2：抓握和展开各分两步完成，抓握时握着负载
+define_gesture('aging_v2_grasp', [0, 31499, 36569, 32949, 28966, 62258], [26069, 31499, 36569, 32949, 28966, 62258], allow_blocked=True)
+define_gesture('aging_v2_open', [26069, 31499, 36569, 32949, 28966, 62258], [0, 0, 0, 0, 0, 62258])
+
+# aging_test_v2_no_load：空载老化，大拇指旋转保持在 728
+define_gesture('no_load_open', [0, 0, 0, 0, 0, 728])
+define_gesture('no_load_fist', [0, 0, 0, 0, 0, 728], [0, 65535, 65535, 65535, 65535, 728])
+define_gesture('no_load_thumb_bend', [0, 0, 0, 0, 0, 728], [65535, 0, 0, 0, 0, 728])
+define_gesture('no_load_thumb_rotation', [0, 0, 0, 0, 0, 728], [0, 0, 0, 0, 0, 65535])
+
+# 各测试脚本使用的手势表，{显示名称: 手势}，所有实例共享
+STRESS_GESTURES = {name: GESTURES[name] for name in STRESS_GESTURE_NAMES}
+NO_LOAD_GESTURES = gesture_table({'fist': 'no_load_fist', 'second': 'no_load_thumb_bend', 'third': 'no_load_thumb_rotation'})
+# 电机电流测试每个手势只有一步，表中直接是 GestureStep
+MOTOR_CURRENT_STEPS = {key: get_step(name) for key, name in
+                       (('自然展开', 'open'), ('四指弯曲', 'four_finger_bend'), ('大拇值弯曲', 'thumb_bend'), ('大拇指旋转到对掌位', 'thumb_rotation'))}
+
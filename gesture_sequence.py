@@ -0,0 +1,157 @@
+## 手势序列优化：按端口记录最近一次下发的目标位置，目标不变的步骤不再重复写入、等待和校验，并统计每轮节省的总线事务和时间
+import logging
+import math
+import sys
+import threading
+
+from finger_motion import MIN_MOTION_TIME, POLL_INTERVAL
+from modbus_metrics import FC_READ_HOLDING_REGISTERS, FC_WRITE_MULTIPLE_REGISTERS, metrics
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+
+class PortSequenceState:
+    """
+    单个端口的序列状态。
+
+    last_step/last_result：最近一次成功执行的步骤及其结果，执行失败或会话重建后清空。
+    last_verified：last_result 是否是校验得到的 StepVerdict；只有校验过的结果才能代替要求校验的调用。
+    cycle_*/total_*：本轮和累计的执行、跳过步数及节省的事务数、秒数。
+    """
+    def __init__(self, port):
+        self.port = port
+        self.last_step = None
+        self.last_result = None
+        self.last_verified = False
+        self.reset_cycle()
+        self.total_executed = 0
+        self.total_skipped = 0
+        self.total_saved_transactions = 0
+        self.total_saved_seconds = 0.0
+
+    def reset_cycle(self):
+        self.cycle_executed = 0
+        self.cycle_skipped = 0
+        self.cycle_saved_transactions = 0
+        self.cycle_saved_seconds = 0.0
+
+    def is_redundant(self, step):
+        return self.last_step is not None and self.last_step.address == step.address and self.last_step.values == step.values
+
+
+class SequenceOptimizer:
+    """
+    跳过不会改变目标位置的手势步骤。
+
+    上一步已成功执行（动作完成，要求校验时校验通过）且本步目标位置完全相同时，手不会再动，写入、等待动作完成和
+    校验都没有意义，直接返回上一步的结果。要求校验的调用只用校验过的结果代替，未校验的写入结果（bool）不会冒充
+    StepVerdict。跳过的节省量按 modbus_metrics 中该端口的平均读写延迟估算，不为测量而实际执行；连接重建后调用
+    invalidate()，不对断线期间设备的状态做任何假设。
+    """
+    def __init__(self):
+        self._ports = {}
+        self._lock = threading.Lock()
+
+    def state(self, port):
+        with self._lock:
+            state = self._ports.get(port)
+            if state is None:
+                state = self._ports[port] = PortSequenceState(port)
+            return state
+
+    def invalidate(self, port):
+        state = self.state(port)
+        state.last_step = None
+        state.last_result = None
+        state.last_verified = False
+
+    def estimate_cost(self, port, verify=False):
+        """
+        估算一个目标不变的步骤照常执行的开销 (总线事务数, 秒)。
+
+        手已经停在目标位置，执行只有一次 FC16 写入，加上等待动作完成时至少 MIN_MOTION_TIME 的状态轮询，校验时再加
+        一次块读；读写耗时取该端口 modbus_metrics 直方图的平均值，还没有记录的按 0 计。
+        """
+        port_metrics = metrics.port(port)
+        write = port_metrics.mean_latency(FC_WRITE_MULTIPLE_REGISTERS) or 0.0
+        read = port_metrics.mean_latency(FC_READ_HOLDING_REGISTERS) or 0.0
+        polls = max(1, math.ceil((MIN_MOTION_TIME + POLL_INTERVAL) / (read + POLL_INTERVAL)))
+        transactions = 1 + polls
+        seconds = write + polls * read + (polls - 1) * POLL_INTERVAL
+        if verify:
+            transactions += 1
+            seconds += read
+        return transactions, seconds
+
+    def run_step(self, port, step, execute, verify=False):
+        """
+        执行一步手势，目标位置与上一步相同时跳过。
+
+        :param step: gesture_library.GestureStep。
+        :param execute: 实际执行该步的函数 execute(step)，返回可判断真假的结果（bool 或 StepVerdict）。
+        :param verify: execute 是否会校验并返回 StepVerdict；为True时只在上一步也校验过时跳过。
+        :return: execute 的结果，跳过时为上一步的结果。
+        """
+        state = self.state(port)
+        if state.is_redundant(step) and (state.last_verified or not verify):
+            transactions, seconds = self.estimate_cost(port, verify)
+            state.cycle_skipped += 1
+            state.cycle_saved_transactions += transactions
+            state.cycle_saved_seconds += seconds
+            return state.last_result
+
+        # 执行过程中出现异常时设备状态未知，先清空，成功后再记录
+        self.invalidate(port)
+        result = execute(step)
+        state.cycle_executed += 1
+        if result:
+            state.last_step = step
+            state.last_result = result
+            state.last_verified = verify
+        return result
+
+    def begin_cycle(self, port):
+        self.state(port).reset_cycle()
+
+    def end_cycle(self, port):
+        """
+        结束一轮，累加到总计并返回本轮的节省统计。
+        """
+        state = self.state(port)
+        state.total_executed += state.cycle_executed
+        state.total_skipped += state.cycle_skipped
+        state.total_saved_transactions += state.cycle_saved_transactions
+        state.total_saved_seconds += state.cycle_saved_seconds
+        report = {
+            'executed_steps': state.cycle_executed,
+            'skipped_steps': state.cycle_skipped,
+            'saved_transactions': state.cycle_saved_transactions,
+            'saved_seconds': round(state.cycle_saved_seconds, 3),
+        }
+        if state.cycle_skipped:
+            logger.info(f'[port = {port}]本轮跳过 {state.cycle_skipped} 个重复步骤，节省 {state.cycle_saved_transactions} 次总线事务、约 {state.cycle_saved_seconds:.2f} 秒\n')
+        return report
+
+    def summary(self):
+        with self._lock:
+            states = list(self._ports.values())
+        return {
+            state.port: {
+                'executed_steps': state.total_executed,
+                'skipped_steps': state.total_skipped,
+                'saved_transactions': state.total_saved_transactions,
+                'saved_seconds': round(state.total_saved_seconds, 3),
+            }
+            for state in states
+        }
+
+    def reset(self):
+        with self._lock:
+            self._ports.clear()
+
+
+sequence_optimizer = SequenceOptimizer()
@@ -2,11 +2,18 @@ import datetime
 import logging
 import sys
 import time
-import concurrent.futures
 from pymodbus.exceptions import ConnectionException, ModbusIOException
 from pymodbus import FramerType
 from pymodbus.client import ModbusSerialClient
 
+from modbus_pacing import FramePacer
+from finger_motion import actuate_and_verify, wait_motion_done
+from port_workers import ResultCollector, run_port_workers
+from result_sink import ResultSink
+from modbus_metrics import FC_READ_HOLDING_REGISTERS, FC_WRITE_MULTIPLE_REGISTERS, metrics, register_count
+from gesture_library import STRESS_GESTURES, get_step, write_registers
+from gesture_sequence import sequence_optimizer
+
 # 设置日志级别为INFO，获取日志记录器实例
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -20,40 +27,11 @@ class GestureStressTest:
         self.FRAMER_TYPE = FramerType.RTU
         self.client = None
         self.BAUDRATE = 115200
-        self.FINGER_POS_TARGET_MAX_LOSS = 32
+        self.pacer = FramePacer(self.BAUDRATE, 'rtu') # 帧间节奏，手指是否到位由 wait_motion_done 判断
+        self.motion_timeout = 5 # 等待动作完成的最长时间（秒）
         self.ROH_FINGER_POS_TARGET0 = 1135
         self.MAX_CYCLE_NUM = 1# 测试循环的最大次数，初始为1
-        # 定义28个手势动作，每个动作分两步完成
-        self.initial_gesture = [0, 0, 0, 0, 0, 0]
-        self.fist_gesture = [[0, 62258, 62258, 62258, 62258, 0], [36044, 62258, 62258, 62258, 62258, 0]]
-        self.mouse_gesture = [[32768, 0, 0, 0, 45875, 0], [32768, 7864, 0, 7864, 45875, 0]]
-        self.key_gesture = [[0, 36044, 62258, 62258, 62258, 0], [42598, 36044, 62258, 62258, 62258, 0]]
-        self.point_gesture = [[0, 0, 62258, 62258, 62258, 0], [52428, 0, 62258, 62258, 62258, 0]]
-        self.column_gesture = [[52428, 0, 64880, 64880, 64880, 0], [52428, 36044, 64880, 64880, 64880, 0]]
-        self.palm_gesture = [[26214, 16384, 16384, 16384, 19661, 0], [26214, 16384, 16384, 16384, 16384, 0]]
-        self.salute_gesture = [[29491, 0, 0, 0, 0, 0], [29491, 0, 0, 0, 0, 0]]
-        self.chopstick_gesture = [[16384, 19661, 62258, 62258, 62258, 0], [16384, 45875, 62258, 62258, 62258, 0]]
-        self.power_gesture = [[0, 62258, 62258, 62258, 62258, 62258], [49151, 62258, 62258, 62258, 62258, 62258]]
-        self.grasp_gesture = [[27525, 29491, 32768, 27525, 24903, 62258], [27525, 29491, 32768, 27525, 24903, 62258]]
-        self.lift_gesture = [[0, 22937, 22937, 22937, 22937, 62258], [39321, 62258, 62258, 62258, 62258, 62258]]
-        self.plate_gesture = [[0, 9830, 11141, 9830, 11141, 62258], [62258, 9830, 11141, 9830, 11141, 62258]]
-        self.buckle_gesture = [[36044, 0, 55705, 55705, 55705, 0], [36044, 29491, 55705, 55705, 55705, 62258]]
-        self.pinch_ic_gesture = [[29491, 0, 62258, 62258, 62258, 0], [29491, 32768, 62258, 62258, 62258, 62258]]
-        self.pinch_io_gesture = [[29491, 0, 0, 0, 0, 62258], [29491, 32768, 0, 0, 0, 62258]]
-        self.pinch_tc_gesture = [[0, 29491, 62258, 62258, 62258, 62258], [32768, 29491, 62258, 62258, 62258, 62258]]
-        self.pinch_to_gesture = [[0, 29491, 0, 0, 0, 62258], [32768, 29491, 0, 0, 0, 62258]]
-        self.pinch_itc_gesture = [[0, 0, 62258, 62258, 62258, 0], [29491, 29491, 62258, 62258, 62258, 62258]]
-        self.tripod_ic_gesture = [[30801, 0, 0, 62258, 62258, 62258], [30801, 30146, 32768, 62258, 62258, 62258]]
-        self.tripod_io_gesture = [[30801, 0, 0, 0, 0, 62258], [30801, 30146, 32768, 0, 0, 62258]]
-        self.tripod_tc_gesture = [[0, 30146, 32768, 62258, 62258, 62258], [30801, 30146, 32768, 62258, 62258, 62258]]
-        self.tripod_to_gesture = [[0, 30146, 32768, 0, 0, 62258], [30801, 30146, 32768, 0, 0, 62258]]
-        self.tripod_itc_gesture = [[0, 0, 0, 62258, 62258, 62258], [30801, 30146, 32768, 62258, 62258, 62258]]
-        self.gun_gesture = [[0, 0, 62258, 62258, 62258, 0], [0, 0, 62258, 62258, 62258, 0]]
-        self.love_gesture = [[0, 0, 0, 62258, 62258, 0], [0, 0, 0, 62258, 62258, 0]]
-        self.swear_gesture = [[0, 62258, 0, 0, 62258, 0], [0, 62258, 0, 0, 62258, 0]]
-        self.victory_gesture = [[62258, 0, 0, 62258, 62258, 0], [62258, 0, 0, 62258, 62258, 0]]
-        self.six_gesture = [[0, 62258, 62258, 62258, 0, 0], [0, 62258, 62258, 62258, 0, 0]]
-
+        self.initial_gesture = get_step('open')
         self.gestures = self.create_gesture_dict()
         
     def set_port(self,port):
@@ -66,38 +44,9 @@ class GestureStressTest:
         return self.MAX_CYCLE_NUM
     
     def create_gesture_dict(self):
-        gesture_dict = {
-            'fist': self.fist_gesture,
-            'mouse': self.mouse_gesture,
-            'key': self.key_gesture,
-            'point': self.point_gesture,
-            'column': self.column_gesture,
-            'palm': self.palm_gesture,
-            'salute': self.salute_gesture,
-            'chopstick': self.chopstick_gesture,
-            'power': self.power_gesture,
-            'grasp': self.grasp_gesture,
-            'lift': self.lift_gesture,
-            'plate': self.plate_gesture,
-            'buckle': self.buckle_gesture,
-            'pinch_ic': self.pinch_ic_gesture,
-            'pinch_io': self.pinch_io_gesture,
-            'pinch_tc': self.pinch_tc_gesture,
-            'pinch_to': self.pinch_to_gesture,
-            'pinch_itc': self.pinch_itc_gesture,
-            'tripod_ic': self.tripod_ic_gesture,
-            'tripod_io': self.tripod_io_gesture,
-            'tripod_tc': self.tripod_tc_gesture,
-            'tripod_to': self.tripod_to_gesture,
-            'tripod_itc': self.tripod_itc_gesture,
-            'gun': self.gun_gesture,
-            'love': self.love_gesture,
-            'swear': self.swear_gesture,
-            'victory': self.victory_gesture,
-            'six': self.six_gesture
-        }
-        return gesture_dict
-    
+        # 28 个手势定义在 gesture_library 中，每个动作分两步完成，所有实例共享同一张表
+        return STRESS_GESTURES
+
     def get_initial_gesture(self):
         return self.initial_gesture
     
@@ -120,22 +69,29 @@ class GestureStressTest:
         response = None
         while retry_count < max_retries:
             try:
+                self.pacer.before_frame()
+                start = time.perf_counter()
                 response = self.client.read_holding_registers(address=address, count=count, slave=self.node_id)
-                time.sleep(0.2)
+                metrics.observe(self.port, FC_READ_HOLDING_REGISTERS, time.perf_counter() - start, count, not response.isError())
+                self.pacer.after_read()
                 if not response.isError():
                     break
                 else:
                     error_type = self.get_exception(response)
                     if "connection timeout" in error_type.lower():
+                        metrics.increment(self.port, 'reconnects')
                         self.client.connect()
                     elif "read timeout" in error_type.lower():
                         retry_count += 1
-                        time.sleep(0.5)
+                        metrics.increment(self.port, 'retries')
+                        self.pacer.before_retry()
                     else:
                         logger.error(f'[port = {self.port}]读寄存器失败: {error_type}\n')
             except ModbusIOException as e:
+                metrics.increment(self.port, 'timeouts')
                 logger.error(f'[port = {self.port}]Modbus输入输出异常: {e}')
                 if "connection error" in str(e).lower():
+                    metrics.increment(self.port, 'reconnects')
                     self.client.connect()
             except AssertionError as e:
                 logger.error(f'[port = {self.port}]断言错误: {e}')
@@ -158,22 +114,29 @@ class GestureStressTest:
         retry_count = 0
         while retry_count < max_retries:
             try:
-                response = self.client.write_registers(address, value, self.node_id)
-                time.sleep(2)
+                self.pacer.before_frame()
+                start = time.perf_counter()
+                response = write_registers(self.client, address, value, self.node_id)
+                metrics.observe(self.port, FC_WRITE_MULTIPLE_REGISTERS, time.perf_counter() - start, register_count(value), not response.isError())
+                self.pacer.after_write()
                 if not response.isError():
                     return True
                 else:
                     error_type = self.get_exception(response)
                     if "connection timeout" in error_type.lower():
+                        metrics.increment(self.port, 'reconnects')
                         self.client.connect()
                     elif "write timeout" in error_type.lower():
                         retry_count += 1
+                        metrics.increment(self.port, 'retries')
                     else:
                         logger.error(f'[port = {self.port}]写寄存器失败: {error_type}\n')
                         return False
             except ModbusIOException as e:
+                metrics.increment(self.port, 'timeouts')
                 logger.error(f'[port = {self.port}]Modbus输入输出异常: {e}')
                 if "connection error" in str(e).lower():
+                    metrics.increment(self.port, 'reconnects')
                     self.client.connect()
                 else:
                     return False
@@ -197,6 +160,7 @@ class GestureStressTest:
         connect_status = False
         try:
             self.client = ModbusSerialClient(port=self.port, framer=self.FRAMER_TYPE, baudrate=self.BAUDRATE)
+            sequence_optimizer.invalidate(self.port) # 新连接不沿用之前记录的目标位置
             connect_status = self.client.connect()
             logger.info(f"[port = {self.port}]Successfully connected to Modbus device.")
         except ConnectionException as e:
@@ -219,42 +183,45 @@ class GestureStressTest:
             except Exception as e:
                 logger.error(f"[port = {self.port}]Error during teardown: {e}")
 
-    def do_gesture(self,key,gesture):
+    def do_gesture(self,key,gesture,verify=False):
         """
         执行特定的手势动作。
 
         实际是向特定寄存器（ROH_FINGER_POS_TARGET0）写入手势数据。
+        目标位置与上一步相同时由 sequence_optimizer 跳过，直接返回上一步的结果。
 
         :param gesture: 要执行的手势数据。
+        :param verify: 为True时动作完成后一次块读实际位置、电流和状态，返回逐个手指判定的 StepVerdict。
         :return: 调用write_to_regesister方法的结果，即写入是否成功的布尔值。
         """
         # print(f"[port = {self.port}]执行    ---->  {key}")
-        return self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=gesture)
-
-    def judge_if_hand_broken(self, address, gesture):
+        def execute(step):
+            if verify:
+                verdict = actuate_and_verify(self.write_to_regesister, self.read_from_register, step, wait_motion=self.wait_motion_done)
+                if not verdict:
+                    logger.error(f'[port = {self.port}]{key} 手势未到位: {verdict}\n')
+                return verdict
+            return self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=step) and self.wait_motion_done()
+        return sequence_optimizer.run_step(self.port, gesture, execute, verify=verify)
+
+    def wait_motion_done(self):
         """
-        判断设备是否损坏。
-
-        通过读取指定地址的寄存器数据，并与给定的手势数据对比，如果有任何一个寄存器值与手势值的差值超过FINGER_POS_TARGET_MAX_LOSS则认为设备损坏。
+        等待本次动作完成（所有手指停止）。
 
-        :param address: 要读取数据的寄存器地址。
-        :param gesture: 用于对比的手势数据。
-        :return: 一个布尔值，表示设备是否损坏。
+        :return: 一个布尔值，表示动作是否正常完成；出现堵转或超时返回False。
         """
-        is_broken = False
-        response = self.read_from_register(address=address, count=6)
-        if response is not None and not response.isError():
-            for i in range(len(response.registers)):
-                if abs(response.registers[i] - gesture[i]) > self.FINGER_POS_TARGET_MAX_LOSS:
-                    is_broken = True
-        return is_broken
+        result = wait_motion_done(self.read_from_register, timeout=self.motion_timeout)
+        if not result.done:
+            logger.error(f'[port = {self.port}]手指动作未完成: {result}\n')
+        return result.done
+
     
 def check_ports(ports_list):
     valid_ports = []
     status = True
     if ports_list is not None:
         for port in ports_list:
-            if isinstance(port, str) and port.startswith('COM'):
+            if isinstance(port, str) and port.startswith(('COM', '/dev/')):
                 valid_ports.append(port)
             else:
                 status = False
@@ -282,35 +249,27 @@ def main(ports=None, max_cycle_num=1):
         result = '不通过'
         return overall_result,result
     
+    metrics.reset()
+    sequence_optimizer.reset()
     start_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------开始老化测试<开始时间：{start_time}>----------------------------------------------\n')
     logger.info('测试目的：循环做抓握手势，进行压测')
     logger.info('标准：各个手头无异常，手指不脱线\n')
+    sink = ResultSink(name='gesture_stress_test')
     try:
         start_time1 = time.time()
         end_time1 = start_time1 + max_cycle_num * 3600
         # end_time1 = start_time1 + 60
-        i = 0
-        while time.time() < end_time1:
-            logger.info(f"##########################第 {i + 1} 轮测试开始######################\n")
-            result = '通过'
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = [executor.submit(run_tests_for_port, port, connected_status) for port in ports]
-                for future in concurrent.futures.as_completed(futures):
-                    port_result, _ = future.result()
-                    overall_result.append(port_result)
-                    for gesture_result in port_result["gestures"]:
-                        if gesture_result["result"]!= "通过":
-                            result = '不通过'
-                            final_result = '不通过'
-                            break
-            logger.info(f"#################第 {i + 1} 轮测试结束，测试结果：{result}#############\n")
-            i += 1
+        # 每个端口独立循环到截止时间，结果实时汇总
+        collector = run_port_workers(ports, lambda port: run_tests_for_port(port, connected_status), end_time1, ResultCollector(sink))
+        final_result = collector.final_result
 
     except Exception as e:
         logging.error(f"Error: {e}")
     finally:
-        pass
+        sink.close()
+    overall_result = sink.summary_results()
+    metrics.dump()
     end_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------老化测试结束<结束时间：{end_time}>----------------------------------------------\n')
     # print(f'最终测试结果：{overall_result}')
@@ -338,19 +297,22 @@ def run_tests_for_port(port, connected_status):
     gestureStressTest = GestureStressTest()
     gestureStressTest.set_port(port)
     if not connected_status:
-        gestureStressTest.connect_device()
-        connected_status = True
+        connected_status = gestureStressTest.connect_device()
     port_result = {
         "port": port,
         "gestures": []
     }
+    if not connected_status:
+        gestureStressTest.disConnect_device()
+        return port_result, connected_status
+    sequence_optimizer.begin_cycle(port)
 
     try:
         for key, gesture in gestureStressTest.gestures.items():
                 logger.info(f"[port = {port}]执行    ---->  {key}\n")
                 timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 # 先恢复默认手势
-                if gestureStressTest.do_gesture(key=key, gesture=gestureStressTest.get_initial_gesture()) and not gestureStressTest.judge_if_hand_broken(address=gestureStressTest.get_op_address(), gesture=gestureStressTest.get_initial_gesture()):
+                if gestureStressTest.do_gesture(key=key, gesture=gestureStressTest.get_initial_gesture(), verify=True):
                     gesture_result = {
                         "timestamp":timestamp,
                         "content": key,
@@ -365,7 +327,7 @@ def run_tests_for_port(port, connected_status):
 
                 # 做新的手势
                 for step in gesture:
-                    if gestureStressTest.do_gesture(key=key, gesture=step) and not gestureStressTest.judge_if_hand_broken(address=gestureStressTest.get_op_address(), gesture=step):
+                    if gestureStressTest.do_gesture(key=key, gesture=step, verify=True):
                         gesture_result = {
                             "timestamp":timestamp,
                             "content": key,
@@ -390,6 +352,7 @@ def run_tests_for_port(port, connected_status):
             port_result["gestures"].append(gesture_result)
             # logger.info(f'[port = {port}]测试结果 {gesture_result["result"]}')
 
+    port_result["sequence"] = sequence_optimizer.end_cycle(port)
     gestureStressTest.disConnect_device()
     return port_result, connected_status
 
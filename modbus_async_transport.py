@@ -0,0 +1,253 @@
+## 基于 asyncio 的 Modbus-RTU 传输层，一个事件循环驱动所有端口
+import asyncio
+import logging
+import sys
+import threading
+import time
+
+from pymodbus import FramerType
+from pymodbus.client import AsyncModbusSerialClient
+from pymodbus.exceptions import ConnectionException, ModbusException, ModbusIOException
+
+from modbus_pacing import FramePacer
+from modbus_metrics import FC_READ_HOLDING_REGISTERS, FC_WRITE_MULTIPLE_REGISTERS, metrics
+from roh_registers import ROH_PROTOCOL_VERSION, ROH_FINGER_ANGLE9, RegisterSnapshot, plan_block_reads
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+
+class AsyncPortTransport:
+    """
+    单个端口的异步读写通道。
+
+    RTU 是半双工总线，同一端口上的请求通过 asyncio.Lock 串行发送；不同端口之间在同一个事件循环里并发。
+    与同步脚本的读写路径一致：帧间由 FramePacer 控制静默间隔，超时后重试，连接断开时重新连接，最多尝试 max_retries 次。
+    """
+    FRAMER_TYPE = FramerType.RTU
+    BAUDRATE = 115200
+
+    def __init__(self, port, node_id=2, baudrate=BAUDRATE, timeout=1, pacing_profile='rtu', max_retries=3):
+        self.port = port
+        self.node_id = node_id
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.client = None
+        self.pacer = FramePacer(baudrate, pacing_profile)
+        self._lock = asyncio.Lock()
+
+    async def connect(self):
+        """
+        连接到Modbus设备。
+
+        :return: 一个布尔值，表示是否成功连接到设备。
+        """
+        connect_status = False
+        try:
+            self.client = AsyncModbusSerialClient(port=self.port, framer=self.FRAMER_TYPE, baudrate=self.baudrate, timeout=self.timeout)
+            connect_status = await self.client.connect()
+            if connect_status:
+                logger.info(f"[port = {self.port}]Successfully connected to Modbus device.")
+            else:
+                logger.error(f"[port = {self.port}]Could not connect to Modbus device.")
+        except ConnectionException as e:
+            logger.error(f"[port = {self.port}]Error during setup: {e}")
+        except Exception as e:
+            logger.error(f"[port = {self.port}]Error during setup: {e}")
+        return connect_status
+
+    def close(self):
+        if self.client:
+            try:
+                self.client.close()
+                logger.info(f"[port = {self.port}]Connection to Modbus device closed.")
+            except Exception as e:
+                logger.error(f"[port = {self.port}]Error during teardown: {e}")
+            finally:
+                self.client = None
+
+    async def reconnect(self):
+        metrics.increment(self.port, 'reconnects')
+        self.close()
+        return await self.connect()
+
+    async def request(self, function_code, send, count):
+        """
+        在端口锁内发送一次请求，处理帧间节奏、超时重试和断线重连。
+
+        :param function_code: FC_READ_HOLDING_REGISTERS 或 FC_WRITE_MULTIPLE_REGISTERS，用于统计。
+        :param send: 无参数的协程函数，发送请求并返回pymodbus的响应对象。
+        :param count: 寄存器数量，用于统计总线字节数。
+        :return: 成功时返回响应对象；设备返回异常应答或重试耗尽时返回None。
+        """
+        is_read = function_code == FC_READ_HOLDING_REGISTERS
+        async with self._lock:
+            for attempt in range(self.max_retries):
+                if attempt > 0:
+                    metrics.increment(self.port, 'retries')
+                    await self.pacer.async_before_retry()
+                try:
+                    if self.client is None or not self.client.connected:
+                        if not await self.reconnect():
+                            continue
+                    await self.pacer.async_before_frame()
+                    start = time.perf_counter()
+                    response = await send()
+                    metrics.observe(self.port, function_code, time.perf_counter() - start, count, not response.isError())
+                    if is_read:
+                        await self.pacer.async_after_read()
+                    else:
+                        await self.pacer.async_after_write()
+                    if not response.isError():
+                        return response
+                    if getattr(response, 'exception_code', None):
+                        # 设备返回的异常应答，重试也不会成功
+                        logger.error(f'[port = {self.port}]{"读" if is_read else "写"}寄存器失败: {response}\n')
+                        return None
+                    # pymodbus 在没有收到应答时返回不带异常码的错误响应
+                    metrics.increment(self.port, 'timeouts')
+                    logger.error(f'[port = {self.port}]{"读" if is_read else "写"}寄存器超时\n')
+                except ConnectionException as e:
+                    logger.error(f'[port = {self.port}]连接异常: {e}')
+                    self.close()
+                except ModbusIOException as e:
+                    metrics.increment(self.port, 'timeouts')
+                    logger.error(f'[port = {self.port}]Modbus输入输出异常: {e}')
+                except ModbusException as e:
+                    logger.error(f'[port = {self.port}]Modbus异常: {e}')
+                    return None
+                except Exception as e:
+                    logger.error(f'[port = {self.port}]其他异常: {e}')
+                    return None
+        logger.error(f'[port = {self.port}]重试 {self.max_retries} 次后仍然失败\n')
+        return None
+
+    async def read(self, address, count=1, node_id=None):
+        """
+        读取保持寄存器。
+
+        :param address: 要读取的寄存器地址。
+        :param count: 要读取的寄存器数量。
+        :param node_id: 设备ID，默认使用创建时指定的ID。
+        :return: 成功时返回pymodbus的响应对象，否则返回None。
+        """
+        if node_id is None:
+            node_id = self.node_id
+        return await self.request(FC_READ_HOLDING_REGISTERS,
+                                  lambda: self.client.read_holding_registers(address=address, count=count, slave=node_id), count)
+
+    async def write(self, address, values, node_id=None):
+        """
+        写保持寄存器（FC16）。
+
+        :param address: 要写入的寄存器地址。
+        :param values: 要写入的值、值列表或 gesture_library.GestureStep。
+        :param node_id: 设备ID，默认使用创建时指定的ID。
+        :return: 如果写入成功则返回True，否则返回False。
+        """
+        if node_id is None:
+            node_id = self.node_id
+        values = [values] if isinstance(values, int) else list(values)
+        response = await self.request(FC_WRITE_MULTIPLE_REGISTERS,
+                                      lambda: self.client.write_registers(address, values, slave=node_id), len(values))
+        return response is not None
+
+    async def snapshot(self, start=ROH_PROTOCOL_VERSION, end=ROH_FINGER_ANGLE9, node_id=None):
+        """
+        用最少的 FC03 请求读取 [start, end] 范围内的所有寄存器。
+
+        :return: RegisterSnapshot，任意一块读取失败则返回None。
+        """
+        values = []
+        for address, count in plan_block_reads(start, end):
+            response = await self.read(address, count, node_id)
+            if response is None:
+                return None
+            values.extend(response.registers)
+        return RegisterSnapshot(start, values)
+
+
+class AsyncTransportHub:
+    """
+    在后台线程中运行唯一的事件循环，统一驱动所有端口的 AsyncPortTransport。
+
+    同步脚本通过 run/submit 把协程交给该循环执行，不需要为每个端口开一个线程。transports 只在事件循环线程中读写，
+    同一端口同时被多处打开时只连接一次。
+    """
+    def __init__(self):
+        self.transports = {}
+        self._opening = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='modbus-async-transport', daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        """
+        把协程提交到事件循环，返回 concurrent.futures.Future。
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro, timeout=None):
+        """
+        在事件循环中执行协程并阻塞等待结果。
+        """
+        return self.submit(coro).result(timeout)
+
+    def open(self, port, node_id=2, baudrate=AsyncPortTransport.BAUDRATE, timeout=1):
+        """
+        获取（必要时创建并连接）指定端口的传输通道。
+
+        :return: 连接成功返回 AsyncPortTransport，否则返回None。
+        """
+        return self.run(self.open_async(port, node_id, baudrate, timeout))
+
+    async def open_async(self, port, node_id=2, baudrate=AsyncPortTransport.BAUDRATE, timeout=1):
+        transport = self.transports.get(port)
+        if transport is not None:
+            return transport
+        task = self._opening.get(port)
+        if task is None:
+            task = self._opening[port] = asyncio.ensure_future(self._open(port, node_id, baudrate, timeout))
+            task.add_done_callback(lambda _: self._opening.pop(port, None))
+        return await asyncio.shield(task)
+
+    async def _open(self, port, node_id, baudrate, timeout):
+        transport = AsyncPortTransport(port=port, node_id=node_id, baudrate=baudrate, timeout=timeout)
+        if not await transport.connect():
+            transport.close()
+            return None
+        self.transports[port] = transport
+        return transport
+
+    def run_on_ports(self, ports, coro_fn, node_id=2):
+        """
+        对每个端口并发执行 coro_fn(transport)，返回 {port: 结果}。
+
+        无法连接的端口结果为None；单个端口抛出的异常作为该端口的结果返回，不影响其他端口。
+        """
+        async def gather():
+            transports = dict(zip(ports, await asyncio.gather(*(self.open_async(port, node_id) for port in ports))))
+            connected = [port for port, transport in transports.items() if transport is not None]
+            results = await asyncio.gather(*(coro_fn(transports[port]) for port in connected), return_exceptions=True)
+            port_results = dict.fromkeys(ports)
+            port_results.update(zip(connected, results))
+            return port_results
+        return self.run(gather())
+
+    def close(self):
+        """
+        关闭所有端口并停止事件循环。
+        """
+        async def close_all():
+            for transport in self.transports.values():
+                transport.close()
+            self.transports.clear()
+        self.run(close_all())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        if not self._thread.is_alive():
+            self._loop.close()
@@ -0,0 +1,214 @@
+## 寄存器读写路径上的轻量统计：按端口、功能码记录延迟直方图，以及重试、超时、重连次数和总线字节数
+import json
+import logging
+import sys
+import threading
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+FC_READ_HOLDING_REGISTERS = 0x03
+FC_WRITE_MULTIPLE_REGISTERS = 0x10
+
+function_code_names = {
+    FC_READ_HOLDING_REGISTERS: 'read',
+    FC_WRITE_MULTIPLE_REGISTERS: 'write',
+}
+
+COUNTER_NAMES = ('requests', 'errors', 'retries', 'timeouts', 'reconnects', 'bytes_sent', 'bytes_received')
+
+
+def register_count(values):
+    """
+    写入值可以是单个整数或列表，返回寄存器个数。
+    """
+    return 1 if isinstance(values, int) else len(values)
+
+
+def frame_bytes(function_code, count, ok=True):
+    """
+    计算一次 RTU 事务在总线上的 (请求字节数, 应答字节数)。
+
+    FC03 请求 8 字节，应答 5 + 2*count；FC16 请求 9 + 2*count，应答 8；异常应答 5 字节。
+    """
+    if function_code == FC_READ_HOLDING_REGISTERS:
+        sent, received = 8, 5 + 2 * count
+    else:
+        sent, received = 9 + 2 * count, 8
+    return sent, received if ok else 5
+
+
+class LatencyHistogram:
+    """
+    HDR 风格的对数线性直方图，以微秒为单位记录延迟。
+
+    小于 2*S 微秒（S = 2 ** sub_bucket_bits）的值每微秒一个桶；更大的值在每个 2 的幂区间内再等分为 S 个桶，
+    相对误差不超过 1/S。桶按需创建，记录一次只是一次字典累加，可以放在每次读写的路径上。
+    """
+    def __init__(self, sub_bucket_bits=5):
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def bucket_index(self, value):
+        linear_limit = self.sub_bucket_count << 1
+        if value < linear_limit:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        return linear_limit + (shift - 1) * self.sub_bucket_count + (value >> shift) - self.sub_bucket_count
+
+    def bucket_value(self, index):
+        """
+        返回桶的中间值（微秒）。
+        """
+        linear_limit = self.sub_bucket_count << 1
+        if index < linear_limit:
+            return index
+        offset = index - linear_limit
+        shift = offset // self.sub_bucket_count + 1
+        top = offset % self.sub_bucket_count + self.sub_bucket_count
+        return (top << shift) + (1 << (shift - 1))
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1000000))
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent):
+        """
+        返回第 percent 百分位的延迟（秒），没有数据时返回None。
+        """
+        if self.count == 0:
+            return None
+        target = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self.bucket_value(index) / 1000000, self.max)
+        return self.max
+
+    def summary(self):
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 3)
+        return {
+            'count': self.count,
+            'mean_ms': ms(self.total / self.count) if self.count else None,
+            'min_ms': ms(self.min),
+            'p50_ms': ms(self.percentile(50)),
+            'p95_ms': ms(self.percentile(95)),
+            'p99_ms': ms(self.percentile(99)),
+            'max_ms': ms(self.max),
+        }
+
+
+class PortMetrics:
+    """
+    单个端口的统计数据：每个功能码一个延迟直方图，以及 COUNTER_NAMES 中的计数器。
+    """
+    def __init__(self, port):
+        self.port = port
+        self.histograms = {}
+        self.counters = dict.fromkeys(COUNTER_NAMES, 0)
+        self._lock = threading.Lock()
+
+    def observe(self, function_code, seconds, count=1, ok=True):
+        sent, received = frame_bytes(function_code, count, ok)
+        with self._lock:
+            histogram = self.histograms.get(function_code)
+            if histogram is None:
+                histogram = self.histograms[function_code] = LatencyHistogram()
+            histogram.record(seconds)
+            self.counters['requests'] += 1
+            self.counters['bytes_sent'] += sent
+            self.counters['bytes_received'] += received
+            if not ok:
+                self.counters['errors'] += 1
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def mean_latency(self, function_code):
+        """
+        返回该功能码的平均延迟（秒），还没有记录时返回None。
+        """
+        with self._lock:
+            histogram = self.histograms.get(function_code)
+            if histogram is None or histogram.count == 0:
+                return None
+            return histogram.total / histogram.count
+
+    def summary(self):
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'latency': {function_code_names.get(fc, str(fc)): histogram.summary() for fc, histogram in self.histograms.items()},
+            }
+
+
+class MetricsRegistry:
+    """
+    按端口汇总所有读写统计，运行过程中可以随时调用 summary() 查询，结束时调用 dump() 输出。
+    """
+    def __init__(self):
+        self._ports = {}
+        self._lock = threading.Lock()
+
+    def port(self, port):
+        with self._lock:
+            metrics = self._ports.get(port)
+            if metrics is None:
+                metrics = self._ports[port] = PortMetrics(port)
+            return metrics
+
+    def observe(self, port, function_code, seconds, count=1, ok=True):
+        self.port(port).observe(function_code, seconds, count, ok)
+
+    def increment(self, port, name, amount=1):
+        self.port(port).increment(name, amount)
+
+    def summary(self):
+        with self._lock:
+            ports = list(self._ports.values())
+        return {metrics.port: metrics.summary() for metrics in ports}
+
+    def reset(self):
+        with self._lock:
+            self._ports.clear()
+
+    def dump(self, path=None):
+        """
+        把统计结果写入 JSON 文件，path 为None时打印到日志。
+        """
+        summary = self.summary()
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            logger.info(f'读写统计已保存到 {path}')
+        else:
+            for port, port_summary in summary.items():
+                counters = port_summary['counters']
+                logger.info(f"[port = {port}]请求 {counters['requests']} 次，失败 {counters['errors']} 次，重试 {counters['retries']} 次，"
+                            f"超时 {counters['timeouts']} 次，重连 {counters['reconnects']} 次，"
+                            f"发送 {counters['bytes_sent']} 字节，接收 {counters['bytes_received']} 字节")
+                for name, latency in port_summary['latency'].items():
+                    logger.info(f"[port = {port}]{name}: {latency['count']} 次，p50 {latency['p50_ms']}ms，"
+                                f"p95 {latency['p95_ms']}ms，p99 {latency['p99_ms']}ms，max {latency['max_ms']}ms")
+        return summary
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,110 @@
+## 大拇指/食指防碰撞的动作规划：只在容易相撞的手指同时运动时错开下发，其余步骤立即下发，取代每步之前的固定等待
+import logging
+import sys
+import threading
+import time
+
+from gesture_library import make_step
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+THUMB = 0
+INDEX = 1
+THUMB_ROTATION = 5
+
+# 容易相撞的手指对：(大拇指侧的手指, 食指)，大拇指弯曲或旋转时会扫过食指的运动范围
+COLLISION_PAIRS = ((THUMB, INDEX), (THUMB_ROTATION, INDEX))
+
+
+class MotionPhase:
+    """
+    一次下发：step 为写入的目标位置，lead_fingers 非空时写入后要等这些手指停下再下发下一阶段。
+    """
+    def __init__(self, step, lead_fingers=()):
+        self.step = step
+        self.lead_fingers = tuple(lead_fingers)
+
+
+class MotionPlanner:
+    """
+    按端口记录已下发的目标位置，规划下一步的下发顺序。
+
+    一步之中只有碰撞手指对的两个手指都要改变目标时才错开：大拇指侧的手指弯曲/旋转进来（目标增大）时让食指先到位，
+    退出去（目标减小）时大拇指侧先到位，先动的手指停下后再下发后面的手指；其余手指在第一阶段就和先动的手指一起出发。
+    没有冲突的步骤立即下发。刚连接、上一步写入失败等不知道当前目标的情况下，无法判断是否冲突，退回固定的
+    fallback_delay 等待。规划结果按 (上一步目标, 本步) 缓存，错开时用到的中间步骤也经 make_step 只创建一次。
+    """
+    def __init__(self, fallback_delay=0.4):
+        self.fallback_delay = fallback_delay
+        self._targets = {}
+        self._plans = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, port):
+        with self._lock:
+            self._targets.pop(port, None)
+
+    def plan(self, previous, step):
+        """
+        返回从目标 previous（元组）到 step 的 MotionPhase 列表。
+        """
+        key = (previous, step)
+        with self._lock:
+            phases = self._plans.get(key)
+        if phases is not None:
+            return phases
+        moving = {finger for finger, (old, new) in enumerate(zip(previous, step.values)) if old != new}
+        # before[手指] = 必须先停下的手指集合
+        before = {}
+        for thumb_side, index in COLLISION_PAIRS:
+            if thumb_side in moving and index in moving:
+                if step.values[thumb_side] > previous[thumb_side]:
+                    before.setdefault(thumb_side, set()).add(index)
+                else:
+                    before.setdefault(index, set()).add(thumb_side)
+        phases = []
+        released = set(range(len(step))) - set(before)
+        remaining = set(before)
+        while remaining:
+            ready = {finger for finger in remaining if before[finger] <= released} or remaining
+            partial = [value if finger in released else previous[finger] for finger, value in enumerate(step.values)]
+            lead = set().union(*(before[finger] for finger in ready))
+            phases.append(MotionPhase(make_step(partial, step.tolerance, step.address, step.allow_blocked), sorted(lead)))
+            released |= ready
+            remaining -= ready
+        phases.append(MotionPhase(step))
+        with self._lock:
+            self._plans[key] = phases
+        return phases
+
+    def write(self, port, step, write_to_register, wait_motion):
+        """
+        按规划写入一步手势，最后一个阶段写入后立即返回，等待动作完成由调用方负责。
+
+        :param write_to_register: 形如 write_to_register(address, value) 的写函数，返回是否成功。
+        :param wait_motion: 形如 wait_motion(fingers) 的等待函数，返回这些手指是否已停止。
+        :return: 一个布尔值，表示所有阶段是否都写入成功。
+        """
+        with self._lock:
+            previous = self._targets.pop(port, None)
+        if previous is None:
+            time.sleep(self.fallback_delay)
+            phases = [MotionPhase(step)]
+        else:
+            phases = self.plan(previous, step)
+        for phase in phases:
+            if not write_to_register(phase.step.address, phase.step):
+                return False
+            with self._lock:
+                self._targets[port] = tuple(phase.step.values)
+            if phase.lead_fingers and not wait_motion(phase.lead_fingers):
+                logger.error(f'[port = {port}]先动的手指 {list(phase.lead_fingers)} 未停止，不再下发后续目标\n')
+                return False
+        return True
+
+
+motion_planner = MotionPlanner()
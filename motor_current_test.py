@@ -10,6 +10,14 @@ from pymodbus.exceptions import ConnectionException, ModbusIOException
 from pymodbus import FramerType
 from pymodbus.client import ModbusSerialClient
 
+from modbus_pacing import FramePacer
+from finger_motion import wait_motion_done
+from current_stats import current_statistics
+from telemetry_store import TELEMETRY_BLOCK_COUNT, telemetry
+from result_sink import ResultSink
+from modbus_metrics import FC_READ_HOLDING_REGISTERS, FC_WRITE_MULTIPLE_REGISTERS, metrics, register_count
+from gesture_library import MOTOR_CURRENT_STEPS, get_step, write_registers
+
 # 设置日志级别为INFO，获取日志记录器实例
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -22,15 +30,14 @@ class MotorCurrentTest:
         self.port = 'COM4'
         self.FRAMER_TYPE = FramerType.RTU
         self.BAUDRATE = 115200
+        self.pacer = FramePacer(self.BAUDRATE, 'rtu') # 帧间节奏，手指是否到位由 wait_motion_done 判断
+        self.motion_timeout = 5 # 等待动作完成的最长时间（秒）
         self.client = None
         self.ROH_FINGER_POS_TARGET0 = 1135
         self.ROH_FINGER_CURRENT0 = 1105
         self.ROH_BEEP_PERIOD  = 1010
         self.max_average_times = 5
-        self.initial_gesture = [0,0,0,0,0,0] #自然展开
-        self.thumb_up_gesture = [0, 65535, 65535, 65535, 65535, 0] # 四指弯曲
-        self.thumb_bend_gesture = [65535, 0, 0, 0, 0, 0] # 大拇值弯曲
-        self.thumb_rotation_gesture = [0, 0, 0, 0, 0, 65535] # 大拇指旋转到对掌位
+        self.initial_gesture = get_step('open') #自然展开
 
         self.gestures = self.create_gesture_dict()
         
@@ -38,13 +45,8 @@ class MotorCurrentTest:
         self.port = port
         
     def create_gesture_dict(self):
-        gesture_dict = {
-            '自然展开': self.initial_gesture,
-            '四指弯曲': self.thumb_up_gesture,
-            '大拇值弯曲': self.thumb_bend_gesture,
-            '大拇指旋转到对掌位': self.thumb_rotation_gesture
-        }
-        return gesture_dict
+        # 自然展开、四指弯曲、大拇指弯曲、大拇指旋转到对掌位，定义在 gesture_library 中
+        return MOTOR_CURRENT_STEPS
     
     def read_from_register(self, address, count):
         """
@@ -62,22 +64,29 @@ class MotorCurrentTest:
         response = None
         while retry_count < max_retries:
             try:
+                self.pacer.before_frame()
+                start = time.perf_counter()
                 response = self.client.read_holding_registers(address=address, count=count, slave=self.node_id)
-                time.sleep(0.2)
+                metrics.observe(self.port, FC_READ_HOLDING_REGISTERS, time.perf_counter() - start, count, not response.isError())
+                self.pacer.after_read()
                 if not response.isError():
                     break
                 else:
                     error_type = self.get_exception(response)
                     if "connection timeout" in error_type.lower():
+                        metrics.increment(self.port, 'reconnects')
                         self.client.connect()
                     elif "read timeout" in error_type.lower():
                         retry_count += 1
-                        time.sleep(0.5)
+                        metrics.increment(self.port, 'retries')
+                        self.pacer.before_retry()
                     else:
                         logger.error(f'[port = {self.port}]读寄存器失败: {error_type}\n')
             except ModbusIOException as e:
+                metrics.increment(self.port, 'timeouts')
                 logger.error(f'[port = {self.port}]Modbus输入输出异常: {e}')
                 if "connection error" in str(e).lower():
+                    metrics.increment(self.port, 'reconnects')
                     self.client.connect()
             except AssertionError as e:
                 logger.error(f'[port = {self.port}]断言错误: {e}')
@@ -100,22 +109,29 @@ class MotorCurrentTest:
         retry_count = 0
         while retry_count < max_retries:
             try:
-                response = self.client.write_registers(address, value, self.node_id)
-                time.sleep(2)
+                self.pacer.before_frame()
+                start = time.perf_counter()
+                response = write_registers(self.client, address, value, self.node_id)
+                metrics.observe(self.port, FC_WRITE_MULTIPLE_REGISTERS, time.perf_counter() - start, register_count(value), not response.isError())
+                self.pacer.after_write()
                 if not response.isError():
                     return True
                 else:
                     error_type = self.get_exception(response)
                     if "connection timeout" in error_type.lower():
+                        metrics.increment(self.port, 'reconnects')
                         self.client.connect()
                     elif "write timeout" in error_type.lower():
                         retry_count += 1
+                        metrics.increment(self.port, 'retries')
                     else:
                         logger.error(f'[port = {self.port}]写寄存器失败: {error_type}\n')
                         return False
             except ModbusIOException as e:
+                metrics.increment(self.port, 'timeouts')
                 logger.error(f'[port = {self.port}]Modbus输入输出异常: {e}')
                 if "connection error" in str(e).lower():
+                    metrics.increment(self.port, 'reconnects')
                     self.client.connect()
                 else:
                     return False
@@ -201,7 +217,19 @@ class MotorCurrentTest:
         :param gesture: 要执行的手势数据。
         :return: 调用write_to_regesister方法的结果，即写入是否成功的布尔值。
         """
-        return self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=self.initial_gesture) and self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=gesture)
+        return self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=self.initial_gesture) and self.wait_motion_done() \
+            and self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=gesture) and self.wait_motion_done()
+
+    def wait_motion_done(self):
+        """
+        等待本次动作完成（所有手指停止）。
+
+        :return: 一个布尔值，表示动作是否正常完成；出现堵转或超时返回False。
+        """
+        result = wait_motion_done(self.read_from_register, timeout=self.motion_timeout)
+        if not result.done:
+            logger.error(f'[port = {self.port}]手指动作未完成: {result}\n')
+        return result.done
     
     def count_motor_curtent(self):
         """
@@ -212,28 +240,28 @@ class MotorCurrentTest:
         :param address: 要读取电流数据的寄存器地址。
         :return: 一个包含6个电机电流平均值的列表。
         """
-        sum_currents = [0] * 6
-        ave_currents = [0] * 6
-        MAX_NUM = self.max_average_times
-        while MAX_NUM > 0:
-            currents = self.read_from_register(address=self.ROH_FINGER_CURRENT0, count=6)
+        samples = []
+        for i in range(self.max_average_times):
+            currents = self.read_from_register(address=self.ROH_FINGER_CURRENT0, count=TELEMETRY_BLOCK_COUNT if telemetry.active else 6)
             if currents is None or currents.isError():
                 logger.error("currents: read_holding_registers has an error \n")
+                samples.append(None)
             else:
+                telemetry.record(self.port, currents.registers)
+                samples.append(currents.registers[:6])
                 time.sleep(0.5)
-            currents_list = currents.registers if currents else []
-            sum_currents = [sum_currents[j] + currents_list[j] for j in range(len(currents_list))]
-            MAX_NUM -= 1
-        ave_currents = [sum_currents[k] / self.max_average_times for k in range(len(currents_list))]
-       
-        return ave_currents
+        # 读取失败的采样不计入平均值，一次都没读到时返回空列表
+        stats = current_statistics(samples)
+        if not stats.valid:
+            return []
+        return stats.to_list('mean')
 
 def check_ports(ports_list):
     valid_ports = []
     status = True
     if ports_list is not None:
         for port in ports_list:
-            if isinstance(port, str) and port.startswith('COM'):
+            if isinstance(port, str) and port.startswith(('COM', '/dev/')):
                 valid_ports.append(port)
             else:
                 status = False
@@ -261,10 +289,13 @@ def main(ports=None, max_cycle_num=1):
         result = '不通过'
         return overall_result,result
     
+    metrics.reset()
+    telemetry.start(name='motor_current_test')
     start_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------开始老化测试<开始时间：{start_time}>----------------------------------------------\n')
     logger.info('测试目的：各个手指在始末位置，各个电机的电流表现')
     logger.info('标准：电流值范围 < 0~100mA >\n')
+    sink = ResultSink(name='motor_current_test')
     try:
         start_time1 = time.time()
         end_time1 = start_time1 + max_cycle_num * 3600
@@ -277,7 +308,7 @@ def main(ports=None, max_cycle_num=1):
                 futures = [executor.submit(run_tests_for_port, port, connected_status) for port in ports]
                 for future in concurrent.futures.as_completed(futures):
                     port_result, _ = future.result()
-                    overall_result.append(port_result)
+                    sink.write(port_result)
                     for gesture_result in port_result["gestures"]:
                         if gesture_result["result"]!= "通过":
                             result = '不通过'
@@ -289,7 +320,10 @@ def main(ports=None, max_cycle_num=1):
     except Exception as e:
         logging.error(f"Error: {e}")
     finally:
-        pass
+        sink.close()
+    overall_result = sink.summary_results()
+    telemetry.stop()
+    metrics.dump()
     end_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------老化测试结束<结束时间：{end_time}>----------------------------------------------\n')
     # print_overall_result(overall_result)
@@ -313,6 +347,7 @@ def print_overall_result(overall_result):
 
 
 def run_tests_for_port(port, connected_status):
+    telemetry.begin_cycle(port)
     motorCurrentTest = MotorCurrentTest()
     motorCurrentTest.set_port(port)
     if not connected_status:
@@ -1,15 +1,15 @@
-## 测试所有电机的工作电流
+## 测试所有电机的工作电流，所有端口由 modbus_async_transport 的同一个事件循环驱动
+import asyncio
 import datetime
 import logging
-import concurrent.futures
-import string
 import sys
-import threading
-import time
 
-from pymodbus.exceptions import ConnectionException, ModbusIOException
-from pymodbus import FramerType
-from pymodbus.client import ModbusSerialClient
+from modbus_async_transport import AsyncTransportHub
+from finger_motion import async_wait_motion_done
+from current_stats import current_statistics
+from telemetry_store import TELEMETRY_BLOCK_COUNT, telemetry
+from modbus_metrics import metrics
+from gesture_library import MOTOR_CURRENT_STEPS, get_step
 
 # 设置日志级别为INFO，获取日志记录器实例
 logger = logging.getLogger(__name__)
@@ -18,20 +18,15 @@ stream_handler = logging.StreamHandler(stream=sys.stdout)
 logger.addHandler(stream_handler)
 
 class MotorCurrentTest:
-    def __init__(self):
-        self.node_id = 2
-        self.port = 'COM4'
-        self.FRAMER_TYPE = FramerType.RTU
-        self.BAUDRATE = 115200
-        self.client = None
+    def __init__(self, transport):
+        self.transport = transport # modbus_async_transport.AsyncPortTransport，连接由 AsyncTransportHub 管理
+        self.port = transport.port
+        self.motion_timeout = 5 # 等待动作完成的最长时间（秒）
         self.ROH_FINGER_POS_TARGET0 = 1135
         self.ROH_FINGER_CURRENT0 = 1105
         self.ROH_BEEP_PERIOD  = 1010
         self.max_average_times = 5
-        self.initial_gesture = [0,0,0,0,0,0] #自然展开
-        self.thumb_up_gesture = [0, 65535, 65535, 65535, 65535, 0] # 四指弯曲
-        self.thumb_bend_gesture = [65535, 0, 0, 0, 0, 0] # 大拇值弯曲
-        self.thumb_rotation_gesture = [0, 0, 0, 0, 0, 65535] # 大拇指旋转到对掌位
+        self.initial_gesture = get_step('open') #自然展开
 
         self.gestures = self.create_gesture_dict()
         self.collectMotorCurrents = {
@@ -46,99 +41,30 @@ class MotorCurrentTest:
         self.min_motor_currents =[0.0,0.0,0.0,0.0,0.0,0.0]
         self.max_motor_currents =[0.0,0.0,0.0,0.0,0.0,0.0]
         
-    def set_port(self,port):
-        self.port = port
-        
     def create_gesture_dict(self):
-        gesture_dict = {
-            '自然展开': self.initial_gesture,
-            '四指弯曲': self.thumb_up_gesture,
-            '大拇值弯曲': self.thumb_bend_gesture,
-            '大拇指旋转到对掌位': self.thumb_rotation_gesture
-        }
-        return gesture_dict
+        # 自然展开、四指弯曲、大拇指弯曲、大拇指旋转到对掌位，定义在 gesture_library 中
+        return MOTOR_CURRENT_STEPS
     
-    def read_from_register(self, address, count):
+    async def read_from_register(self, address, count):
         """
-        从指定的寄存器地址读取数据。
-
-        最多尝试读取max_retries次，如果读取成功则返回读取结果。如果遇到连接超时或读取超时等错误，
-        会进行相应处理（如重新连接或增加重试次数），其他异常也会被记录。
+        从指定的寄存器地址读取数据，超时重试由 pymodbus 的异步客户端处理。
 
         :param address: 要读取的寄存器地址。
         :param count: 要读取的寄存器数量。
         :return: 如果成功读取则返回pymodbus的read_holding_registers响应对象，否则返回None。
         """
-        max_retries = 3
-        retry_count = 0
-        response = None
-        while retry_count < max_retries:
-            try:
-                response = self.client.read_holding_registers(address=address, count=count, slave=self.node_id)
-                time.sleep(0.2)
-                if not response.isError():
-                    break
-                else:
-                    error_type = self.get_exception(response)
-                    if "connection timeout" in error_type.lower():
-                        self.client.connect()
-                    elif "read timeout" in error_type.lower():
-                        retry_count += 1
-                        time.sleep(0.5)
-                    else:
-                        logger.error(f'[port = {self.port}]读寄存器失败: {error_type}\n')
-            except ModbusIOException as e:
-                logger.error(f'[port = {self.port}]Modbus输入输出异常: {e}')
-                if "connection error" in str(e).lower():
-                    self.client.connect()
-            except AssertionError as e:
-                logger.error(f'[port = {self.port}]断言错误: {e}')
-            except Exception as e:
-                logger.error(f'[port = {self.port}]其他异常: {e}')
-        return response
+        return await self.transport.read(address, count)
 
-    def write_to_regesister(self, address, value):
+    async def write_to_regesister(self, address, value):
         """
         向指定的寄存器地址写入数据。
 
-        最多尝试写入max_retries次，根据写入结果和可能出现的错误（如连接超时、写入超时等）进行相应处理，
-        并返回写入是否成功的布尔值。
-
         :param address: 要写入的寄存器地址。
-        :param value: 要写入的值。
+        :param value: 要写入的值、值列表或 GestureStep。
         :return: 如果写入成功则返回True，否则返回False。
         """
-        max_retries = 3
-        retry_count = 0
-        while retry_count < max_retries:
-            try:
-                response = self.client.write_registers(address, value, self.node_id)
-                time.sleep(2)
-                if not response.isError():
-                    return True
-                else:
-                    error_type = self.get_exception(response)
-                    if "connection timeout" in error_type.lower():
-                        self.client.connect()
-                    elif "write timeout" in error_type.lower():
-                        retry_count += 1
-                    else:
-                        logger.error(f'[port = {self.port}]写寄存器失败: {error_type}\n')
-                        return False
-            except ModbusIOException as e:
-                logger.error(f'[port = {self.port}]Modbus输入输出异常: {e}')
-                if "connection error" in str(e).lower():
-                    self.client.connect()
-                else:
-                    return False
-            except AssertionError as e:
-                logger.error(f'[port = {self.port}]断言错误: {e}')
-                return False
-            except Exception as e:
-                logger.error(f'[port = {self.port}]其他异常: {e}')
-                return False
-        return False   
-    
+        return await self.transport.write(address, value)
+
     # def do_alarm(self):
     #     """
     #     启动蜂鸣器报警功能
@@ -171,40 +97,7 @@ class MotorCurrentTest:
         """
         return all(c <= 100 for c in curs)
     
-    def connect_device(self):
-        """
-        连接到Modbus设备。
-
-        创建ModbusSerialClient实例并尝试连接到指定端口的设备，根据连接结果记录日志并返回连接是否成功的布尔值。
-
-        :return: 一个布尔值，表示是否成功连接到设备。
-        """
-        connect_status = False
-        try:
-            self.client = ModbusSerialClient(port=self.port, framer=self.FRAMER_TYPE, baudrate=self.BAUDRATE)
-            connect_status = self.client.connect()
-            logger.info(f"[port = {self.port}]Successfully connected to Modbus device.")
-        except ConnectionException as e:
-            logger.error(f"[port = {self.port}]Error during setup: {e}")
-        except Exception as e:
-            logger.error(f"[port = {self.port}]Error during setup: {e}")
-        return connect_status
-
-    def disConnect_device(self):
-        """
-        断开与Modbus设备的连接。
-
-        如果存在client实例则关闭连接并将client设置为None，同时记录日志，如果出现异常也会记录。
-        """
-        if self.client:
-            try:
-                self.client.close()
-                self.client = None
-                logger.info(f"[port = {self.port}]Connection to Modbus device closed.")
-            except Exception as e:
-                logger.error(f"[port = {self.port}]Error during teardown: {e}")
-
-    def do_gesture(self, key,gesture):
+    async def do_gesture(self, key,gesture):
         """
         执行特定的手势动作。
 
@@ -213,9 +106,21 @@ class MotorCurrentTest:
         :param gesture: 要执行的手势数据。
         :return: 调用write_to_regesister方法的结果，即写入是否成功的布尔值。
         """
-        return self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=self.initial_gesture) and self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=gesture)
+        return await self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=self.initial_gesture) and await self.wait_motion_done() \
+            and await self.write_to_regesister(address=self.ROH_FINGER_POS_TARGET0, value=gesture) and await self.wait_motion_done()
+
+    async def wait_motion_done(self):
+        """
+        等待本次动作完成（所有手指停止）。
+
+        :return: 一个布尔值，表示动作是否正常完成；出现堵转或超时返回False。
+        """
+        result = await async_wait_motion_done(self.read_from_register, timeout=self.motion_timeout)
+        if not result.done:
+            logger.error(f'[port = {self.port}]手指动作未完成: {result}\n')
+        return result.done
     
-    def count_motor_curtent(self):
+    async def count_motor_curtent(self):
         """
         计算电机电流的平均值。
 
@@ -224,21 +129,21 @@ class MotorCurrentTest:
         :param address: 要读取电流数据的寄存器地址。
         :return: 一个包含6个电机电流平均值的列表。
         """
-        sum_currents = [0] * 6
-        ave_currents = [0] * 6
-        MAX_NUM = self.max_average_times
-        while MAX_NUM > 0:
-            currents = self.read_from_register(address=self.ROH_FINGER_CURRENT0, count=6)
+        samples = []
+        for i in range(self.max_average_times):
+            currents = await self.read_from_register(address=self.ROH_FINGER_CURRENT0, count=TELEMETRY_BLOCK_COUNT if telemetry.active else 6)
             if currents is None or currents.isError():
                 logger.error("currents: read_holding_registers has an error \n")
+                samples.append(None)
             else:
-                time.sleep(0.5)
-            currents_list = currents.registers if currents else []
-            sum_currents = [sum_currents[j] + currents_list[j] for j in range(len(currents_list))]
-            MAX_NUM -= 1
-        ave_currents = [sum_currents[k] / self.max_average_times for k in range(len(currents_list))]
-       
-        return ave_currents
+                telemetry.record(self.port, currents.registers)
+                samples.append(currents.registers[:6])
+                await asyncio.sleep(0.5)
+        # 读取失败的采样不计入平均值，一次都没读到时返回空列表
+        stats = current_statistics(samples)
+        if not stats.valid:
+            return []
+        return stats.to_list('mean')
     
     def collect_min_and_max_currents(self,ges='',current=[]):
         if ges == '自然展开':
@@ -266,7 +171,7 @@ def check_ports(ports_list):
     status = True
     if ports_list is not None:
         for port in ports_list:
-            if isinstance(port, str) and port.startswith('COM'):
+            if isinstance(port, str) and port.startswith(('COM', '/dev/')):
                 valid_ports.append(port)
             else:
                 status = False
@@ -286,7 +191,6 @@ def main(ports=None, max_cycle_num=1):
     """
     result = '通过'
     overall_result = []
-    connected_status = False
     
     status, valid_ports = check_ports(ports)
     if not (status and len(valid_ports)>=1):
@@ -294,27 +198,37 @@ def main(ports=None, max_cycle_num=1):
         result = '不通过'
         return overall_result,result
     
+    metrics.reset()
+    telemetry.start(name='motor_current_test_v2')
     start_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------开始测试电机电流<开始时间：{start_time}>----------------------------------------------\n')
     logger.info('测试目的：各个手指在始末位置，各个电机的电流表现')
     logger.info('标准：电流值范围 < 0~100mA >\n')
+    hub = AsyncTransportHub()
     try:
         logger.info(f"##########################测试开始######################\n")
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [executor.submit(run_tests_for_port, port, connected_status) for port in ports]
-            for future in concurrent.futures.as_completed(futures):
-                port_result, _ = future.result()
-                overall_result.append(port_result)
-                for gesture_result in port_result["gestures"]:
-                    if gesture_result["result"]!= "通过":
-                        result = '不通过'
-                        break
-            logger.info(f"#################测试结束，测试结果：{result}#############\n")
+        # 所有端口在同一个事件循环中并发测试，不再为每个端口开一个线程
+        port_results = hub.run_on_ports(ports, run_tests_for_port)
+        for port, port_result in port_results.items():
+            if port_result is None:
+                port_result = build_failed_port_result(port, '当前端口无法获取到设备或无法连接到设备')
+            elif isinstance(port_result, Exception):
+                logger.error(f"[port = {port}]获取电机电流或检查电流时出现错误：{port_result}")
+                port_result = build_failed_port_result(port, f'获取电机电流或检查电流时出现错误：{port_result}')
+            overall_result.append(port_result)
+            for gesture_result in port_result["gestures"]:
+                if gesture_result["result"]!= "通过":
+                    result = '不通过'
+                    break
+        logger.info(f"#################测试结束，测试结果：{result}#############\n")
 
     except Exception as e:
         logging.error(f"Error: {e}")
+        result = '不通过'
     finally:
-        pass
+        hub.close()
+    telemetry.stop()
+    metrics.dump()
     end_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f'---------------------------------------------电机电流测试结束<结束时间：{end_time}>----------------------------------------------\n')
     # print_overall_result(overall_result)
@@ -337,13 +251,25 @@ def print_overall_result(overall_result):
                 logger.info(f" timestamp:{timestamp} content: {content}, Result: {result}")
 
 
-def run_tests_for_port(port, connected_status):
+def build_failed_port_result(port, content):
+    return {
+        "port": port,
+        "gestures": [{
+            "timestamp": datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "content": content,
+            "result": '不通过'
+        }]
+    }
+
+
+async def run_tests_for_port(transport):
+    """
+    在一个已连接的端口上依次执行各手势并统计电机电流，返回该端口的 port_result。
+    """
+    port = transport.port
+    telemetry.begin_cycle(port)
     result = '通过'
-    motorCurrentTest = MotorCurrentTest()
-    motorCurrentTest.set_port(port)
-    if not connected_status:
-        motorCurrentTest.connect_device()
-        connected_status = True
+    motorCurrentTest = MotorCurrentTest(transport)
     port_result = {
         "port": port,
         "gestures": []
@@ -351,8 +277,8 @@ def run_tests_for_port(port, connected_status):
     timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     try:
         for key, gesture in motorCurrentTest.gestures.items():
-            if motorCurrentTest.do_gesture(key = key, gesture = gesture):
-                motors_current = motorCurrentTest.count_motor_curtent()
+            if await motorCurrentTest.do_gesture(key = key, gesture = gesture):
+                motors_current = await motorCurrentTest.count_motor_curtent()
                 motorCurrentTest.collect_min_and_max_currents(ges=key,current=motors_current)
                 logger.info(f'[port = {port}]执行    ---->  {key},电机电流为 -->{motors_current}')
                 if  not motorCurrentTest.checkCurrent(motors_current):
@@ -367,8 +293,7 @@ def run_tests_for_port(port, connected_status):
                         "result": result
                         }
     port_result["gestures"].append(gesture_result)
-    motorCurrentTest.disConnect_device()
-    return port_result, connected_status
+    return port_result
             
 if __name__ == "__main__":
     port = ['COM4']
@@ -0,0 +1,143 @@
+## 每个端口一个长期运行的工作线程，各自循环执行测试直到截止时间，结果实时汇总到 ResultCollector
+import datetime
+import logging
+import sys
+import threading
+import time
+
+from result_sink import ResultSink
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+CONNECT_FAILED_CONTENT = '当前端口无法获取到设备或无法连接到设备'
+
+
+def failed_gesture_result(content):
+    return {
+        'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'content': content,
+        'result': '不通过',
+    }
+
+
+class ResultCollector:
+    """
+    线程安全地汇总各端口工作线程推送的 port_result。
+
+    sink：ResultSink，port_result 直接写入其中，不在内存中累积。
+    cycle_counts：每个端口已完成的轮数，从检查点恢复时可传入之前的值，轮次编号接着往下数。
+    """
+    def __init__(self, sink=None, cycle_counts=None, stopped_ports=()):
+        self.sink = sink if sink is not None else ResultSink()
+        self.cycle_counts = dict(cycle_counts or {})
+        self._stopped_ports = set(stopped_ports)
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def submit(self, port_result):
+        """
+        记录一个端口一轮的结果，返回该轮是否通过。
+        """
+        with self._lock:
+            port = port_result['port']
+            self.cycle_counts[port] = self.cycle_counts.get(port, 0) + 1
+        return self._write(port_result)
+
+    def record_failure(self, port, content):
+        """
+        记录一条不属于正常测试轮次的失败（测试或每轮后的处理抛出异常），整体结果记为不通过，不计入轮数。
+        """
+        self._write({'port': port, 'gestures': [failed_gesture_result(content)]})
+
+    def _write(self, port_result):
+        try:
+            passed = self.sink.write(port_result)
+        except Exception as e:
+            logger.error(f"[port = {port_result['port']}]保存测试结果失败: {e}\n")
+            passed = False
+        if not passed:
+            with self._lock:
+                self._failed = True
+        return passed
+
+    @property
+    def final_result(self):
+        with self._lock:
+            failed = self._failed
+        return '不通过' if failed else self.sink.final_result
+
+    def stop_port(self, port):
+        """
+        通知该端口的工作线程在当前一轮结束后退出。
+        """
+        with self._lock:
+            self._stopped_ports.add(port)
+
+    def is_stopped(self, port):
+        with self._lock:
+            return port in self._stopped_ports
+
+    def stopped_ports(self):
+        with self._lock:
+            return sorted(self._stopped_ports)
+
+
+def port_worker(port, run_cycle, end_time, collector, after_cycle=None, reconnect_delay=1.0, max_reconnect_delay=60.0):
+    """
+    在一个端口上循环执行 run_cycle(port) 直到 end_time（time.time() 时间戳）或该端口被停止。
+
+    run_cycle 或 after_cycle 抛出异常时记录一条不通过的结果并停止该端口；连接失败的一轮记为不通过，
+    之后等待 reconnect_delay 秒再重连，连续失败时等待时间逐次加倍，最多 max_reconnect_delay 秒。
+
+    :param run_cycle: 执行一轮测试的函数，返回 (port_result 字典, 是否连接成功)。
+    :param after_cycle: 可选，每轮结束后调用 after_cycle(port, port_result, collector)，可在其中调用 collector.stop_port。
+    """
+    cycle_num = collector.cycle_counts.get(port, 0)
+    delay = reconnect_delay
+    while time.time() < end_time and not collector.is_stopped(port):
+        cycle_num += 1
+        logger.info(f"[port = {port}]##########################第 {cycle_num} 轮测试开始######################\n")
+        try:
+            port_result, connected_status = run_cycle(port)
+        except Exception as e:
+            logger.error(f'[port = {port}]第 {cycle_num} 轮测试出现异常，停止该端口: {e}\n')
+            collector.record_failure(port, f'第 {cycle_num} 轮测试出现异常：{e}')
+            collector.stop_port(port)
+            break
+        if not connected_status and not port_result['gestures']:
+            port_result['gestures'].append(failed_gesture_result(CONNECT_FAILED_CONTENT))
+        result = '通过' if collector.submit(port_result) else '不通过'
+        logger.info(f"[port = {port}]#################第 {cycle_num} 轮测试结束，测试结果：{result}#############\n")
+        if after_cycle is not None:
+            try:
+                after_cycle(port, port_result, collector)
+            except Exception as e:
+                logger.error(f'[port = {port}]第 {cycle_num} 轮结束后的处理出现异常，停止该端口: {e}\n')
+                collector.record_failure(port, f'第 {cycle_num} 轮结束后的处理出现异常：{e}')
+                collector.stop_port(port)
+                break
+        if connected_status:
+            delay = reconnect_delay
+        else:
+            logger.info(f'[port = {port}]连接设备失败，{delay:.0f} 秒后重连\n')
+            time.sleep(max(0.0, min(delay, end_time - time.time())))
+            delay = min(delay * 2, max_reconnect_delay)
+
+
+def run_port_workers(ports, run_cycle, end_time, collector=None, after_cycle=None):
+    """
+    为每个端口启动一个工作线程，各端口独立循环，快的设备不用等待慢的设备；所有线程结束后返回 collector。
+    """
+    if collector is None:
+        collector = ResultCollector()
+    threads = [threading.Thread(target=port_worker, args=(port, run_cycle, end_time, collector, after_cycle), name=f'worker-{port}', daemon=True)
+               for port in ports]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return collector
@@ -0,0 +1,176 @@
+## 流式保存测试结果：每轮的 port_result 追加写入 JSON Lines 文件并定期落盘，内存中只保留每个端口的汇总数据
+import collections
+import datetime
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+RESULT_DIR = 'results'
+
+
+class PortAggregate:
+    """
+    单个端口的运行汇总。
+
+    cycles/passed/failed：总轮数、通过轮数、不通过轮数。
+    first_timestamp/last_timestamp：第一轮和最近一轮的时间。
+    recent_failures：最近若干条不通过的手势结果，数量有上限。
+    """
+    def __init__(self, port, max_recent_failures):
+        self.port = port
+        self.cycles = 0
+        self.passed = 0
+        self.failed = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.recent_failures = collections.deque(maxlen=max_recent_failures)
+
+    def update(self, port_result):
+        failures = [gesture_result for gesture_result in port_result['gestures'] if gesture_result['result'] != '通过']
+        timestamp = port_result['gestures'][-1]['timestamp'] if port_result['gestures'] else datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.cycles += 1
+        if failures:
+            self.failed += 1
+            self.recent_failures.extend(failures)
+        else:
+            self.passed += 1
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+        return not failures
+
+    def state(self):
+        return {
+            'cycles': self.cycles,
+            'passed': self.passed,
+            'failed': self.failed,
+            'first_timestamp': self.first_timestamp,
+            'last_timestamp': self.last_timestamp,
+            'recent_failures': list(self.recent_failures),
+        }
+
+    def load_state(self, state):
+        self.cycles = state['cycles']
+        self.passed = state['passed']
+        self.failed = state['failed']
+        self.first_timestamp = state['first_timestamp']
+        self.last_timestamp = state['last_timestamp']
+        self.recent_failures.extend(state['recent_failures'])
+
+
+class ResultSink:
+    """
+    追加写入的结果文件加上按端口的汇总。
+
+    每条 port_result 写成一行 JSON 并立即 flush，距上次 fsync 超过 fsync_interval 秒时再 fsync 一次，
+    程序中途退出最多丢失最近几秒的记录；无论运行多久，内存中只有每个端口一个 PortAggregate。
+    """
+    def __init__(self, name='result', path=None, fsync_interval=5.0, max_recent_failures=10):
+        if path is None:
+            os.makedirs(RESULT_DIR, exist_ok=True)
+            path = os.path.join(RESULT_DIR, f"{name}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.max_recent_failures = max_recent_failures
+        self.aggregates = {}
+        self.final_result = '通过'
+        self._file = open(path, 'a', encoding='utf-8')
+        if self._file.tell() > 0 and not self.ends_with_newline(path):
+            # 上次运行在写一行的中途退出，补上换行，避免新记录接在半行后面
+            self._file.write('\n')
+        self._last_fsync = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def ends_with_newline(path):
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def write(self, port_result):
+        """
+        追加一条 port_result 并更新汇总，返回该轮是否通过。
+        """
+        line = json.dumps(port_result, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = time.monotonic()
+            aggregate = self.aggregates.get(port_result['port'])
+            if aggregate is None:
+                aggregate = self.aggregates[port_result['port']] = PortAggregate(port_result['port'], self.max_recent_failures)
+            passed = aggregate.update(port_result)
+            if not passed:
+                self.final_result = '不通过'
+        return passed
+
+    def state(self):
+        """
+        返回可写入检查点的汇总数据，结果文件本身已经在磁盘上，只记录与汇总对应的文件长度 offset。
+        """
+        with self._lock:
+            return {
+                'path': self.path,
+                'offset': self._file.tell(),
+                'final_result': self.final_result,
+                'aggregates': {port: aggregate.state() for port, aggregate in self.aggregates.items()},
+            }
+
+    def load_state(self, state):
+        """
+        从检查点恢复汇总数据，用于以同一个 path 重新打开结果文件继续追加。
+
+        检查点之后写入的记录没有计入汇总，先把文件截断到检查点时的 offset，使文件内容与汇总一致。
+        """
+        with self._lock:
+            offset = state.get('offset')
+            if offset is not None and self._file.tell() > offset:
+                self._file.truncate(offset)
+                self._file.seek(offset)
+                logger.info(f'结果文件 {self.path} 截断到检查点位置 {offset}')
+            self.final_result = state['final_result']
+            for port, aggregate_state in state['aggregates'].items():
+                aggregate = self.aggregates[port] = PortAggregate(port, self.max_recent_failures)
+                aggregate.load_state(aggregate_state)
+
+    def summary_results(self):
+        """
+        由汇总数据生成与 overall_result 相同结构的列表：每个端口一条，gestures 中第一项为统计结果，后面是最近的不通过记录。
+        """
+        with self._lock:
+            aggregates = list(self.aggregates.values())
+        results = []
+        for aggregate in aggregates:
+            summary = {
+                'timestamp': aggregate.last_timestamp,
+                'content': f'共 {aggregate.cycles} 轮，通过 {aggregate.passed} 轮，不通过 {aggregate.failed} 轮（{aggregate.first_timestamp} ~ {aggregate.last_timestamp}），详细记录见 {self.path}',
+                'result': '通过' if aggregate.failed == 0 else '不通过',
+            }
+            results.append({'port': aggregate.port, 'gestures': [summary] + list(aggregate.recent_failures)})
+        return results
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+        logger.info(f'测试记录已保存到 {self.path}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,358 @@
+## ROH 灵巧手的 Modbus-RTU 寄存器地址、手指状态值、可写寄存器描述和块读写规划，测试脚本、传输层和模拟器共用，不依赖 pymodbus
+from array import array
+import time
+
+# ModBus-RTU registers for ROH
+MODBUS_PROTOCOL_VERSION_MAJOR = 1
+
+ROH_PROTOCOL_VERSION      = (1000) # R
+ROH_FW_VERSION            = (1001) # R
+ROH_FW_REVISION           = (1002) # R
+ROH_HW_VERSION            = (1003) # R
+ROH_BOOT_VERSION          = (1004) # R
+ROH_NODE_ID               = (1005) # R/W
+ROH_SUB_EXCEPTION         = (1006) # R
+ROH_BATTERY_VOLTAGE       = (1007) # R
+ROH_SELF_TEST_LEVEL       = (1008) # R/W
+ROH_BEEP_SWITCH           = (1009) # R/W
+ROH_BEEP_PERIOD           = (1010) # W
+ROH_BUTTON_PRESS_CNT      = (1011) # R/W
+ROH_RECALIBRATE           = (1012) # W
+ROH_START_INIT            = (1013) # W
+ROH_RESET                 = (1014) # W
+ROH_POWER_OFF             = (1015) # W
+ROH_RESERVED0             = (1016) # R/W
+ROH_RESERVED1             = (1017) # R/W
+ROH_RESERVED2             = (1018) # R/W
+ROH_RESERVED3             = (1019) # R/W
+ROH_CALI_END0             = (1020) # R/W
+ROH_CALI_END1             = (1021) # R/W
+ROH_CALI_END2             = (1022) # R/W
+ROH_CALI_END3             = (1023) # R/W
+ROH_CALI_END4             = (1024) # R/W
+ROH_CALI_END5             = (1025) # R/W
+ROH_CALI_END6             = (1026) # R/W
+ROH_CALI_END7             = (1027) # R/W
+ROH_CALI_END8             = (1028) # R/W
+ROH_CALI_END9             = (1029) # R/W
+ROH_CALI_START0           = (1030) # R/W
+ROH_CALI_START1           = (1031) # R/W
+ROH_CALI_START2           = (1032) # R/W
+ROH_CALI_START3           = (1033) # R/W
+ROH_CALI_START4           = (1034) # R/W
+ROH_CALI_START5           = (1035) # R/W
+ROH_CALI_START6           = (1036) # R/W
+ROH_CALI_START7           = (1037) # R/W
+ROH_CALI_START8           = (1038) # R/W
+ROH_CALI_START9           = (1039) # R/W
+ROH_CALI_THUMB_POS0       = (1040) # R/W
+ROH_CALI_THUMB_POS1       = (1041) # R/W
+ROH_CALI_THUMB_POS2       = (1042) # R/W
+ROH_CALI_THUMB_POS3       = (1043) # R/W
+ROH_CALI_THUMB_POS4       = (1044) # R/W
+ROH_FINGER_P0             = (1045) # R/W
+ROH_FINGER_P1             = (1046) # R/W
+ROH_FINGER_P2             = (1047) # R/W
+ROH_FINGER_P3             = (1048) # R/W
+ROH_FINGER_P4             = (1049) # R/W
+ROH_FINGER_P5             = (1050) # R/W
+ROH_FINGER_P6             = (1051) # R/W
+ROH_FINGER_P7             = (1052) # R/W
+ROH_FINGER_P8             = (1053) # R/W
+ROH_FINGER_P9             = (1054) # R/W
+ROH_FINGER_I0             = (1055) # R/W
+ROH_FINGER_I1             = (1056) # R/W
+ROH_FINGER_I2             = (1057) # R/W
+ROH_FINGER_I3             = (1058) # R/W
+ROH_FINGER_I4             = (1059) # R/W
+ROH_FINGER_I5             = (1060) # R/W
+ROH_FINGER_I6             = (1061) # R/W
+ROH_FINGER_I7             = (1062) # R/W
+ROH_FINGER_I8             = (1063) # R/W
+ROH_FINGER_I9             = (1064) # R/W
+ROH_FINGER_D0             = (1065) # R/W
+ROH_FINGER_D1             = (1066) # R/W
+ROH_FINGER_D2             = (1067) # R/W
+ROH_FINGER_D3             = (1068) # R/W
+ROH_FINGER_D4             = (1069) # R/W
+ROH_FINGER_D5             = (1070) # R/W
+ROH_FINGER_D6             = (1071) # R/W
+ROH_FINGER_D7             = (1072) # R/W
+ROH_FINGER_D8             = (1073) # R/W
+ROH_FINGER_D9             = (1074) # R/W
+ROH_FINGER_G0             = (1075) # R/W
+ROH_FINGER_G1             = (1076) # R/W
+ROH_FINGER_G2             = (1077) # R/W
+ROH_FINGER_G3             = (1078) # R/W
+ROH_FINGER_G4             = (1079) # R/W
+ROH_FINGER_G5             = (1080) # R/W
+ROH_FINGER_G6             = (1081) # R/W
+ROH_FINGER_G7             = (1082) # R/W
+ROH_FINGER_G8             = (1083) # R/W
+ROH_FINGER_G9             = (1084) # R/W
+ROH_FINGER_STATUS0        = (1085) # R
+ROH_FINGER_STATUS1        = (1086) # R
+ROH_FINGER_STATUS2        = (1087) # R
+ROH_FINGER_STATUS3        = (1088) # R
+ROH_FINGER_STATUS4        = (1089) # R
+ROH_FINGER_STATUS5        = (1090) # R
+ROH_FINGER_STATUS6        = (1091) # R
+ROH_FINGER_STATUS7        = (1092) # R
+ROH_FINGER_STATUS8        = (1093) # R
+ROH_FINGER_STATUS9        = (1094) # R
+ROH_FINGER_CURRENT_LIMIT0 = (1095) # R/W
+ROH_FINGER_CURRENT_LIMIT1 = (1096) # R/W
+ROH_FINGER_CURRENT_LIMIT2 = (1097) # R/W
+ROH_FINGER_CURRENT_LIMIT3 = (1098) # R/W
+ROH_FINGER_CURRENT_LIMIT4 = (1099) # R/W
+ROH_FINGER_CURRENT_LIMIT5 = (1100) # R/W
+ROH_FINGER_CURRENT_LIMIT6 = (1101) # R/W
+ROH_FINGER_CURRENT_LIMIT7 = (1102) # R/W
+ROH_FINGER_CURRENT_LIMIT8 = (1103) # R/W
+ROH_FINGER_CURRENT_LIMIT9 = (1104) # R/W
+ROH_FINGER_CURRENT0       = (1105) # R
+ROH_FINGER_CURRENT1       = (1106) # R
+ROH_FINGER_CURRENT2       = (1107) # R
+ROH_FINGER_CURRENT3       = (1108) # R
+ROH_FINGER_CURRENT4       = (1109) # R
+ROH_FINGER_CURRENT5       = (1110) # R
+ROH_FINGER_CURRENT6       = (1111) # R
+ROH_FINGER_CURRENT7       = (1112) # R
+ROH_FINGER_CURRENT8       = (1113) # R
+ROH_FINGER_CURRENT9       = (1114) # R
+ROH_FINGER_FORCE_LIMIT0   = (1115) # R/W
+ROH_FINGER_FORCE_LIMIT1   = (1116) # R/W
+ROH_FINGER_FORCE_LIMIT2   = (1117) # R/W
+ROH_FINGER_FORCE_LIMIT3   = (1118) # R/W
+ROH_FINGER_FORCE_LIMIT4   = (1119) # R/W
+ROH_FINGER_FORCE0         = (1120) # R
+ROH_FINGER_FORCE1         = (1121) # R
+ROH_FINGER_FORCE2         = (1122) # R
+ROH_FINGER_FORCE3         = (1123) # R
+ROH_FINGER_FORCE4         = (1124) # R
+ROH_FINGER_SPEED0         = (1125) # R/W
+ROH_FINGER_SPEED1         = (1126) # R/W
+ROH_FINGER_SPEED2         = (1127) # R/W
+ROH_FINGER_SPEED3         = (1128) # R/W
+ROH_FINGER_SPEED4         = (1129) # R/W
+ROH_FINGER_SPEED5         = (1130) # R/W
+ROH_FINGER_SPEED6         = (1131) # R/W
+ROH_FINGER_SPEED7         = (1132) # R/W
+ROH_FINGER_SPEED8         = (1133) # R/W
+ROH_FINGER_SPEED9         = (1134) # R/W
+ROH_FINGER_POS_TARGET0    = (1135) # R/W
+ROH_FINGER_POS_TARGET1    = (1136) # R/W
+ROH_FINGER_POS_TARGET2    = (1137) # R/W
+ROH_FINGER_POS_TARGET3    = (1138) # R/W
+ROH_FINGER_POS_TARGET4    = (1139) # R/W
+ROH_FINGER_POS_TARGET5    = (1140) # R/W
+ROH_FINGER_POS_TARGET6    = (1141) # R/W
+ROH_FINGER_POS_TARGET7    = (1142) # R/W
+ROH_FINGER_POS_TARGET8    = (1143) # R/W
+ROH_FINGER_POS_TARGET9    = (1144) # R/W
+ROH_FINGER_POS0           = (1145) # R
+ROH_FINGER_POS1           = (1146) # R
+ROH_FINGER_POS2           = (1147) # R
+ROH_FINGER_POS3           = (1148) # R
+ROH_FINGER_POS4           = (1149) # R
+ROH_FINGER_POS5           = (1150) # R
+ROH_FINGER_POS6           = (1151) # R
+ROH_FINGER_POS7           = (1152) # R
+ROH_FINGER_POS8           = (1153) # R
+ROH_FINGER_POS9           = (1154) # R
+ROH_FINGER_ANGLE_TARGET0  = (1155) # R/W
+ROH_FINGER_ANGLE_TARGET1  = (1156) # R/W
+ROH_FINGER_ANGLE_TARGET2  = (1157) # R/W
+ROH_FINGER_ANGLE_TARGET3  = (1158) # R/W
+ROH_FINGER_ANGLE_TARGET4  = (1159) # R/W
+ROH_FINGER_ANGLE_TARGET5  = (1160) # R/W
+ROH_FINGER_ANGLE_TARGET6  = (1161) # R/W
+ROH_FINGER_ANGLE_TARGET7  = (1162) # R/W
+ROH_FINGER_ANGLE_TARGET8  = (1163) # R/W
+ROH_FINGER_ANGLE_TARGET9  = (1164) # R/W
+ROH_FINGER_ANGLE0         = (1165) # R
+ROH_FINGER_ANGLE1         = (1166) # R
+ROH_FINGER_ANGLE2         = (1167) # R
+ROH_FINGER_ANGLE3         = (1168) # R
+ROH_FINGER_ANGLE4         = (1169) # R
+ROH_FINGER_ANGLE5         = (1170) # R
+ROH_FINGER_ANGLE6         = (1171) # R
+ROH_FINGER_ANGLE7         = (1172) # R
+ROH_FINGER_ANGLE8         = (1173) # R
+ROH_FINGER_ANGLE9         = (1174) # R
+
+UINT16_MAX = 65535
+
+
+class RegisterSpec:
+    """
+    可写寄存器的声明式描述，测试用例由它自动生成。
+
+    name：寄存器名称，用于生成测试方法名 test_write_<name> 和打印信息，例如 finger_p0。
+    address：寄存器地址。
+    access：'RW' 可读可写；'W' 只写，写入后无法读回校验。
+    valid_range：(最小值, 最大值)，两个边界值自动作为合法用例，边界外一位自动作为非法用例。
+    default：设备默认值，用例结束后恢复。
+    tolerance：读回值与写入值之间允许的最大误差。
+    nominal_values：边界值之外额外测试的合法取值。
+    invalid_values：非法取值，为None时根据 valid_range 自动生成。
+    skip_values：{取值: 跳过原因}，暂时无法测试的取值。
+    """
+    def __init__(self, name, address, access, valid_range, default, tolerance=0, nominal_values=(), invalid_values=None, skip_values=None):
+        self.name = name
+        self.address = address
+        self.access = access
+        self.valid_range = valid_range
+        self.default = default
+        self.tolerance = tolerance
+        self.nominal_values = tuple(nominal_values)
+        self.invalid_values = invalid_values
+        self.skip_values = skip_values or {}
+
+    @property
+    def readable(self):
+        return 'R' in self.access
+
+    @property
+    def label(self):
+        return self.name.replace('_', ' ')
+
+    def cases(self):
+        """
+        生成该寄存器的全部用例。
+
+        先写非法值（设备应拒绝，寄存器保持原值），再按从小到大写合法值，默认值放在最后，
+        这样大多数寄存器在最后一个用例结束时已经处于默认值，不需要额外的恢复写入。
+
+        返回：
+        (取值, 是否应被设备接受, 跳过原因或None) 组成的列表。
+        """
+        minimum, maximum = self.valid_range
+        if self.invalid_values is None:
+            invalid_values = [value for value in (minimum - 1, maximum + 1) if 0 <= value <= UINT16_MAX]
+        else:
+            invalid_values = list(self.invalid_values)
+        valid_values = sorted({minimum, maximum, *self.nominal_values})
+        valid_values.sort(key=lambda value: value == self.default)
+
+        cases = []
+        for accepted, values in ((False, invalid_values), (True, valid_values)):
+            for value in values:
+                skip_reason = self.skip_values.get(value)
+                if skip_reason is not None:
+                    skip_reason = f'ROH_{self.name.upper()} {skip_reason}'
+                cases.append((value, accepted, skip_reason))
+        return cases
+
+
+def finger_register_specs(name, first_address, defaults, valid_range, **kwargs):
+    """
+    为各手指地址连续的同类寄存器生成 RegisterSpec 列表，name 中的 {} 替换为手指序号。
+    """
+    return [RegisterSpec(name.format(i), first_address + i, 'RW', valid_range, default, **kwargs) for i, default in enumerate(defaults)]
+
+
+MAX_READ_COUNT = 125 # FC03 单次最多读取的寄存器个数
+MAX_WRITE_COUNT = 123 # FC16 单次最多写入的寄存器个数
+
+
+def plan_block_reads(start=ROH_PROTOCOL_VERSION, end=ROH_FINGER_ANGLE9, max_count=MAX_READ_COUNT):
+    """
+    把连续地址范围 [start, end] 拆分成最少次数的 FC03 读请求。
+
+    返回：
+    (起始地址, 寄存器个数) 组成的列表。
+    """
+    blocks = []
+    address = start
+    while address <= end:
+        count = min(max_count, end - address + 1)
+        blocks.append((address, count))
+        address += count
+    return blocks
+
+
+def plan_block_writes(values, max_count=MAX_WRITE_COUNT):
+    """
+    把 {地址: 值} 按连续地址合并成最少次数的 FC16 写请求。
+
+    返回：
+    (起始地址, 值列表) 组成的列表，按地址从小到大排列。
+    """
+    blocks = []
+    for address in sorted(values):
+        if blocks:
+            start, block = blocks[-1]
+            if start + len(block) == address and len(block) < max_count:
+                block.append(values[address])
+                continue
+        blocks.append((address, [values[address]]))
+    return blocks
+
+
+class RegisterSnapshot:
+    """
+    某一时刻读取到的一段连续寄存器的值。
+
+    数据保存在 array('H') 中，直接用 ROH_* 地址访问，例如 snapshot[ROH_FINGER_POS0]、snapshot.get(ROH_FINGER_CURRENT0, 6)。
+    """
+
+    def __init__(self, start, values):
+        self.start = start
+        self.values = array('H', values)
+        self.timestamp = time.time()
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, address):
+        return self.start <= address < self.start + len(self.values)
+
+    def __getitem__(self, address):
+        if address not in self:
+            raise KeyError(f'寄存器地址 {address} 不在快照范围内')
+        return self.values[address - self.start]
+
+    def get(self, address, count=1):
+        """
+        返回从 address 开始的 count 个寄存器值列表。
+        """
+        if address not in self or address + count - 1 not in self:
+            raise KeyError(f'寄存器地址 {address}~{address + count - 1} 不在快照范围内')
+        offset = address - self.start
+        return self.values[offset:offset + count].tolist()
+
+
+class FingerStatusGetter:
+    STATUS_OPENING = 0x0
+    STATUS_CLOSING = 0X1
+    STATUS_POS_REACHED = 0X2
+    STATUS_OVER_CURRENT = 0X3
+    STATUS_FORCE_REACHED = 0X4
+    STATUS_STUCK = 0X5
+
+    roh_finger_status_list = {
+        STATUS_OPENING: '正在展开',
+        STATUS_CLOSING: '正在抓取',
+        STATUS_POS_REACHED: '位置到位停止',
+        STATUS_OVER_CURRENT: '电流保护停止',
+        STATUS_FORCE_REACHED: '力控到位停止',
+        STATUS_STUCK: '电机堵转停止'
+    }
+
+    def get_finger_status(self, response):
+        """
+        根据传入的响应获取手指状态描述。
+
+        参数：
+        response：包含手指状态寄存器值的响应对象。
+
+        返回：
+        手指状态的描述字符串。
+        """
+        if not hasattr(response, 'registers'):
+            return '无效的响应对象，无法获取手指状态'
+        register_value = response.registers[0] if len(response.registers) > 0 else None
+        if register_value is None:
+            return '响应中没有有效的手指状态寄存器值'
+        return self.roh_finger_status_list.get(register_value, '未知的手指状态')
@@ -0,0 +1,433 @@
+## ROH 灵巧手模拟器：在 Linux 伪终端上实现 Modbus-RTU 从站，没有实物时也能运行各测试脚本和性能测试
+import argparse
+import heapq
+import logging
+import os
+import random
+import select
+import sys
+import threading
+import time
+import tty
+from array import array
+
+from modbus_test_v2 import (
+    BEEP_PERIOD, BEEP_SWITCH, REGISTER_SPECS, RESTORE_DEFAULTS, SELF_TEST_LEVEL, UINT16_MAX,
+    FingerStatusGetter, ModbusClient,
+    ROH_PROTOCOL_VERSION, ROH_FW_VERSION, ROH_FW_REVISION, ROH_HW_VERSION, ROH_BOOT_VERSION, ROH_NODE_ID,
+    ROH_SUB_EXCEPTION, ROH_BATTERY_VOLTAGE, ROH_SELF_TEST_LEVEL, ROH_BEEP_SWITCH, ROH_BEEP_PERIOD,
+    ROH_RECALIBRATE, ROH_START_INIT, ROH_RESET, ROH_POWER_OFF,
+    ROH_FINGER_STATUS0, ROH_FINGER_CURRENT_LIMIT0, ROH_FINGER_CURRENT0, ROH_FINGER_FORCE0,
+    ROH_FINGER_SPEED0, ROH_FINGER_POS_TARGET0, ROH_FINGER_POS0, ROH_FINGER_ANGLE_TARGET0, ROH_FINGER_ANGLE0,
+    ROH_FINGER_ANGLE9,
+)
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+FINGER_COUNT = 6
+
+FC_READ_HOLDING_REGISTERS = 0x03
+FC_WRITE_SINGLE_REGISTER = 0x06
+FC_WRITE_MULTIPLE_REGISTERS = 0x10
+
+# 只读寄存器，写入时返回无效地址
+READ_ONLY_REGISTERS = (
+    {ROH_PROTOCOL_VERSION, ROH_FW_VERSION, ROH_FW_REVISION, ROH_HW_VERSION, ROH_BOOT_VERSION, ROH_SUB_EXCEPTION, ROH_BATTERY_VOLTAGE}
+    | set(range(ROH_FINGER_STATUS0, ROH_FINGER_STATUS0 + 10))
+    | set(range(ROH_FINGER_CURRENT0, ROH_FINGER_CURRENT0 + 10))
+    | set(range(ROH_FINGER_FORCE0, ROH_FINGER_FORCE0 + 5))
+    | set(range(ROH_FINGER_POS0, ROH_FINGER_POS0 + 10))
+    | set(range(ROH_FINGER_ANGLE0, ROH_FINGER_ANGLE9 + 1))
+)
+
+# 各手指角度范围（单位 0.01 度），位置 0 对应最大角度（展开），位置 65535 对应最小角度（弯曲）
+ANGLE_LIMITS = [(226, 3667), (10022, 17837), (9781, 17606), (10138, 17654), (9884, 17486), (0, 9000)]
+
+MOVING_CURRENT = 150 # 运动中的电机电流（mA）
+IDLE_CURRENT = 10 # 静止时的电机电流（mA）
+
+
+def crc16(data):
+    """
+    计算 Modbus-RTU CRC16，返回值低字节在前即可直接拼接到帧尾。
+    """
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+    return crc
+
+
+def append_crc(frame):
+    crc = crc16(frame)
+    return bytes(frame) + bytes([crc & 0xFF, crc >> 8])
+
+
+def expected_frame_length(buffer):
+    """
+    根据功能码计算请求帧长度，数据不够判断时返回None。
+    """
+    if len(buffer) < 2:
+        return None
+    function_code = buffer[1]
+    if function_code in (FC_READ_HOLDING_REGISTERS, FC_WRITE_SINGLE_REGISTER):
+        return 8
+    if function_code == FC_WRITE_MULTIPLE_REGISTERS:
+        if len(buffer) < 7:
+            return None
+        return 9 + buffer[6]
+    return 0
+
+
+class SimulatedHand:
+    """
+    一只 ROH 灵巧手的寄存器和运动模型。
+
+    手指位置按 ROH_FINGER_SPEED 匀速向目标位置运动，运动中电流为 MOVING_CURRENT，超过电流限制时停止并报告电流保护；
+    写入非法值时返回设备故障并在 ROH_SUB_EXCEPTION 中给出具体原因；修改节点ID、复位等操作会让设备在 reboot_delay 内不应答。
+    """
+    def __init__(self, node_id=2, reboot_delay=0.5, response_delay=0.0):
+        self.node_id = node_id
+        self.reboot_delay = reboot_delay
+        self.response_delay = response_delay
+        self.registers = array('H', [0] * (ROH_FINGER_ANGLE9 - ROH_PROTOCOL_VERSION + 1))
+        self.valid_ranges = {spec.address: spec.valid_range for spec in REGISTER_SPECS}
+        self.ready_time = 0.0
+        self.powered = True
+        self.pending_node_id = None
+        self.positions = [0.0] * FINGER_COUNT
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+        self.reset_registers()
+
+    def reset_registers(self):
+        for index in range(len(self.registers)):
+            self.registers[index] = 0
+        self.set(ROH_PROTOCOL_VERSION, 0x0100)
+        self.set(ROH_FW_VERSION, 0x0300)
+        self.set(ROH_FW_REVISION, 130)
+        self.set(ROH_HW_VERSION, 0x1B01)
+        self.set(ROH_BOOT_VERSION, 0x0107)
+        self.set(ROH_NODE_ID, self.node_id)
+        self.set(ROH_BATTERY_VOLTAGE, 12000)
+        self.set(ROH_SELF_TEST_LEVEL, SELF_TEST_LEVEL)
+        self.set(ROH_BEEP_SWITCH, BEEP_SWITCH)
+        self.set(ROH_BEEP_PERIOD, BEEP_PERIOD)
+        for address, default in RESTORE_DEFAULTS.items():
+            minimum, maximum = self.valid_ranges.get(address, (0, UINT16_MAX))
+            self.set(address, min(max(default, minimum), maximum))
+        for finger in range(FINGER_COUNT):
+            position = int(self.positions[finger])
+            self.set(ROH_FINGER_POS_TARGET0 + finger, position)
+            self.set(ROH_FINGER_ANGLE_TARGET0 + finger, self.position_to_angle(finger, position))
+        self.update_motion()
+
+    def get(self, address):
+        return self.registers[address - ROH_PROTOCOL_VERSION]
+
+    def set(self, address, value):
+        self.registers[address - ROH_PROTOCOL_VERSION] = value & 0xFFFF
+
+    def responding(self):
+        return self.powered and time.monotonic() >= self.ready_time
+
+    def reboot(self):
+        """
+        模拟重启：reboot_delay 内不应答，重启后使用新的节点ID并停止所有运动。
+        """
+        if self.pending_node_id is not None:
+            self.node_id = self.pending_node_id
+            self.pending_node_id = None
+        self.ready_time = time.monotonic() + self.reboot_delay
+        self.reset_registers()
+        logger.info(f'[node_id = {self.node_id}]模拟设备重启，{self.reboot_delay}s 后恢复应答')
+
+    def angle_to_position(self, finger, angle):
+        minimum, maximum = ANGLE_LIMITS[finger]
+        return int((maximum - angle) * UINT16_MAX / (maximum - minimum))
+
+    def position_to_angle(self, finger, position):
+        minimum, maximum = ANGLE_LIMITS[finger]
+        return int(round(maximum - position * (maximum - minimum) / UINT16_MAX))
+
+    def update_motion(self):
+        """
+        按上次更新以来经过的时间推进各手指位置，并刷新状态、电流、位置和角度寄存器。
+        """
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        for finger in range(FINGER_COUNT):
+            target = self.get(ROH_FINGER_POS_TARGET0 + finger)
+            position = self.positions[finger]
+            status = self.get(ROH_FINGER_STATUS0 + finger)
+            current = IDLE_CURRENT
+            if position != target and status != FingerStatusGetter.STATUS_OVER_CURRENT:
+                if self.get(ROH_FINGER_CURRENT_LIMIT0 + finger) < MOVING_CURRENT:
+                    status = FingerStatusGetter.STATUS_OVER_CURRENT
+                else:
+                    step = self.get(ROH_FINGER_SPEED0 + finger) * elapsed
+                    if abs(target - position) <= step:
+                        position = float(target)
+                        status = FingerStatusGetter.STATUS_POS_REACHED
+                    else:
+                        position += step if target > position else -step
+                        status = FingerStatusGetter.STATUS_CLOSING if target > position else FingerStatusGetter.STATUS_OPENING
+                        current = MOVING_CURRENT + random.randint(-20, 20)
+            elif position == target:
+                status = FingerStatusGetter.STATUS_POS_REACHED
+            self.positions[finger] = position
+            self.set(ROH_FINGER_STATUS0 + finger, status)
+            self.set(ROH_FINGER_CURRENT0 + finger, current)
+            self.set(ROH_FINGER_POS0 + finger, int(position))
+            self.set(ROH_FINGER_ANGLE0 + finger, self.position_to_angle(finger, position))
+
+    def check_write(self, address, value):
+        """
+        检查一次写入是否合法，返回 (异常码, 子异常码)，合法时返回 (None, None)。
+        """
+        if not ROH_PROTOCOL_VERSION <= address <= ROH_FINGER_ANGLE9 or address in READ_ONLY_REGISTERS:
+            return ModbusClient.EC02_ILLEGAL_DATA_ADDRESS, None
+        valid_range = self.valid_ranges.get(address)
+        if valid_range is not None and not valid_range[0] <= value <= valid_range[1]:
+            return ModbusClient.EC04_SERVER_DEVICE_FAILURE, ModbusClient.ERR_INVALID_DATA
+        if address == ROH_NODE_ID and not 1 <= value <= 247:
+            return ModbusClient.EC04_SERVER_DEVICE_FAILURE, ModbusClient.ERR_INVALID_DATA
+        return None, None
+
+    def write(self, address, value):
+        """
+        写入一个已检查过的寄存器，返回写入后是否需要重启。
+        """
+        if ROH_FINGER_ANGLE_TARGET0 <= address < ROH_FINGER_ANGLE_TARGET0 + FINGER_COUNT:
+            # 角度按 int16 处理，超出范围的值取边界，大于 32767 的值相当于负数，取最小值
+            finger = address - ROH_FINGER_ANGLE_TARGET0
+            minimum, maximum = ANGLE_LIMITS[finger]
+            angle = value - 0x10000 if value > 32767 else value
+            angle = min(max(angle, minimum), maximum)
+            self.set(address, angle)
+            self.set(ROH_FINGER_POS_TARGET0 + finger, self.angle_to_position(finger, angle))
+            self.set(ROH_FINGER_STATUS0 + finger, FingerStatusGetter.STATUS_CLOSING)
+            return False
+        self.set(address, value)
+        if ROH_FINGER_POS_TARGET0 <= address < ROH_FINGER_POS_TARGET0 + FINGER_COUNT:
+            finger = address - ROH_FINGER_POS_TARGET0
+            self.set(ROH_FINGER_ANGLE_TARGET0 + finger, self.position_to_angle(finger, value))
+            # 新的目标位置解除上一次的电流保护状态
+            self.set(ROH_FINGER_STATUS0 + finger, FingerStatusGetter.STATUS_CLOSING)
+            return False
+        if address == ROH_NODE_ID:
+            self.pending_node_id = value
+            return True
+        if address == ROH_POWER_OFF:
+            self.powered = False
+            return False
+        return address in (ROH_RESET, ROH_START_INIT, ROH_RECALIBRATE)
+
+    def exception_response(self, function_code, exception_code, sub_exception=None):
+        if sub_exception is not None:
+            self.set(ROH_SUB_EXCEPTION, sub_exception)
+        return bytes([self.node_id, function_code | 0x80, exception_code])
+
+    def handle_request(self, frame):
+        """
+        处理一帧完整的 RTU 请求，返回应答帧；不是发给本设备、校验错误或设备不应答时返回None。
+        应答立即生成，response_delay 由 SimulatorServer 在发送时计入，不阻塞其他手。
+        """
+        if len(frame) < 4 or crc16(frame[:-2]) != frame[-2] | (frame[-1] << 8):
+            return None
+        with self._lock:
+            if not self.responding() or frame[0] != self.node_id:
+                return None
+            self.update_motion()
+            response, need_reboot = self.dispatch(frame[1], frame[2:-2])
+            if need_reboot:
+                self.reboot()
+        return append_crc(response)
+
+    def dispatch(self, function_code, data):
+        if function_code == FC_READ_HOLDING_REGISTERS:
+            address = int.from_bytes(data[0:2], 'big')
+            count = int.from_bytes(data[2:4], 'big')
+            if not 1 <= count <= 125:
+                return self.exception_response(function_code, ModbusClient.EC03_ILLEGAL_DATA_VALUE), False
+            if address < ROH_PROTOCOL_VERSION or address + count - 1 > ROH_FINGER_ANGLE9:
+                return self.exception_response(function_code, ModbusClient.EC02_ILLEGAL_DATA_ADDRESS), False
+            offset = address - ROH_PROTOCOL_VERSION
+            values = self.registers[offset:offset + count]
+            if sys.byteorder == 'little':
+                values.byteswap()
+            return bytes([self.node_id, function_code, count * 2]) + values.tobytes(), False
+
+        if function_code == FC_WRITE_SINGLE_REGISTER:
+            address = int.from_bytes(data[0:2], 'big')
+            values = [int.from_bytes(data[2:4], 'big')]
+        elif function_code == FC_WRITE_MULTIPLE_REGISTERS:
+            address = int.from_bytes(data[0:2], 'big')
+            count = int.from_bytes(data[2:4], 'big')
+            payload = data[5:]
+            if not 1 <= count <= 123 or data[4] != count * 2 or len(payload) != count * 2:
+                return self.exception_response(function_code, ModbusClient.EC03_ILLEGAL_DATA_VALUE), False
+            values = [int.from_bytes(payload[i:i + 2], 'big') for i in range(0, len(payload), 2)]
+        else:
+            return self.exception_response(function_code, ModbusClient.EC01_ILLEGAL_FUNCTION), False
+
+        # 先检查全部寄存器，任意一个非法则整帧不写入
+        for offset, value in enumerate(values):
+            exception_code, sub_exception = self.check_write(address + offset, value)
+            if exception_code is not None:
+                return self.exception_response(function_code, exception_code, sub_exception), False
+        need_reboot = False
+        for offset, value in enumerate(values):
+            need_reboot = self.write(address + offset, value) or need_reboot
+        # FC06 回显地址和值，FC16 回显地址和寄存器个数，正好都是请求数据的前 4 个字节
+        return bytes([self.node_id, function_code]) + data[0:4], need_reboot
+
+
+class SimulatorServer:
+    """
+    在后台线程中为多只模拟手提供伪终端，每只手一个 /dev/pts/N，可以直接作为端口号传给各测试脚本。
+
+    所有手共用一个 select 线程，有 response_delay 的应答按 (发送时间, 序号, fd, 应答) 放入最小堆，到时间再写出，
+    一只手的处理时间不会让其他手的应答排队等待，多只手的吞吐量与各自独立的串口一致。
+
+    用法：
+    with SimulatorServer() as server:
+        ports = [server.add_hand() for _ in range(16)]
+        modbus_test_v2.main(ports)
+    """
+    def __init__(self):
+        self.hands = {} # master fd -> (SimulatedHand, 接收缓冲区)
+        self.ports = {} # 伪终端路径 -> SimulatedHand
+        self._slave_fds = []
+        self._pending = [] # 延迟发送的应答，最小堆
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+        self._wakeup_read, self._wakeup_write = os.pipe()
+
+    def add_hand(self, node_id=2, reboot_delay=0.5, response_delay=0.0):
+        """
+        创建一只模拟手并返回它的伪终端路径。
+        """
+        master_fd, slave_fd = os.openpty()
+        tty.setraw(slave_fd)
+        path = os.ttyname(slave_fd)
+        hand = SimulatedHand(node_id=node_id, reboot_delay=reboot_delay, response_delay=response_delay)
+        with self._lock:
+            self.hands[master_fd] = (hand, bytearray())
+            self.ports[path] = hand
+            # 保持从端打开，客户端断开重连时主端不会读到 EIO
+            self._slave_fds.append(slave_fd)
+        os.write(self._wakeup_write, b'\0')
+        return path
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self.serve, name='roh-simulator', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        os.write(self._wakeup_write, b'\0')
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        with self._lock:
+            fds = list(self.hands) + self._slave_fds
+            self.hands.clear()
+            self.ports.clear()
+            self._slave_fds.clear()
+        for fd in fds + [self._wakeup_read, self._wakeup_write]:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def serve(self):
+        while self._running:
+            with self._lock:
+                fds = list(self.hands)
+            timeout = 0.5
+            if self._pending:
+                timeout = min(timeout, max(0.0, self._pending[0][0] - time.monotonic()))
+            readable, _, _ = select.select(fds + [self._wakeup_read], [], [], timeout)
+            self.send_due_responses()
+            for fd in readable:
+                if fd == self._wakeup_read:
+                    os.read(fd, 1024)
+                    continue
+                try:
+                    data = os.read(fd, 4096)
+                except OSError:
+                    continue
+                hand, buffer = self.hands[fd]
+                buffer.extend(data)
+                self.process_buffer(fd, hand, buffer)
+
+    def process_buffer(self, fd, hand, buffer):
+        while True:
+            length = expected_frame_length(buffer)
+            if length is None or len(buffer) < length:
+                return
+            if length == 0:
+                # 不认识的功能码无法确定帧长，丢弃缓冲区等待下一帧
+                buffer.clear()
+                return
+            frame = bytes(buffer[:length])
+            del buffer[:length]
+            response = hand.handle_request(frame)
+            if response is None:
+                continue
+            if hand.response_delay > 0:
+                self._sequence += 1
+                heapq.heappush(self._pending, (time.monotonic() + hand.response_delay, self._sequence, fd, response))
+            else:
+                os.write(fd, response)
+
+    def send_due_responses(self):
+        now = time.monotonic()
+        while self._pending and self._pending[0][0] <= now:
+            _, _, fd, response = heapq.heappop(self._pending)
+            try:
+                os.write(fd, response)
+            except OSError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ROH 灵巧手 Modbus-RTU 模拟器')
+    parser.add_argument('-n', '--count', type=int, default=1, help='模拟手的数量')
+    parser.add_argument('--node-id', type=int, default=2, help='设备ID')
+    parser.add_argument('--reboot-delay', type=float, default=0.5, help='模拟重启耗时（秒）')
+    parser.add_argument('--response-delay', type=float, default=0.0, help='每次应答前的处理时间（秒）')
+    args = parser.parse_args()
+
+    with SimulatorServer() as server:
+        for _ in range(args.count):
+            path = server.add_hand(node_id=args.node_id, reboot_delay=args.reboot_delay, response_delay=args.response_delay)
+            logger.info(f'模拟设备已启动: {path}')
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logger.info('模拟器已停止')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+## 长时间老化测试的检查点：定期把运行状态原子地写入一个小 JSON 文件，程序意外退出后可以从中恢复
+import datetime
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from telemetry_store import write_json_atomic
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+CHECKPOINT_DIR = 'checkpoints'
+CHECKPOINT_VERSION = 1
+
+
+class RunCheckpoint:
+    """
+    一个检查点文件。
+
+    save() 先写临时文件、fsync 后用 os.replace 替换，任何时刻磁盘上都是一份完整的检查点；
+    save_if_due() 距上次保存不足 interval 秒时直接返回，可以在每轮结束时调用。
+    """
+    def __init__(self, path, interval=60.0):
+        self.path = path
+        self.interval = interval
+        self._last_save = None
+        self._lock = threading.Lock() # 多个端口的工作线程都会调用 save_if_due
+
+    def load(self):
+        """
+        读取检查点，文件不存在、损坏或版本不符时返回None。
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f'读取检查点 {self.path} 失败: {e}')
+            return None
+        if state.get('version') != CHECKPOINT_VERSION:
+            logger.error(f'检查点 {self.path} 版本不符，忽略')
+            return None
+        return state
+
+    def save(self, state):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = dict(state, version=CHECKPOINT_VERSION, saved_at=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        with self._lock:
+            write_json_atomic(self.path, state)
+            self._last_save = time.monotonic()
+
+    def save_if_due(self, build_state):
+        """
+        到了保存间隔时调用 build_state() 生成状态并保存，返回是否保存。
+        """
+        with self._lock:
+            if self._last_save is not None and time.monotonic() - self._last_save < self.interval:
+                return False
+            # 先占住这次保存，其他线程不会同时生成状态
+            self._last_save = time.monotonic()
+        self.save(build_state())
+        return True
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,201 @@
+## 动作过程中的后台遥测采样：按固定频率一次块读状态、电流、位置，写入定长环形缓冲区
+from array import array
+import logging
+import sys
+import threading
+import time
+
+from roh_registers import FingerStatusGetter, ROH_FINGER_CURRENT0, ROH_FINGER_POS0, ROH_FINGER_STATUS0
+from telemetry_store import FINGER_COUNT, SOURCE_MOTION, telemetry
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+# 一次块读 ROH_FINGER_STATUS0(1085) ~ ROH_FINGER_POS5(1150)
+SAMPLE_ADDRESS = ROH_FINGER_STATUS0
+SAMPLE_COUNT = ROH_FINGER_POS0 + FINGER_COUNT - ROH_FINGER_STATUS0
+STATUS_OFFSET = 0
+CURRENT_OFFSET = ROH_FINGER_CURRENT0 - SAMPLE_ADDRESS
+POSITION_OFFSET = ROH_FINGER_POS0 - SAMPLE_ADDRESS
+SAMPLE_WIDTH = FINGER_COUNT * 3 # 每行依次为 6 个状态、6 个电流、6 个位置
+
+
+class RingBuffer:
+    """
+    定长环形缓冲区，每行一个时间戳和 width 个 uint16 值，写满后覆盖最旧的数据，内存占用固定。
+
+    数据保存在 array('H') 中，可用 numpy.frombuffer 零拷贝转换。
+    """
+    def __init__(self, capacity, width=SAMPLE_WIDTH):
+        self.capacity = capacity
+        self.width = width
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.values = array('H', bytes(2 * capacity * width))
+        self.head = 0 # 下一行写入的位置
+        self.size = 0
+        self.total = 0 # 累计写入的行数，用于判断某一行是否已被覆盖
+
+    def append(self, timestamp, row):
+        start = self.head * self.width
+        self.timestamps[self.head] = timestamp
+        self.values[start:start + self.width] = array('H', row)
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.total += 1
+
+    def latest(self):
+        """
+        返回最新一行 (时间戳, 值列表)，缓冲区为空时返回None。
+        """
+        if self.size == 0:
+            return None
+        index = (self.head - 1) % self.capacity
+        return self.timestamps[index], self.values[index * self.width:(index + 1) * self.width].tolist()
+
+    def rows(self, since=None):
+        """
+        按时间顺序返回 (时间戳列表, 值行列表)，since 不为None时只返回该时间之后的行。
+        """
+        first = (self.head - self.size) % self.capacity
+        timestamps = []
+        rows = []
+        for i in range(self.size):
+            index = (first + i) % self.capacity
+            if since is not None and self.timestamps[index] < since:
+                continue
+            timestamps.append(self.timestamps[index])
+            rows.append(self.values[index * self.width:(index + 1) * self.width].tolist())
+        return timestamps, rows
+
+    def clear(self):
+        self.head = 0
+        self.size = 0
+        self.total = 0
+
+
+class SampledResponse:
+    """
+    用采样数据模拟 pymodbus 读响应，供 wait_motion_done 等只需要 isError()/registers 的函数使用。
+    """
+    def __init__(self, registers):
+        self.registers = registers
+
+    def isError(self):
+        return False
+
+
+class TelemetrySampler:
+    """
+    单个端口的后台采样线程。
+
+    begin_motion() 之后按 rate 次/秒一次块读 SAMPLE_ADDRESS 开始的 SAMPLE_COUNT 个寄存器，写入环形缓冲区和遥测存储，
+    end_motion() 后暂停。读寄存器时持有 lock，与手势路径共用同一个串口连接。动作期间 read_statuses 直接返回
+    最新的采样状态，等待动作完成不再单独读 ROH_FINGER_STATUS0~5；目标写入成功后调用 mark_written()，
+    之前发出的采样仍是上一个动作停下时的状态，read_statuses 不会返回。
+
+    peak_currents：本次动作各手指的电流峰值。
+    stall_events：[(时间戳, 手指序号)]，本次动作中出现堵转状态的手指。
+    """
+    def __init__(self, port, read_from_register, lock, rate=50, capacity=1024):
+        self.port = port
+        self.read_from_register = read_from_register
+        self.lock = lock
+        self.interval = 1.0 / rate
+        self.buffer = RingBuffer(capacity)
+        self.peak_currents = [0] * FINGER_COUNT
+        self.stall_events = []
+        self.motion_start = None
+        self.written_at = None # 最近一次目标写入成功的时间
+        self._buffer_lock = threading.Lock()
+        self._sampling = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name=f'sampler-{self.port}', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._sampling.set() # 唤醒等待中的线程
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._sampling.clear()
+
+    def begin_motion(self):
+        with self._buffer_lock:
+            self.motion_start = time.time()
+            self.written_at = None
+            self.peak_currents = [0] * FINGER_COUNT
+            self.stall_events = []
+        self._sampling.set()
+
+    def mark_written(self):
+        """
+        目标位置已写入设备，之后发出的采样才反映本次动作的状态。
+        """
+        with self._buffer_lock:
+            self.written_at = time.time()
+
+    def end_motion(self):
+        self._sampling.clear()
+
+    def sample(self):
+        with self.lock:
+            # 时间戳取发出请求的时刻，与 mark_written() 比较时不会把写入之前发出的读当成新数据
+            timestamp = time.time()
+            response = self.read_from_register(SAMPLE_ADDRESS, SAMPLE_COUNT)
+        if response is None or response.isError():
+            return False
+        registers = response.registers
+        statuses = registers[STATUS_OFFSET:STATUS_OFFSET + FINGER_COUNT]
+        currents = registers[CURRENT_OFFSET:CURRENT_OFFSET + FINGER_COUNT]
+        positions = registers[POSITION_OFFSET:POSITION_OFFSET + FINGER_COUNT]
+        with self._buffer_lock:
+            self.buffer.append(timestamp, statuses + currents + positions)
+            self.peak_currents = [max(peak, current) for peak, current in zip(self.peak_currents, currents)]
+            for finger, status in enumerate(statuses):
+                if status == FingerStatusGetter.STATUS_STUCK and finger not in (event[1] for event in self.stall_events):
+                    self.stall_events.append((timestamp, finger))
+                    logger.error(f'[port = {self.port}]采样发现手指 {finger} 堵转，电流 {currents[finger]}mA\n')
+        telemetry.append(self.port, currents, positions, timestamp, SOURCE_MOTION)
+        return True
+
+    def run(self):
+        while not self._stop.is_set():
+            self._sampling.wait()
+            if self._stop.is_set():
+                break
+            next_time = time.monotonic() + self.interval
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f'[port = {self.port}]采样异常: {e}')
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+
+    def read_statuses(self, address=ROH_FINGER_STATUS0, count=FINGER_COUNT):
+        """
+        返回目标写入之后最新一次采样的状态（SampledResponse），还没有写入或还没有新的采样时返回None。
+        """
+        with self._buffer_lock:
+            latest = self.buffer.latest()
+            if latest is None or self.written_at is None or latest[0] < self.written_at:
+                return None
+        offset = address - ROH_FINGER_STATUS0
+        return SampledResponse(latest[1][offset:offset + count])
+
+    def motion_rows(self):
+        """
+        返回本次动作开始后的全部采样 (时间戳列表, 值行列表)，每行为 6 个状态、6 个电流、6 个位置。
+        """
+        with self._buffer_lock:
+            return self.buffer.rows(since=self.motion_start)
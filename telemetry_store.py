@@ -0,0 +1,256 @@
+## 老化测试遥测数据的列式存储：每列一个定宽二进制文件，可用 numpy.memmap 直接映射后切片查询
+from array import array
+import datetime
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# 设置日志级别为INFO，获取日志记录器实例
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+stream_handler = logging.StreamHandler(stream=sys.stdout)
+logger.addHandler(stream_handler)
+
+TELEMETRY_DIR = 'telemetry'
+META_FILE = 'meta.json'
+FINGER_COUNT = 6
+
+# 一次块读 ROH_FINGER_CURRENT0(1105) ~ ROH_FINGER_POS5(1150)，同时得到电流和位置
+TELEMETRY_BLOCK_ADDRESS = 1105
+TELEMETRY_BLOCK_COUNT = 46
+CURRENT_OFFSET = 0   # ROH_FINGER_CURRENT0 - TELEMETRY_BLOCK_ADDRESS
+POSITION_OFFSET = 40 # ROH_FINGER_POS0 - TELEMETRY_BLOCK_ADDRESS
+
+# 数据来源：静止时测电流的读数，或动作过程中后台采样的读数；同一轮两者都会记录，按 source 列区分
+SOURCE_HOLD = 0
+SOURCE_MOTION = 1
+SOURCES = {'hold': SOURCE_HOLD, 'motion': SOURCE_MOTION}
+
+# 列名: (array 类型码, numpy dtype, 每行元素个数)
+COLUMNS = {
+    'timestamp': ('d', '<f8', 1),
+    'port': ('H', '<u2', 1),
+    'cycle': ('I', '<u4', 1),
+    'source': ('B', '<u1', 1),
+    'currents': ('H', '<u2', FINGER_COUNT),
+    'positions': ('H', '<u2', FINGER_COUNT),
+}
+
+
+def write_json_atomic(path, data):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class TelemetryStore:
+    """
+    遥测数据写入端，每行为 (时间戳, 端口序号, 轮次, 来源, 6 个电流, 6 个位置)。
+
+    数据先缓存在 array 中，攒够 flush_rows 行或 stop() 时按列追加到各自的 .bin 文件，统一使用小端字节序；
+    端口名保存在 meta.json 的 ports 列表中，port 列只记录序号。未调用 start() 时 record() 什么也不做，
+    各测试脚本可以无条件调用。
+    """
+    def __init__(self, flush_rows=256):
+        self.flush_rows = flush_rows
+        self.path = None
+        self.ports = []
+        self._port_index = {}
+        self._cycles = {}
+        self._buffers = None
+        self._rows = 0
+        self._saved_rows = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.path is not None
+
+    @property
+    def saved_rows(self):
+        """
+        已写入 .bin 文件的行数，供检查点记录。
+        """
+        with self._lock:
+            return self._saved_rows
+
+    def start(self, name='telemetry', path=None, cycles=None, rows=None):
+        """
+        开始一次记录，path 为None时在 telemetry/ 下按名称和时间新建目录，返回目录路径。
+
+        path 指向已有目录时接着追加（用于从检查点恢复），沿用 meta.json 中的端口序号，cycles 为各端口已完成的轮数。
+        追加前各列文件先截断到相同的完整行数：rows 为检查点记录的行数，为None时取各列完整行数的最小值，
+        避免写入中途退出后各列行数不一致导致新数据错位。
+        """
+        if path is None:
+            path = os.path.join(TELEMETRY_DIR, f"{name}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        os.makedirs(path, exist_ok=True)
+        ports = []
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                ports = json.load(f)['ports']
+        with self._lock:
+            self.path = path
+            self.ports = ports
+            self._port_index = {port: index for index, port in enumerate(ports)}
+            self._cycles = dict(cycles or {})
+            self._buffers = {column: array(typecode) for column, (typecode, _, _) in COLUMNS.items()}
+            self._rows = 0
+            self._saved_rows = self._truncate_columns(rows)
+            self._write_meta()
+        logger.info(f'遥测数据保存到 {path}')
+        return path
+
+    def begin_cycle(self, port):
+        """
+        端口开始新的一轮测试，之后记录的数据都属于这一轮，返回轮次（从 1 开始）。
+        """
+        with self._lock:
+            cycle = self._cycles.get(port, 0) + 1
+            self._cycles[port] = cycle
+        return cycle
+
+    def record(self, port, registers, timestamp=None, source=SOURCE_HOLD):
+        """
+        记录一次从 TELEMETRY_BLOCK_ADDRESS 开始块读得到的寄存器值。
+        """
+        if not self.active or len(registers) < TELEMETRY_BLOCK_COUNT:
+            return
+        self.append(port, registers[CURRENT_OFFSET:CURRENT_OFFSET + FINGER_COUNT],
+                    registers[POSITION_OFFSET:POSITION_OFFSET + FINGER_COUNT], timestamp, source)
+
+    def append(self, port, currents, positions, timestamp=None, source=SOURCE_HOLD):
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            if not self.active:
+                return
+            index = self._port_index.get(port)
+            if index is None:
+                index = self._port_index[port] = len(self.ports)
+                self.ports.append(port)
+                self._write_meta()
+            self._buffers['timestamp'].append(timestamp)
+            self._buffers['port'].append(index)
+            self._buffers['cycle'].append(self._cycles.get(port, 0))
+            self._buffers['source'].append(source)
+            self._buffers['currents'].extend(currents)
+            self._buffers['positions'].extend(positions)
+            self._rows += 1
+            if self._rows >= self.flush_rows:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            if self.active:
+                self._flush()
+
+    def stop(self):
+        with self._lock:
+            if not self.active:
+                return
+            self._flush()
+            path = self.path
+            self.path = None
+        logger.info(f'遥测数据已保存到 {path}')
+
+    def _flush(self):
+        if self._rows == 0:
+            return
+        for column, buffer in self._buffers.items():
+            if sys.byteorder == 'big':
+                buffer.byteswap()
+            with open(os.path.join(self.path, f'{column}.bin'), 'ab') as f:
+                buffer.tofile(f)
+            del buffer[:]
+        self._saved_rows += self._rows
+        self._rows = 0
+
+    def _truncate_columns(self, rows):
+        sizes = {}
+        for column, (typecode, _, width) in COLUMNS.items():
+            file_path = os.path.join(self.path, f'{column}.bin')
+            row_size = array(typecode).itemsize * width
+            sizes[column] = (file_path, row_size, os.path.getsize(file_path) // row_size if os.path.exists(file_path) else 0)
+        complete_rows = min(file_rows for _, _, file_rows in sizes.values())
+        if rows is None or rows > complete_rows:
+            rows = complete_rows
+        for column, (file_path, row_size, file_rows) in sizes.items():
+            if os.path.exists(file_path) and os.path.getsize(file_path) != rows * row_size:
+                with open(file_path, 'r+b') as f:
+                    f.truncate(rows * row_size)
+                logger.info(f'遥测列 {column} 从 {file_rows} 行截断到 {rows} 行')
+        return rows
+
+    def _write_meta(self):
+        write_json_atomic(os.path.join(self.path, META_FILE), {
+            'columns': {column: {'dtype': dtype, 'width': width} for column, (_, dtype, width) in COLUMNS.items()},
+            'ports': list(self.ports),
+            'sources': SOURCES,
+        })
+
+
+class TelemetryReader:
+    """
+    用 numpy.memmap 打开一个遥测目录，各列为只读数组，不把数据整体读入内存。
+
+    行数取各列文件中完整行数的最小值，写入过程中意外中断留下的半行会被忽略。
+    """
+    def __init__(self, path):
+        import numpy as np
+
+        self.path = path
+        with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.ports = meta['ports']
+        self.columns = {}
+        sizes = {}
+        for column, info in meta['columns'].items():
+            dtype = np.dtype(info['dtype'])
+            file_path = os.path.join(path, f'{column}.bin')
+            sizes[column] = os.path.getsize(file_path) // (dtype.itemsize * info['width']) if os.path.exists(file_path) else 0
+        self.rows = min(sizes.values())
+        for column, info in meta['columns'].items():
+            if self.rows == 0:
+                data = np.zeros((0, info['width']), dtype=info['dtype'])
+            else:
+                data = np.memmap(os.path.join(path, f'{column}.bin'), dtype=info['dtype'], mode='r', shape=(self.rows, info['width']))
+            self.columns[column] = data[:, 0] if info['width'] == 1 else data
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def select(self, port=None, start_time=None, end_time=None, source=None):
+        """
+        按端口、时间范围和来源筛选，返回 {列名: 数组}；只有筛选条件本身会读取 port/timestamp/source 列。
+
+        source 为 'hold' 或 'motion'，为None时两种来源都返回。
+        """
+        import numpy as np
+
+        mask = np.ones(self.rows, dtype=bool)
+        if port is not None:
+            if port not in self.ports:
+                mask[:] = False
+            else:
+                mask &= self.columns['port'] == self.ports.index(port)
+        if start_time is not None:
+            mask &= self.columns['timestamp'] >= start_time
+        if end_time is not None:
+            mask &= self.columns['timestamp'] < end_time
+        if source is not None:
+            mask &= self.columns['source'] == SOURCES[source]
+        return {column: data[mask] for column, data in self.columns.items()}
+
+
+telemetry = TelemetryStore()
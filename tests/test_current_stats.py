@@ -0,0 +1,85 @@
+## current_stats 中缺失采样（None/NaN）处理和环形缓冲区统计的单元测试
+import math
+import unittest
+import warnings
+
+import numpy as np
+
+from current_stats import current_statistics, rolling_statistics, to_sample_array
+from telemetry_sampler import RingBuffer
+
+
+class CurrentStatisticsTest(unittest.TestCase):
+    def test_basic_statistics(self):
+        stats = current_statistics([[1, 2, 3, 4, 5, 6], [3, 4, 5, 6, 7, 8]])
+        self.assertTrue(stats.valid)
+        self.assertEqual(stats.count.tolist(), [2] * 6)
+        self.assertEqual(stats.to_list('mean'), [2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+        self.assertEqual(stats.to_list('min'), [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        self.assertEqual(stats.to_list('max'), [3.0, 4.0, 5.0, 6.0, 7.0, 8.0])
+        self.assertEqual(stats.to_list('std'), [1.0] * 6)
+        self.assertEqual(stats.to_list(50), [2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+
+    def test_failed_reads_are_skipped(self):
+        stats = current_statistics([[10] * 6, None, [20] * 6, [1, 2]])
+        self.assertEqual(stats.count.tolist(), [2] * 6)
+        self.assertEqual(stats.to_list('mean'), [15.0] * 6)
+
+    def test_nan_in_single_column(self):
+        samples = np.array([[1, 2, 3, 4, 5, 6], [3, np.nan, 5, 6, 7, 8]], dtype=float)
+        stats = current_statistics(samples)
+        self.assertEqual(stats.count.tolist(), [2, 1, 2, 2, 2, 2])
+        self.assertEqual(stats.to_list('mean')[1], 2.0)
+
+    def test_all_missing_is_none_without_warnings(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            stats = current_statistics([None, None])
+        self.assertFalse(stats.valid)
+        self.assertEqual(stats.to_list('mean'), [None] * 6)
+        self.assertEqual(stats.to_list(95), [None] * 6)
+        self.assertTrue(all(math.isnan(value) for value in stats.max))
+
+    def test_empty_samples(self):
+        stats = current_statistics([])
+        self.assertFalse(stats.valid)
+        self.assertEqual(stats.summary()['mean'], [None] * 6)
+
+    def test_column_without_data(self):
+        samples = np.array([[1, np.nan, 3, 4, 5, 6]] * 3)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            stats = current_statistics(samples)
+        self.assertFalse(stats.valid)
+        self.assertEqual(stats.to_list('mean'), [1.0, None, 3.0, 4.0, 5.0, 6.0])
+
+    def test_to_list_rounds(self):
+        stats = current_statistics([[1, 1, 1, 1, 1, 1], [2, 2, 2, 2, 2, 2], [2, 2, 2, 2, 2, 2]])
+        self.assertEqual(stats.to_list('mean', digits=1), [1.7] * 6)
+        self.assertEqual(stats.summary(digits=2)['mean'], [1.67] * 6)
+
+    def test_to_sample_array(self):
+        data = to_sample_array([[1, 2, 3, 4, 5, 6, 7], None])
+        self.assertEqual(data.shape, (2, 6))
+        self.assertEqual(data[0].tolist(), [1, 2, 3, 4, 5, 6])
+        self.assertTrue(np.isnan(data[1]).all())
+
+
+class RollingStatisticsTest(unittest.TestCase):
+    def test_window_over_wrapped_buffer(self):
+        buffer = RingBuffer(4)
+        for second in range(6):
+            buffer.append(float(second), [0] * 6 + [second * 10] * 6 + [0] * 6)
+        stats = rolling_statistics(buffer, window=1.5)
+        self.assertEqual(stats.count.tolist(), [2] * 6)
+        self.assertEqual(stats.to_list('mean'), [45.0] * 6)
+        stats = rolling_statistics(buffer, window=100)
+        self.assertEqual(stats.to_list('min'), [20.0] * 6)
+
+    def test_empty_buffer(self):
+        stats = rolling_statistics(RingBuffer(4), window=1)
+        self.assertEqual(stats.to_list('mean'), [None] * 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+## degradation_detector 中预热、CUSUM 漂移和阶跃报警的单元测试
+import json
+import unittest
+
+from degradation_detector import ALARM_DRIFT_DOWN, ALARM_DRIFT_UP, ALARM_STEP, DegradationMonitor, MotorDetector
+
+
+def noisy(base, rounds, amplitude=1.0):
+    # 确定性的 ±amplitude 交替噪声
+    return [base + (amplitude if i % 2 else -amplitude) for i in range(rounds)]
+
+
+def feed(detector, values):
+    """
+    依次输入电流，返回 (第几个值触发报警, 报警类型)，没有报警时返回 (None, None)。
+    """
+    for i, value in enumerate(values):
+        kind = detector.update(value)
+        if kind is not None:
+            return i, kind
+    return None, None
+
+
+class MotorDetectorTest(unittest.TestCase):
+    def test_warmup_estimates_baseline(self):
+        detector = MotorDetector(warmup=4)
+        for value in (10, 20, 30, 40):
+            self.assertIsNone(detector.update(value))
+        self.assertAlmostEqual(detector.mean, 25.0)
+        self.assertAlmostEqual(detector.variance, 125.0) # 总体方差
+        self.assertAlmostEqual(detector.std, 125.0 ** 0.5)
+
+    def test_no_alarm_during_warmup(self):
+        detector = MotorDetector(warmup=10)
+        self.assertEqual(feed(detector, [100, 500, 0, 1000, 50, 100, 100, 100, 100, 100]), (None, None))
+        self.assertEqual(detector.count, 10)
+
+    def test_min_std(self):
+        detector = MotorDetector(warmup=5, min_std=2.0)
+        feed(detector, [100] * 5)
+        self.assertEqual(detector.std, 2.0)
+
+    def test_stable_current_does_not_alarm(self):
+        detector = MotorDetector()
+        self.assertEqual(feed(detector, noisy(100, 5000)), (None, None))
+        self.assertAlmostEqual(detector.mean, 100, delta=1.0)
+
+    def test_single_spike_does_not_alarm(self):
+        detector = MotorDetector()
+        feed(detector, noisy(100, 30))
+        self.assertEqual(feed(detector, [300] + noisy(100, 200)), (None, None))
+        self.assertEqual(detector.step_count, 0)
+
+    def test_step_change(self):
+        detector = MotorDetector(step_rounds=2)
+        feed(detector, noisy(100, 30))
+        self.assertEqual(feed(detector, [200, 200, 200]), (1, ALARM_STEP))
+
+    def test_slow_drift_up(self):
+        detector = MotorDetector()
+        feed(detector, noisy(100, 30))
+        index, kind = feed(detector, [100 + 0.2 * i for i in range(1000)])
+        self.assertEqual(kind, ALARM_DRIFT_UP)
+        self.assertIsNotNone(index)
+
+    def test_slow_drift_down(self):
+        detector = MotorDetector()
+        feed(detector, noisy(100, 30))
+        self.assertEqual(feed(detector, [100 - 0.2 * i for i in range(1000)])[1], ALARM_DRIFT_DOWN)
+
+    def test_baseline_frozen_after_alarm(self):
+        detector = MotorDetector()
+        feed(detector, noisy(100, 30))
+        feed(detector, [200, 200])
+        self.assertTrue(detector.alarmed)
+        mean, count = detector.mean, detector.count
+        self.assertEqual(feed(detector, [500] * 10), (None, None))
+        self.assertEqual((detector.mean, detector.count), (mean, count))
+
+    def test_state_round_trip(self):
+        detector = MotorDetector()
+        feed(detector, noisy(100, 40))
+        restored = MotorDetector()
+        restored.load_state(json.loads(json.dumps(detector.state())))
+        for value in [101, 99, 150, 160]:
+            self.assertEqual(restored.update(value), detector.update(value))
+        self.assertEqual(restored.state(), detector.state())
+
+
+class DegradationMonitorTest(unittest.TestCase):
+    def test_alarm_per_finger(self):
+        monitor = DegradationMonitor(warmup=5)
+        for i in range(5):
+            self.assertEqual(monitor.update('COM1', [100, 100, 100, 100, 100, 100]), [])
+        self.assertEqual(monitor.update('COM1', [100, 300, 100, 100, 100, None]), [])
+        alarms = monitor.update('COM1', [100, 300, 100, 100, 100, None])
+        self.assertEqual([(alarm.finger, alarm.kind, alarm.round_num) for alarm in alarms], [(1, ALARM_STEP, 7)])
+        # 第一轮 300mA 还没有报警，基线按 EWMA 只移动 alpha * 200 = 4mA
+        self.assertAlmostEqual(alarms[0].baseline, 104)
+        self.assertTrue(monitor.should_stop('COM1'))
+        self.assertFalse(monitor.is_degraded('COM2'))
+        self.assertEqual(len(monitor.alarms('COM1')), 1)
+
+    def test_stop_on_alarm_disabled(self):
+        monitor = DegradationMonitor(stop_on_alarm=False, warmup=1)
+        monitor.update('COM1', [100] * 6)
+        monitor.update('COM1', [300] * 6)
+        monitor.update('COM1', [300] * 6)
+        self.assertTrue(monitor.is_degraded('COM1'))
+        self.assertFalse(monitor.should_stop('COM1'))
+
+    def test_state_round_trip(self):
+        monitor = DegradationMonitor(warmup=2)
+        for currents in ([100] * 6, [102] * 6, [300] * 6, [300] * 6):
+            monitor.update('COM1', currents)
+        restored = DegradationMonitor(warmup=2)
+        restored.load_state(json.loads(json.dumps(monitor.state())))
+        self.assertEqual(restored.state(), monitor.state())
+        self.assertTrue(restored.should_stop('COM1'))
+        self.assertEqual(str(restored.alarms('COM1')[0]), str(monitor.alarms('COM1')[0]))
+        monitor.reset()
+        self.assertEqual(monitor.state(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+## modbus_metrics 中延迟直方图和端口计数器的单元测试
+import unittest
+
+from modbus_metrics import (FC_READ_HOLDING_REGISTERS, FC_WRITE_MULTIPLE_REGISTERS, LatencyHistogram, MetricsRegistry,
+                            PortMetrics, frame_bytes, register_count)
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_linear_range_is_exact(self):
+        histogram = LatencyHistogram(sub_bucket_bits=5)
+        for value in range(64):
+            self.assertEqual(histogram.bucket_index(value), value)
+            self.assertEqual(histogram.bucket_value(value), value)
+
+    def test_bucket_index_is_monotonic(self):
+        histogram = LatencyHistogram()
+        indexes = [histogram.bucket_index(value) for value in range(0, 200000, 7)]
+        self.assertEqual(indexes, sorted(indexes))
+
+    def test_relative_error_is_bounded(self):
+        histogram = LatencyHistogram(sub_bucket_bits=5)
+        for value in (64, 65, 100, 1000, 4095, 4096, 12345, 999999, 5000000):
+            bucket_value = histogram.bucket_value(histogram.bucket_index(value))
+            self.assertLessEqual(abs(bucket_value - value) / value, 1 / histogram.sub_bucket_count, value)
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 0)
+        self.assertIsNone(summary['mean_ms'])
+        self.assertIsNone(summary['p99_ms'])
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for millisecond in range(1, 101):
+            histogram.record(millisecond / 1000)
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.min, 0.001)
+        self.assertAlmostEqual(histogram.max, 0.1)
+        self.assertAlmostEqual(histogram.percentile(50), 0.050, delta=0.050 / 32)
+        self.assertAlmostEqual(histogram.percentile(95), 0.095, delta=0.095 / 32)
+        self.assertAlmostEqual(histogram.percentile(100), 0.1, delta=0.1 / 32)
+        summary = histogram.summary()
+        self.assertAlmostEqual(summary['mean_ms'], 50.5)
+        self.assertLessEqual(summary['p50_ms'], summary['p95_ms'])
+        self.assertLessEqual(summary['p99_ms'], summary['max_ms'])
+
+    def test_percentile_never_exceeds_max(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.0123)
+        self.assertEqual(histogram.percentile(99), 0.0123)
+
+    def test_negative_latency_is_clamped(self):
+        histogram = LatencyHistogram()
+        histogram.record(-0.001)
+        self.assertEqual(histogram.counts, {0: 1})
+
+
+class PortMetricsTest(unittest.TestCase):
+    def test_frame_bytes(self):
+        self.assertEqual(frame_bytes(FC_READ_HOLDING_REGISTERS, 6), (8, 17))
+        self.assertEqual(frame_bytes(FC_WRITE_MULTIPLE_REGISTERS, 6), (21, 8))
+        self.assertEqual(frame_bytes(FC_READ_HOLDING_REGISTERS, 6, ok=False), (8, 5))
+        self.assertEqual(register_count(5), 1)
+        self.assertEqual(register_count([1, 2, 3]), 3)
+
+    def test_observe_updates_counters(self):
+        port_metrics = PortMetrics('COM1')
+        port_metrics.observe(FC_READ_HOLDING_REGISTERS, 0.010, count=6)
+        port_metrics.observe(FC_READ_HOLDING_REGISTERS, 0.030, count=6, ok=False)
+        port_metrics.observe(FC_WRITE_MULTIPLE_REGISTERS, 0.020, count=6)
+        port_metrics.increment('retries', 2)
+        counters = port_metrics.summary()['counters']
+        self.assertEqual(counters['requests'], 3)
+        self.assertEqual(counters['errors'], 1)
+        self.assertEqual(counters['retries'], 2)
+        self.assertEqual(counters['bytes_sent'], 8 + 8 + 21)
+        self.assertEqual(counters['bytes_received'], 17 + 5 + 8)
+        self.assertAlmostEqual(port_metrics.mean_latency(FC_READ_HOLDING_REGISTERS), 0.020)
+        self.assertAlmostEqual(port_metrics.mean_latency(FC_WRITE_MULTIPLE_REGISTERS), 0.020)
+        self.assertEqual(set(port_metrics.summary()['latency']), {'read', 'write'})
+
+    def test_mean_latency_without_data(self):
+        self.assertIsNone(PortMetrics('COM1').mean_latency(FC_READ_HOLDING_REGISTERS))
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    def test_ports_are_separate(self):
+        registry = MetricsRegistry()
+        registry.observe('COM1', FC_READ_HOLDING_REGISTERS, 0.01)
+        registry.increment('COM2', 'reconnects')
+        summary = registry.summary()
+        self.assertEqual(summary['COM1']['counters']['requests'], 1)
+        self.assertEqual(summary['COM2']['counters']['reconnects'], 1)
+        self.assertIs(registry.port('COM1'), registry.port('COM1'))
+        registry.reset()
+        self.assertEqual(registry.summary(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+## motion_planner 中大拇指/食指错开下发的阶段顺序和写入流程的单元测试
+import unittest
+
+from gesture_library import make_step
+from motion_planner import INDEX, THUMB, THUMB_ROTATION, MotionPlanner
+
+OPEN = (0, 0, 0, 0, 0, 0)
+
+
+class MotionPlannerPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.planner = MotionPlanner(fallback_delay=0)
+
+    def values(self, phases):
+        return [(list(phase.step.values), list(phase.lead_fingers)) for phase in phases]
+
+    def test_no_conflict_is_single_phase(self):
+        step = make_step([0, 0, 65535, 65535, 65535, 0])
+        phases = self.planner.plan(OPEN, step)
+        self.assertEqual(len(phases), 1)
+        self.assertIs(phases[0].step, step)
+        self.assertEqual(phases[0].lead_fingers, ())
+
+    def test_thumb_alone_is_single_phase(self):
+        step = make_step([65535, 0, 0, 0, 0, 65535])
+        self.assertEqual(len(self.planner.plan(OPEN, step)), 1)
+
+    def test_thumb_closing_waits_for_index(self):
+        step = make_step([65535, 65535, 65535, 65535, 65535, 0])
+        phases = self.planner.plan(OPEN, step)
+        self.assertEqual(self.values(phases), [
+            ([0, 65535, 65535, 65535, 65535, 0], [INDEX]),
+            ([65535, 65535, 65535, 65535, 65535, 0], []),
+        ])
+        self.assertIs(phases[-1].step, step)
+
+    def test_thumb_opening_goes_first(self):
+        previous = (65535, 65535, 65535, 65535, 65535, 0)
+        phases = self.planner.plan(previous, make_step(list(OPEN)))
+        self.assertEqual(self.values(phases), [
+            ([0, 65535, 0, 0, 0, 0], [THUMB]),
+            ([0, 0, 0, 0, 0, 0], []),
+        ])
+
+    def test_thumb_and_rotation_closing_share_phase(self):
+        step = make_step([65535, 65535, 0, 0, 0, 65535])
+        phases = self.planner.plan(OPEN, step)
+        self.assertEqual(self.values(phases), [
+            ([0, 65535, 0, 0, 0, 0], [INDEX]),
+            ([65535, 65535, 0, 0, 0, 65535], []),
+        ])
+
+    def test_chained_phases(self):
+        # 大拇指退出、旋转进入：食指要等大拇指停下，旋转要等食指停下
+        previous = (65535, 0, 0, 0, 0, 0)
+        step = make_step([0, 65535, 0, 0, 0, 65535])
+        phases = self.planner.plan(previous, step)
+        self.assertEqual(self.values(phases), [
+            ([0, 0, 0, 0, 0, 0], [THUMB]),
+            ([0, 65535, 0, 0, 0, 0], [INDEX]),
+            ([0, 65535, 0, 0, 0, 65535], []),
+        ])
+        self.assertEqual(phases[0].lead_fingers, (THUMB,))
+        self.assertEqual(phases[1].lead_fingers, (INDEX,))
+        self.assertNotIn(THUMB_ROTATION, phases[1].lead_fingers)
+
+    def test_intermediate_steps_keep_step_options(self):
+        step = make_step([65535, 65535, 0, 0, 0, 0], tolerance=100, allow_blocked=True)
+        first = self.planner.plan(OPEN, step)[0].step
+        self.assertEqual(first.tolerance, 100)
+        self.assertTrue(first.allow_blocked)
+        self.assertEqual(first.address, step.address)
+
+    def test_plans_are_cached(self):
+        step = make_step([65535, 65535, 0, 0, 0, 0])
+        self.assertIs(self.planner.plan(OPEN, step), self.planner.plan(OPEN, step))
+        self.assertIs(MotionPlanner().plan(OPEN, step)[0].step, self.planner.plan(OPEN, step)[0].step)
+
+
+class MotionPlannerWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.planner = MotionPlanner(fallback_delay=0)
+        self.events = []
+
+    def write_to_register(self, address, step):
+        self.events.append(('write', list(step.values)))
+        return True
+
+    def wait_motion(self, fingers):
+        self.events.append(('wait', list(fingers)))
+        return True
+
+    def test_unknown_target_writes_full_step(self):
+        step = make_step([65535, 65535, 0, 0, 0, 0])
+        self.assertTrue(self.planner.write('COM1', step, self.write_to_register, self.wait_motion))
+        self.assertEqual(self.events, [('write', [65535, 65535, 0, 0, 0, 0])])
+
+    def test_staggered_write_order(self):
+        self.planner.write('COM1', make_step(list(OPEN)), self.write_to_register, self.wait_motion)
+        self.events.clear()
+        self.assertTrue(self.planner.write('COM1', make_step([65535, 65535, 0, 0, 0, 0]), self.write_to_register, self.wait_motion))
+        self.assertEqual(self.events, [
+            ('write', [0, 65535, 0, 0, 0, 0]),
+            ('wait', [INDEX]),
+            ('write', [65535, 65535, 0, 0, 0, 0]),
+        ])
+
+    def test_ports_are_independent(self):
+        self.planner.write('COM1', make_step(list(OPEN)), self.write_to_register, self.wait_motion)
+        self.events.clear()
+        self.planner.write('COM2', make_step([65535, 65535, 0, 0, 0, 0]), self.write_to_register, self.wait_motion)
+        self.assertEqual(len(self.events), 1)
+
+    def test_write_failure_forgets_target(self):
+        self.planner.write('COM1', make_step(list(OPEN)), self.write_to_register, self.wait_motion)
+        self.assertFalse(self.planner.write('COM1', make_step([65535, 65535, 0, 0, 0, 0]), lambda address, step: False, self.wait_motion))
+        self.events.clear()
+        self.planner.write('COM1', make_step([65535, 65535, 0, 0, 0, 0]), self.write_to_register, self.wait_motion)
+        self.assertEqual(len(self.events), 1) # 目标未知，退回整步下发
+
+    def test_lead_not_stopped_aborts(self):
+        self.planner.write('COM1', make_step(list(OPEN)), self.write_to_register, self.wait_motion)
+        self.events.clear()
+        self.assertFalse(self.planner.write('COM1', make_step([65535, 65535, 0, 0, 0, 0]), self.write_to_register, lambda fingers: False))
+        self.assertEqual(self.events, [('write', [0, 65535, 0, 0, 0, 0])])
+        # 已下发的中间目标被记下，下一步按它规划
+        self.events.clear()
+        self.planner.write('COM1', make_step([65535, 65535, 0, 0, 0, 0]), self.write_to_register, self.wait_motion)
+        self.assertEqual(self.events, [('write', [65535, 65535, 0, 0, 0, 0])])
+
+    def test_invalidate(self):
+        self.planner.write('COM1', make_step(list(OPEN)), self.write_to_register, self.wait_motion)
+        self.planner.invalidate('COM1')
+        self.events.clear()
+        self.planner.write('COM1', make_step([65535, 65535, 0, 0, 0, 0]), self.write_to_register, self.wait_motion)
+        self.assertEqual(len(self.events), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+## roh_registers 中块读写规划、寄存器快照和 RegisterSpec 用例生成的单元测试，不需要连接设备
+import unittest
+
+from roh_registers import (MAX_READ_COUNT, MAX_WRITE_COUNT, ROH_FINGER_ANGLE9, ROH_FINGER_POS0, ROH_PROTOCOL_VERSION,
+                           UINT16_MAX, RegisterSnapshot, RegisterSpec, finger_register_specs, plan_block_reads,
+                           plan_block_writes)
+
+
+class PlanBlockReadsTest(unittest.TestCase):
+    def test_full_table_uses_fewest_reads(self):
+        blocks = plan_block_reads()
+        total = ROH_FINGER_ANGLE9 - ROH_PROTOCOL_VERSION + 1
+        self.assertEqual(len(blocks), -(-total // MAX_READ_COUNT))
+        self.assertEqual(blocks[0][0], ROH_PROTOCOL_VERSION)
+        self.assertTrue(all(count <= MAX_READ_COUNT for _, count in blocks))
+
+    def test_blocks_are_contiguous(self):
+        blocks = plan_block_reads(1000, 1300, max_count=100)
+        self.assertEqual(blocks, [(1000, 100), (1100, 100), (1200, 100), (1300, 1)])
+
+    def test_single_register(self):
+        self.assertEqual(plan_block_reads(1005, 1005), [(1005, 1)])
+
+    def test_empty_range(self):
+        self.assertEqual(plan_block_reads(1010, 1005), [])
+
+
+class PlanBlockWritesTest(unittest.TestCase):
+    def test_merges_consecutive_addresses(self):
+        blocks = plan_block_writes({1002: 3, 1000: 1, 1001: 2, 1010: 7})
+        self.assertEqual(blocks, [(1000, [1, 2, 3]), (1010, [7])])
+
+    def test_splits_at_max_count(self):
+        values = {1000 + i: i for i in range(MAX_WRITE_COUNT + 5)}
+        blocks = plan_block_writes(values)
+        self.assertEqual([(start, len(block)) for start, block in blocks], [(1000, MAX_WRITE_COUNT), (1000 + MAX_WRITE_COUNT, 5)])
+        self.assertEqual(blocks[1][1][0], MAX_WRITE_COUNT)
+
+    def test_empty(self):
+        self.assertEqual(plan_block_writes({}), [])
+
+
+class RegisterSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = RegisterSnapshot(ROH_FINGER_POS0, [10, 20, 30, 40, 50, 60])
+
+    def test_access_by_address(self):
+        self.assertEqual(len(self.snapshot), 6)
+        self.assertEqual(self.snapshot[ROH_FINGER_POS0 + 2], 30)
+        self.assertEqual(self.snapshot.get(ROH_FINGER_POS0 + 1, 3), [20, 30, 40])
+        self.assertIn(ROH_FINGER_POS0 + 5, self.snapshot)
+        self.assertNotIn(ROH_FINGER_POS0 + 6, self.snapshot)
+
+    def test_out_of_range(self):
+        with self.assertRaises(KeyError):
+            self.snapshot[ROH_FINGER_POS0 - 1]
+        with self.assertRaises(KeyError):
+            self.snapshot.get(ROH_FINGER_POS0 + 4, 3)
+
+
+class RegisterSpecTest(unittest.TestCase):
+    def test_boundaries_generate_cases(self):
+        spec = RegisterSpec('finger_g0', 2000, 'RW', (20, 100), 25, nominal_values=(60,))
+        self.assertEqual(spec.cases(), [(19, False, None), (101, False, None), (20, True, None), (60, True, None), (100, True, None)])
+
+    def test_default_value_is_written_last(self):
+        spec = RegisterSpec('finger_g1', 2001, 'RW', (20, 100), 100, nominal_values=(60,))
+        values = [value for value, accepted, _ in spec.cases() if accepted]
+        self.assertEqual(values, [20, 60, 100])
+        spec = RegisterSpec('finger_g2', 2002, 'RW', (20, 100), 20, nominal_values=(60,))
+        values = [value for value, accepted, _ in spec.cases() if accepted]
+        self.assertEqual(values, [60, 100, 20])
+
+    def test_invalid_values_stay_within_uint16(self):
+        spec = RegisterSpec('finger_speed0', 2003, 'RW', (0, UINT16_MAX), UINT16_MAX)
+        self.assertEqual([case for case in spec.cases() if not case[1]], [])
+
+    def test_explicit_invalid_values(self):
+        spec = RegisterSpec('beep_switch', 2004, 'RW', (0, 1), 1, invalid_values=())
+        self.assertEqual(spec.cases(), [(0, True, None), (1, True, None)])
+        spec = RegisterSpec('self_test_level', 2005, 'RW', (0, 2), 1, nominal_values=(1,), invalid_values=(4,))
+        self.assertEqual(spec.cases(), [(4, False, None), (0, True, None), (2, True, None), (1, True, None)])
+
+    def test_skip_values_carry_reason(self):
+        spec = RegisterSpec('finger_current_limit0', 2006, 'RW', (0, 1178), 1200, skip_values={1178: '暂不支持'})
+        self.assertIn((1178, True, 'ROH_FINGER_CURRENT_LIMIT0 暂不支持'), spec.cases())
+
+    def test_write_only(self):
+        spec = RegisterSpec('beep_period', 2007, 'W', (1, UINT16_MAX), 500)
+        self.assertFalse(spec.readable)
+        self.assertEqual(spec.label, 'beep period')
+
+    def test_finger_register_specs(self):
+        specs = finger_register_specs('finger_p{}', 3000, [1, 2, 3], (0, 10), tolerance=2)
+        self.assertEqual([(spec.name, spec.address, spec.default) for spec in specs], [('finger_p0', 3000, 1), ('finger_p1', 3001, 2), ('finger_p2', 3002, 3)])
+        self.assertTrue(all(spec.readable and spec.tolerance == 2 for spec in specs))
+
+
+if __name__ == '__main__':
+    unittest.main()
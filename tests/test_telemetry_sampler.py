@@ -0,0 +1,66 @@
+## telemetry_sampler 中环形缓冲区和动作状态新旧判断的单元测试
+import threading
+import time
+import unittest
+
+from telemetry_sampler import SAMPLE_COUNT, SAMPLE_WIDTH, RingBuffer, SampledResponse, TelemetrySampler
+
+
+class RingBufferTest(unittest.TestCase):
+    def test_overwrites_oldest(self):
+        buffer = RingBuffer(3, width=2)
+        for i in range(5):
+            buffer.append(float(i), [i, i * 10])
+        self.assertEqual(buffer.rows(), ([2.0, 3.0, 4.0], [[2, 20], [3, 30], [4, 40]]))
+        self.assertEqual(buffer.latest(), (4.0, [4, 40]))
+        self.assertEqual(buffer.rows(since=3.0)[0], [3.0, 4.0])
+        self.assertEqual(buffer.total, 5)
+
+    def test_clear(self):
+        buffer = RingBuffer(3, width=2)
+        buffer.append(1.0, [1, 1])
+        buffer.clear()
+        self.assertIsNone(buffer.latest())
+        self.assertEqual((buffer.head, buffer.size, buffer.total), (0, 0, 0))
+
+
+class TelemetrySamplerTest(unittest.TestCase):
+    def setUp(self):
+        self.statuses = [2] * 6
+        self.sampler = TelemetrySampler('COM1', self.read_from_register, threading.Lock())
+
+    def read_from_register(self, address, count):
+        self.assertEqual(count, SAMPLE_COUNT)
+        return SampledResponse(self.statuses + [0] * (count - 6))
+
+    def test_ignores_samples_before_write(self):
+        self.sampler.begin_motion()
+        self.assertTrue(self.sampler.sample())
+        self.assertIsNone(self.sampler.read_statuses()) # 还没有写入目标
+        self.sampler.mark_written()
+        self.assertIsNone(self.sampler.read_statuses()) # 写入之前发出的采样仍是上一个动作的状态
+        time.sleep(0.001)
+        self.statuses = [1] * 6
+        self.sampler.sample()
+        self.assertEqual(self.sampler.read_statuses().registers, [1] * 6)
+
+    def test_begin_motion_resets_write_gate(self):
+        self.sampler.begin_motion()
+        self.sampler.mark_written()
+        time.sleep(0.001)
+        self.sampler.sample()
+        self.assertIsNotNone(self.sampler.read_statuses())
+        self.sampler.begin_motion()
+        self.assertIsNone(self.sampler.read_statuses())
+
+    def test_peak_currents_and_rows(self):
+        self.sampler.begin_motion()
+        self.sampler.sample()
+        _, rows = self.sampler.motion_rows()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(len(rows[0]), SAMPLE_WIDTH)
+        self.assertEqual(self.sampler.peak_currents, [0] * 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
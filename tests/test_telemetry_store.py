@@ -0,0 +1,100 @@
+## telemetry_store 写入与 TelemetryReader 读取往返的单元测试
+import os
+import tempfile
+import unittest
+
+from telemetry_store import (COLUMNS, FINGER_COUNT, SOURCE_MOTION, TELEMETRY_BLOCK_COUNT, TelemetryReader, TelemetryStore)
+
+
+class TelemetryStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._temp_dir.name, 'run')
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_inactive_store_ignores_records(self):
+        store = TelemetryStore()
+        store.append('COM1', [1] * FINGER_COUNT, [2] * FINGER_COUNT)
+        store.record('COM1', [0] * TELEMETRY_BLOCK_COUNT)
+        self.assertFalse(store.active)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_round_trip(self):
+        store = TelemetryStore(flush_rows=2)
+        store.start(path=self.path)
+        self.assertEqual(store.begin_cycle('COM1'), 1)
+        store.append('COM1', [1, 2, 3, 4, 5, 6], [10, 20, 30, 40, 50, 60], timestamp=100.0)
+        store.append('COM2', [7] * FINGER_COUNT, [70] * FINGER_COUNT, timestamp=101.0, source=SOURCE_MOTION)
+        self.assertEqual(store.begin_cycle('COM1'), 2)
+        registers = list(range(TELEMETRY_BLOCK_COUNT))
+        store.record('COM1', registers, timestamp=102.0)
+        store.record('COM1', registers[:6], timestamp=103.0) # 不是完整块读，忽略
+        store.stop()
+
+        reader = TelemetryReader(self.path)
+        self.assertEqual(len(reader), 3)
+        self.assertEqual(reader.ports, ['COM1', 'COM2'])
+        self.assertEqual(reader['timestamp'].tolist(), [100.0, 101.0, 102.0])
+        self.assertEqual(reader['port'].tolist(), [0, 1, 0])
+        self.assertEqual(reader['cycle'].tolist(), [1, 0, 2])
+        self.assertEqual(reader['currents'][0].tolist(), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(reader['positions'][2].tolist(), registers[40:46])
+        self.assertEqual(reader['currents'][2].tolist(), registers[0:6])
+
+    def test_select(self):
+        store = TelemetryStore()
+        store.start(path=self.path)
+        for second in range(10):
+            store.append('COM1' if second % 2 == 0 else 'COM2', [second] * FINGER_COUNT, [0] * FINGER_COUNT,
+                         timestamp=float(second), source=SOURCE_MOTION if second >= 5 else 0)
+        store.stop()
+
+        reader = TelemetryReader(self.path)
+        self.assertEqual(reader.select(port='COM1')['timestamp'].tolist(), [0.0, 2.0, 4.0, 6.0, 8.0])
+        self.assertEqual(reader.select(start_time=3, end_time=6)['timestamp'].tolist(), [3.0, 4.0, 5.0])
+        self.assertEqual(reader.select(port='COM2', source='motion')['currents'][:, 0].tolist(), [5, 7, 9])
+        self.assertEqual(reader.select(source='hold')['timestamp'].tolist(), [0.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(len(reader.select(port='COM3')['timestamp']), 0)
+
+    def test_resume_truncates_partial_rows(self):
+        store = TelemetryStore(flush_rows=1)
+        store.start(path=self.path)
+        for second in range(3):
+            store.append('COM1', [second] * FINGER_COUNT, [second] * FINGER_COUNT, timestamp=float(second))
+        self.assertEqual(store.saved_rows, 3)
+        store.stop()
+        # 模拟 flush 中途退出：部分列多写了一行或半行
+        with open(os.path.join(self.path, 'currents.bin'), 'ab') as f:
+            f.write(bytes(2 * FINGER_COUNT))
+        with open(os.path.join(self.path, 'timestamp.bin'), 'ab') as f:
+            f.write(bytes(5))
+
+        store.start(path=self.path, cycles={'COM1': 4})
+        self.assertEqual(store.saved_rows, 3)
+        self.assertEqual(store.begin_cycle('COM1'), 5)
+        store.append('COM1', [9] * FINGER_COUNT, [9] * FINGER_COUNT, timestamp=9.0)
+        store.stop()
+
+        reader = TelemetryReader(self.path)
+        self.assertEqual(reader['currents'][:, 0].tolist(), [0, 1, 2, 9])
+        self.assertEqual(reader['timestamp'].tolist(), [0.0, 1.0, 2.0, 9.0])
+        self.assertEqual(reader['cycle'].tolist(), [0, 0, 0, 5])
+        for column in COLUMNS:
+            self.assertEqual(len(reader[column]), 4)
+
+    def test_resume_truncates_to_checkpoint_rows(self):
+        store = TelemetryStore(flush_rows=1)
+        store.start(path=self.path)
+        for second in range(5):
+            store.append('COM1', [second] * FINGER_COUNT, [second] * FINGER_COUNT, timestamp=float(second))
+        store.stop()
+
+        store.start(path=self.path, rows=2)
+        store.stop()
+        self.assertEqual(TelemetryReader(self.path)['timestamp'].tolist(), [0.0, 1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()